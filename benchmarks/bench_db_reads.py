@@ -0,0 +1,138 @@
+"""Per-call cost of the hot database lookups, against the ORM queries they replaced.
+
+Runs against a temporary database filled with generated projects:
+
+    python benchmarks/bench_db_reads.py --projects 150 --versions 200 --calls 2000
+"""
+
+import argparse
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from papermc_plugin_manager.connector_interface import FileInfo, ProjectInfo
+from papermc_plugin_manager.database import (
+    FileHashTable,
+    FileTable,
+    InstallationTable,
+    SnapshotInfoTable,
+    SourceDatabase,
+)
+
+
+def fill(db: SourceDatabase, projects: int, versions: int) -> list[tuple[str, str]]:
+    """Save generated projects and install the newest version of each; returns (sha1, version_id) pairs."""
+    installed = []
+    for p in range(projects):
+        project = ProjectInfo("Synthetic", f"project{p}", f"Project {p}", "author", "description", 0)
+        for v in range(versions):
+            sha1 = f"{p:08x}{v:032x}"
+            project.versions[f"p{p}v{v}"] = FileInfo(
+                version_id=f"p{p}v{v}",
+                project_id=project.project_id,
+                version_name=f"{v}.0.0",
+                version_type="RELEASE",
+                release_date=datetime(2020, 1, 1) + timedelta(hours=v),
+                game_versions=["1.21.3", "1.21.4"],
+                sha1=sha1,
+                url=f"https://cdn.example/{project.project_id}/{v}.jar",
+                hashes={"sha1": sha1, "sha512": sha1 * 3},
+            )
+        db.save_project_info(project)
+        sha1 = f"{p:08x}{versions - 1:032x}"
+        db.save_installation_info(f"project{p}.jar", sha1, 1024)
+        installed.append((sha1, f"p{p}v{versions - 1}"))
+    for s in range(10):
+        db.create_snapshot(f"snapshot{s}")
+    return installed
+
+
+# the queries as they were before the Core fast paths, for comparison
+
+
+def orm_is_sha1_known(db: SourceDatabase, sha1: str) -> bool:
+    with Session(db.engine) as session:
+        stmt = select(InstallationTable).where(InstallationTable.sha1 == sha1)
+        return session.execute(stmt).scalar_one_or_none() is not None
+
+
+def orm_get_installation_by_sha1(db: SourceDatabase, sha1: str) -> InstallationTable | None:
+    with Session(db.engine) as session:
+        stmt = select(InstallationTable).where(InstallationTable.sha1 == sha1)
+        return session.execute(stmt).scalar_one_or_none()
+
+
+def orm_get_file_by_sha1(db: SourceDatabase, sha1: str) -> FileInfo | None:
+    with Session(db.engine) as session:
+        file_table = session.execute(select(FileTable).where(FileTable.sha1 == sha1)).scalar_one_or_none()
+    if file_table is None:
+        return None
+    file_info = file_table.to_file_info()
+    with Session(db.engine) as session:
+        hash_tables = session.execute(select(FileHashTable).where(FileHashTable.sha1 == sha1)).scalars().all()
+        file_info.hashes = {hash_table.hash_type: hash_table.hash_digest for hash_table in hash_tables}
+    return file_info
+
+
+def orm_get_file_by_version_id(db: SourceDatabase, version_id: str) -> FileInfo | None:
+    with Session(db.engine) as session:
+        stmt = select(FileTable).where(FileTable.version_id == version_id).order_by(FileTable.id).limit(1)
+        file_table = session.execute(stmt).scalar_one_or_none()
+    if file_table is None:
+        return None
+    file_info = file_table.to_file_info()
+    with Session(db.engine) as session:
+        hash_tables = session.execute(select(FileHashTable).where(FileHashTable.sha1 == file_info.sha1)).scalars().all()
+        file_info.hashes = {hash_table.hash_type: hash_table.hash_digest for hash_table in hash_tables}
+    return file_info
+
+
+def orm_get_snapshot_names(db: SourceDatabase) -> list[str]:
+    with Session(db.engine) as session:
+        return list(session.execute(select(SnapshotInfoTable.name)).scalars().all())
+
+
+def per_call_us(fn, args: list[tuple], calls: int) -> float:
+    start = time.perf_counter()
+    for i in range(calls):
+        fn(*args[i % len(args)])
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--projects", type=int, default=150)
+    parser.add_argument("--versions", type=int, default=200)
+    parser.add_argument("--calls", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = SourceDatabase(f"sqlite:///{Path(tmp) / 'ppm.db'}")
+        print(f"Filling database with {args.projects} projects x {args.versions} versions...")
+        installed = fill(db, args.projects, args.versions)
+        sha1s = [(db, sha1) for sha1, _ in installed]
+        version_ids = [(db, version_id) for _, version_id in installed]
+
+        cases = [
+            ("is_sha1_known", orm_is_sha1_known, SourceDatabase.is_sha1_known, sha1s),
+            ("get_installation_by_sha1", orm_get_installation_by_sha1, SourceDatabase.get_installation_by_sha1, sha1s),
+            ("get_file_by_sha1", orm_get_file_by_sha1, SourceDatabase.get_file_by_sha1, sha1s),
+            ("get_file_by_version_id", orm_get_file_by_version_id, SourceDatabase.get_file_by_version_id, version_ids),
+            ("get_snapshot_names", orm_get_snapshot_names, SourceDatabase.get_snapshot_names, [(db,)]),
+        ]
+        print(f"{'lookup':<26} {'ORM us/call':>12} {'Core us/call':>13} {'speedup':>8}")
+        for name, before, after, call_args in cases:
+            # warm up both paths so statement compilation is not measured
+            per_call_us(before, call_args, 50)
+            per_call_us(after, call_args, 50)
+            orm = per_call_us(before, call_args, args.calls)
+            core = per_call_us(after, call_args, args.calls)
+            print(f"{name:<26} {orm:>12.1f} {core:>13.1f} {orm / core:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
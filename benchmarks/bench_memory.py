@@ -0,0 +1,83 @@
+"""Memory used by project metadata with full version histories.
+
+Run from a server directory to load every installed plugin's full version history:
+
+    python benchmarks/bench_memory.py
+
+Or without a server or network, with generated projects:
+
+    python benchmarks/bench_memory.py --synthetic 40 --versions 2000
+"""
+
+import argparse
+import gc
+import random
+import tracemalloc
+from datetime import datetime, timedelta
+
+from papermc_plugin_manager.connector_interface import FileInfo, ProjectInfo
+from papermc_plugin_manager.game_versions import table_size
+
+GAME_VERSIONS = [f"1.{minor}.{patch}" for minor in range(16, 22) for patch in range(0, 7)]
+
+
+def synthetic_projects(count: int, versions: int) -> list[ProjectInfo]:
+    rng = random.Random(0)
+    projects = []
+    for p in range(count):
+        project = ProjectInfo("Synthetic", f"project{p}", f"Project {p}", "author", "description", 0)
+        for v in range(versions):
+            start = rng.randrange(len(GAME_VERSIONS) - 6)
+            # build new strings like a JSON parser would, so interning has something to do
+            game_versions = ["".join(gv) for gv in GAME_VERSIONS[start:start + rng.randrange(1, 6)]]
+            sha1 = f"{p:08x}{v:032x}"
+            project.versions[f"p{p}v{v}"] = FileInfo(
+                version_id=f"p{p}v{v}",
+                project_id=project.project_id,
+                version_name=f"{v // 100}.{v % 100}.0",
+                version_type=("RELEASE", "BETA", "ALPHA")[v % 3],
+                release_date=datetime(2020, 1, 1) + timedelta(hours=v),
+                game_versions=game_versions,
+                sha1=sha1,
+                url=f"https://cdn.example/{project.project_id}/{v}.jar",
+                hashes={"sha1": sha1, "sha512": sha1 * 3},
+            )
+        projects.append(project)
+    return projects
+
+
+def installed_projects() -> list[ProjectInfo]:
+    from papermc_plugin_manager.plugin_manager import get_plugin_manager
+
+    pm = get_plugin_manager()
+    installed, _ = pm.get_installations()
+    projects = []
+    for project in installed:
+        print(f"Fetching full history of {project.name}...")
+        projects.append(pm.fetch_full_history(project) or project)
+    return projects
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--synthetic", type=int, metavar="PROJECTS", help="Generate this many projects instead of loading the installed set.")
+    parser.add_argument("--versions", type=int, default=1000, help="Versions per generated project.")
+    args = parser.parse_args()
+
+    gc.collect()
+    tracemalloc.start()
+    projects = synthetic_projects(args.synthetic, args.versions) if args.synthetic else installed_projects()
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    versions = sum(len(project.versions) for project in projects)
+    print(f"projects:            {len(projects)}")
+    print(f"versions:            {versions}")
+    print(f"game version lists:  {table_size()}")
+    print(f"retained:            {current / 1024 / 1024:.1f} MiB ({current / max(versions, 1):.0f} B per version)")
+    print(f"peak:                {peak / 1024 / 1024:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1 @@
-from .connectors import *
+# connectors are imported on first use, see connector_interface.get_connector
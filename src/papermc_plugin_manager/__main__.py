@@ -1,17 +1,21 @@
+import datetime
+import sys
+from collections.abc import Callable
 from dataclasses import dataclass
-from importlib.metadata import version
 from pathlib import Path
-from typing import Annotated, Tuple, List
-import datetime
+from typing import TYPE_CHECKING, Annotated, List, Tuple
 
 import logzero
 import typer
 
+from . import completion
+from .connector_interface import FileInfo, ProjectInfo
 from .console import console
 from .logging import setup_logging
-from .plugin_manager import get_plugin_manager, list_connectors
 from .utils import get_papermc_version
-from .connector_interface import FileInfo, ProjectInfo
+
+if TYPE_CHECKING:
+    from .plugin_manager import InstallStep, PluginManager
 
 app = typer.Typer(
     help="PaperMC Plugin Manager - Manage plugins for your PaperMC server.",
@@ -23,6 +27,17 @@ class CliContext:
     game_version: str
     default_source: str
 
+
+def get_plugin_manager() -> "PluginManager":
+    # imported on first use, so --version, --help and completion skip the database and the connectors
+    from .plugin_manager import get_plugin_manager
+    return get_plugin_manager()
+
+
+def connector_names() -> list[str]:
+    from .connector_interface import list_connectors
+    return list_connectors()
+
 @app.command()
 def connectors():
     """List available connectors"""
@@ -51,24 +66,36 @@ def list_installations(
     context: CliContext = ctx.obj
 
     console.print_info(f"PaperMC version: {context.game_version}")
-    installations, unrecognized = pm.get_installations()
-    if not installations:
+    statuses = pm.get_status()
+    unrecognized = [status for status in statuses if not status.recognized]
+    if len(unrecognized) == len(statuses):
         console.print_warning("No installed plugins found.")
         console.print("Run [green]ppm update[/green] to scan for installed plugins.")
         raise typer.Exit()
 
-    if pm.needs_update():
+    if unrecognized:
         console.print_warning("Some installed plugins are not recognized in the database.")
         console.print("Run [green]ppm update[/green] to identify them.")
 
-    console.print_installed_plugins_table(installations, context.game_version)
+    console.print_installed_plugins_table(statuses)
     if unrecognized:
         console.print(f"\n[bold]Unrecognized Plugins: {len(unrecognized)}[/bold]")
         console.print_unidentified_plugins_table(unrecognized)
 
+def _completion_names(key: str, load: Callable[["PluginManager"], list[str]]) -> list[str]:
+    """Names for shell completion, read from the completion cache without opening the database."""
+    names = completion.read_names(key)
+    if names is None:
+        # no cache yet, e.g. the first TAB after upgrading ppm: answer from the database and write it
+        logzero.loglevel(logzero.logging.CRITICAL)
+        pm = get_plugin_manager()
+        names = load(pm)
+        pm.db.update_completion_cache()
+    return names
+
+
 def installed_plugin_names() -> list[str]:
-    logzero.loglevel(logzero.logging.CRITICAL)
-    return get_plugin_manager().get_installation_names()
+    return _completion_names(completion.PLUGINS, lambda pm: pm.get_installation_names())
 
 
 @app.command()
@@ -78,6 +105,7 @@ def show(
     version: Annotated[str | None, typer.Option("--version", "-v", help="Specific version to show details for.")] = None,
     list_version_limit: Annotated[int, typer.Option("--limit", "-l", help="Limit the number of versions displayed.", show_default=True)] = 5,
     snapshot: Annotated[bool, typer.Option(help="Include snapshot versions in the version list.", is_flag=True)] = True,
+    all_versions: Annotated[bool, typer.Option("--all-versions", help="Fetch the full version history, including versions for other game versions.", is_flag=True, show_default=True)] = False,
     yes: Annotated[bool, typer.Option("--yes", "-y", help="Skip confirmation prompts.", is_flag=True, show_default=True)] = False,
 ):
     """show plugin details"""
@@ -92,6 +120,13 @@ def show(
     if not exact_match and not yes:
         typer.confirm(f"Did you mean plugin '{project.name}' (ID: {project.project_id})?", abort=True, default=True)
 
+    if all_versions or (version and project.get_version(version) is None):
+        with console.status("Fetching full version history..."):
+            full_project = pm.fetch_full_history(project)
+        if full_project:
+            for version_id, file_info in full_project.versions.items():
+                project.versions.setdefault(version_id, file_info)
+
     current_version = project.current_version
     filename = None
     if current_version:
@@ -107,8 +142,10 @@ def show(
         if file_info is None:
             console.print_error(f"Version '{version}' not found for plugin '{project.name}'.")
         else:
+            pm.load_description(project, file_info)
             console.print_version_detail_panel(file_info)
     elif current_version:
+        pm.load_description(project, current_version)
         console.print_version_detail_panel(current_version, "Installed Version Details")
 
     count = 0
@@ -126,18 +163,47 @@ def show(
         console.print_warning("No versions available")
 
 
+@app.command()
+def readiness(
+    ctx: typer.Context,
+    target: Annotated[str, typer.Option("--target", "-t", help="Game version to check the installed plugins against, e.g. 1.21.4.")],
+    refresh: Annotated[bool, typer.Option("--refresh", help="Fetch the full version history of every installed plugin first.", is_flag=True, show_default=True)] = False,
+):
+    """check whether the installed plugins support a game version"""
+    pm = get_plugin_manager()
+
+    if refresh:
+        with console.status("Fetching version history...") as status:
+            failed = pm.refresh_full_history(lambda msg: status.update(msg))
+        for name, error in failed.items():
+            console.print_warning(f"Could not fetch the version history of {name}: {error}. Only its stored versions are checked.")
+
+    report = pm.check_readiness(target)
+    if not report:
+        console.print_warning("No recognized plugins found.")
+        console.print("Run [green]ppm update[/green] to identify installed plugins.")
+        raise typer.Exit()
+
+    console.print_readiness_table(report, target)
+    ready = sum(1 for r in report if r.best_score == 3)
+    console.print(f"{ready} of {len(report)} plugins have a version for {target}.")
+    if ready < len(report) and not refresh:
+        console.print("Only stored versions were checked. Run with [green]--refresh[/green] to fetch the full version history.")
+
+
 @app.command()
 def search(
     ctx: typer.Context,
     query: Annotated[str, typer.Argument(help="Search query for plugins.")],
     limit: Annotated[int, typer.Option("--limit", "-l", help="Limit the number of search results.", show_default=True)] = 10,
+    offline: Annotated[bool, typer.Option("--offline", help="Only search plugins already known to the local database.", is_flag=True, show_default=True)] = False,
 ):
     """search for plugins"""
     pm = get_plugin_manager()
     context: CliContext = ctx.obj
 
     with console.status("Searching..."):
-        results = pm.search_projects(query, mc_version=context.game_version, limit=limit)
+        results = pm.search_projects(query, mc_version=context.game_version, limit=limit, offline=offline)
 
     if results:
         console.print_search_results_table(results)
@@ -145,32 +211,41 @@ def search(
         console.print_warning("No plugins found matching the query.")
 
 
-@app.command()
-def install(
-    ctx: typer.Context,
-    name: Annotated[str, typer.Argument(help="Name or ID of the plugin to install.", autocompletion=installed_plugin_names)],
-    version: Annotated[str | None, typer.Option("--version", "-v", help="Specific version to install. If not specified, installs the latest compatible version.")] = None,
-    snapshot: Annotated[bool, typer.Option(help="Allow installation of snapshot versions if no release version is found.", is_flag=True, show_default=True)] = False,
-    yes: Annotated[bool, typer.Option("--yes", "-y", help="Skip confirmation prompts.", is_flag=True, show_default=True)] = False,
-    no_change_track: Annotated[bool, typer.Option(help="Do not change the track release type to the installed version's type.", is_flag=True, show_default=True)] = False,
-):
-    """install or update a plugin"""
-    from rich.progress import BarColumn, DownloadColumn, Progress, TimeRemainingColumn, TransferSpeedColumn
-    from .utils import download_file
-
-    pm = get_plugin_manager()
-    context: CliContext = ctx.obj
-
-    exact_match, project = pm.fuzzy_find_project(name)
-    if not project:
-        console.print_error(f"Plugin '{name}' not found.")
-        raise typer.Exit(code=1)
+def _resolve_install(
+    pm: "PluginManager",
+    name: str,
+    version: str | None = None,
+    snapshot: bool = False,
+    yes: bool = False,
+    no_change_track: bool = False,
+) -> tuple[ProjectInfo, FileInfo]:
+    """Find the project and the version to install. Raises typer.Exit when there is nothing to do."""
+    project = version_info = None
+    if version:
+        # a stored version resolves with one query; the project is then loaded lazily
+        version_info = pm.db.get_file_info(name, version)
+        if version_info is not None:
+            project = pm.db.get_project_info(version_info.project_id, lazy=True)
+
+    if project is None:
+        exact_match, project = pm.fuzzy_find_project(name)
+        if not project:
+            console.print_error(f"Plugin '{name}' not found.")
+            raise typer.Exit(code=1)
 
-    if not exact_match and not yes:
-        typer.confirm(f"Did you mean plugin '{project.name}' (ID: {project.project_id})?", abort=True, default=False)
+        if not exact_match and not yes:
+            typer.confirm(f"Did you mean plugin '{project.name}' (ID: {project.project_id})?", abort=True, default=False)
 
     if version:
-        version_info = project.get_version(version)
+        if version_info is None:
+            version_info = project.get_version(version)
+        if version_info is None:
+            # the version may be filtered out for this game version
+            with console.status("Fetching full version history..."):
+                full_project = pm.fetch_full_history(project)
+            version_info = full_project.get_version(version) if full_project else None
+            if version_info:
+                project.versions[version_info.version_id] = version_info
         if version_info is None:
             console.print_error(f"Version '{version}' not found for plugin '{project.name}'.")
             raise typer.Exit(code=1)
@@ -195,7 +270,7 @@ def install(
             if not snapshot:
                 console.print_warning(f"No release version found for plugin '{project.name}'. Using latest version...")
         # set installation type only on first install
-        if project.current_version is None:
+        if project.current_version is None and version_info is not None:
             project.installation_type = version_info.version_type
 
     console.print_info(f"{project.name} is tracking {project.installation_type} versions.")
@@ -203,42 +278,104 @@ def install(
     if version_info is None:
         console.print_error(f"No suitable version found for plugin '{project.name}'.")
         raise typer.Exit(code=1)
+    return project, version_info
+
+
+def _add_dependencies(pm: "PluginManager", plan: list["InstallStep"], with_optional: bool = False, yes: bool = False) -> list["InstallStep"]:
+    """Add the missing dependencies to an install plan and order it, dependencies first."""
+    from .exceptions import DependencyConflictException, DependencyCycleException
+    from .plugin_manager import InstallStep
+
+    names = {step.project.project_id: step.project.name for step in plan}
+    try:
+        with console.status("Resolving dependencies..."):
+            resolution = pm.resolve_dependencies(plan, include_optional=with_optional)
+    except (DependencyConflictException, DependencyCycleException) as e:
+        console.print_error(e.message)
+        raise typer.Exit(code=1)
+    for node in resolution.install:
+        names[node.project.project_id] = node.project.name
+
+    for missing in resolution.missing:
+        kind = "optional dependency" if missing.optional else "dependency"
+        console.print_warning(
+            f"{names.get(missing.required_by, missing.required_by)} has a {kind} "
+            f"'{missing.project_id or missing.version_id}' that was not found; install it manually."
+        )
+    for node in resolution.suggested:
+        requirers = ", ".join(names.get(project_id, project_id) for project_id in node.required_by)
+        console.print_info(f"{requirers} can use {node.project.name} (optional). Install it with [green]ppm install {node.project.project_id}[/green].")
+
+    if resolution.added:
+        console.print("The following dependencies will also be installed:")
+        for node in resolution.added:
+            requirers = ", ".join(names.get(project_id, project_id) for project_id in node.required_by)
+            current = node.project.current_version
+            version = f"{current.version_name} -> {node.file_info.version_name}" if current else node.file_info.version_name
+            console.print(f"  {node.project.name} {version} [dim](required by {requirers})[/dim]")
+        if not yes:
+            typer.confirm("Do you want to install them?", abort=True, default=True)
+    return [InstallStep(node.project, node.file_info) for node in resolution.install]
+
+
+def _apply_installs(pm: "PluginManager", plan: list["InstallStep"], stage: bool = False) -> int:
+    """Run an install plan, reporting the outcome of each plugin.
+
+    Returns:
+        int: The number of plugins that failed to install.
+    """
+    with console.download_progress() as progress_cb:
+        results = pm.execute_install_plan(plan, progress_cb, console.print, stage=stage)
+
+    failed = 0
+    for step, result in zip(plan, results, strict=True):
+        if not result.ok:
+            console.print_error(f"Failed to download plugin '{step.project.name}': {result.error}")
+            failed += 1
+            continue
+        if stage:
+            console.print(f"[green]✓[/green] [white]{step.project.name} staged![/white]")
+        else:
+            console.print(f"[green]✓[/green] [white]{step.project.name} installed![/white]")
+    if stage and failed < len(plan):
+        console.print("Run [green]ppm apply-staged[/green] while the server is stopped to swap in the staged plugins.")
+    return failed
 
-    # remove existing installation if present
-    if project.current_version:
-        installation = pm.db.get_installation_by_sha1(project.current_version.sha1)
-        if installation:
-            plugin_path = Path("plugins") / installation.filename
-            if plugin_path.exists():
-                console.print(f"Removing existing installation '{installation.filename}'...")
-                plugin_path.unlink()
-            pm.db.remove_installation(installation.filename)
-
-    filename = project.name.replace(" ", "_") + "-" + version_info.version_name + ".jar"
-    url = pm.connectors[context.default_source].get_download_link(version_info)
-    with Progress(
-        "[progress.description]{task.description}",
-        BarColumn(),
-        DownloadColumn(),
-        TransferSpeedColumn(),
-        TimeRemainingColumn(),
-        console=console,
-    ) as progress:
-        task = None
-        for bytes_downloaded, total_size in  download_file(url, dest=str(Path("plugins") / filename)):
-            if task is None:
-                task = progress.add_task(f"[cyan]Downloading {filename}...", total=total_size)
-            progress.update(task, completed=bytes_downloaded)
-    pm.db.save_project_info(project)
-    pm.db.save_installation_info(filename, version_info.sha1, Path(Path("plugins") / filename).stat().st_size, project.installation_type)
-    console.print(f"[green]✓[/green] [white]{project.name} installed![/white]")
+
+@app.command()
+def install(
+    ctx: typer.Context,
+    name: Annotated[str, typer.Argument(help="Name or ID of the plugin to install.", autocompletion=installed_plugin_names)],
+    version: Annotated[str | None, typer.Option("--version", "-v", help="Specific version to install. If not specified, installs the latest compatible version.")] = None,
+    snapshot: Annotated[bool, typer.Option(help="Allow installation of snapshot versions if no release version is found.", is_flag=True, show_default=True)] = False,
+    yes: Annotated[bool, typer.Option("--yes", "-y", help="Skip confirmation prompts.", is_flag=True, show_default=True)] = False,
+    no_change_track: Annotated[bool, typer.Option(help="Do not change the track release type to the installed version's type.", is_flag=True, show_default=True)] = False,
+    stage: Annotated[bool, typer.Option("--stage", help="Download into the staging area; apply later with 'ppm apply-staged'.", is_flag=True, show_default=True)] = False,
+    with_optional: Annotated[bool, typer.Option("--with-optional", help="Also install optional dependencies.", is_flag=True, show_default=True)] = False,
+    no_deps: Annotated[bool, typer.Option("--no-deps", help="Do not install missing dependencies.", is_flag=True, show_default=True)] = False,
+):
+    """install or update a plugin"""
+    from .plugin_manager import InstallStep
+    pm = get_plugin_manager()
+    project, version_info = _resolve_install(pm, name, version, snapshot, yes, no_change_track)
+    plan = [InstallStep(project, version_info)]
+    if not no_deps:
+        plan = _add_dependencies(pm, plan, with_optional, yes)
+    if _apply_installs(pm, plan, stage):
+        raise typer.Exit(code=1)
 
 @app.command()
 def upgrade(
     ctx: typer.Context,
     yes: Annotated[bool, typer.Option("--yes", "-y", help="Skip confirmation prompts.", is_flag=True, show_default=True)] = False,
+    stage: Annotated[bool, typer.Option("--stage", help="Download into the staging area; apply later with 'ppm apply-staged'.", is_flag=True, show_default=True)] = False,
+    with_optional: Annotated[bool, typer.Option("--with-optional", help="Also install optional dependencies.", is_flag=True, show_default=True)] = False,
+    no_deps: Annotated[bool, typer.Option("--no-deps", help="Do not install missing dependencies.", is_flag=True, show_default=True)] = False,
 ):
+    """upgrade all outdated plugins"""
     from rich.table import Table
+
+    from .plugin_manager import InstallStep
     pm = get_plugin_manager()
     projects, _ = pm.get_installations()
 
@@ -266,13 +403,114 @@ def upgrade(
     if not yes:
         typer.confirm("Do you want to proceed with the upgrade?", abort=True, default=False)
 
-    for project, new_version in upgrade_summary:
-        try:
-            ctx.invoke(install, ctx, name=project.project_id, version=new_version.version_name, no_change_track=True)
-        except Exception as e:
-            console.print_error(f"Failed to upgrade plugin '{project.name}': {e}")
+    # the projects and target versions are already resolved; install them as they are
+    plan = [InstallStep(project, new_version) for project, new_version in upgrade_summary]
+    if not no_deps:
+        plan = _add_dependencies(pm, plan, with_optional, yes)
+    if _apply_installs(pm, plan, stage):
+        raise typer.Exit(code=1)
+
+
+@app.command()
+def apply_staged(
+    ctx: typer.Context,
+):
+    """swap staged plugins into place"""
+    pm = get_plugin_manager()
+    if not pm.get_staged():
+        console.print("No staged plugins to apply.")
+        raise typer.Exit()
+
+    applied, failed = pm.apply_staged(console.print)
+    for entry in applied:
+        console.print(f"[green]✓[/green] [white]{entry.filename} applied![/white]")
+    for entry in failed:
+        console.print_error(f"Staged file '{entry.filename}' is missing or incomplete; run the staged install again.")
+    if failed:
+        raise typer.Exit(code=1)
     
 
+@app.command()
+def lock(
+    ctx: typer.Context,
+    output: Annotated[str | None, typer.Option("--output", "-o", help="Path of the lockfile to write. Defaults to ppm.lock.")] = None,
+):
+    """write the installed plugin versions to a lockfile"""
+    from .config import Config
+    pm = get_plugin_manager()
+    context: CliContext = ctx.obj
+    path = Path(output or Config.LOCKFILE)
+
+    lockfile, unrecognized = pm.create_lockfile(context.game_version)
+    if not lockfile.plugins:
+        console.print_warning("No recognized plugins found to lock.")
+        console.print("Run [green]ppm update[/green] to identify installed plugins.")
+        raise typer.Exit(code=1)
+    for installation in unrecognized:
+        console.print_warning(f"'{installation.filename}' is not recognized and was not locked.")
+    lockfile.write(path)
+    console.print(f"[green]✓[/green] [white]Locked {len(lockfile.plugins)} plugins to '{path}'.[/white]")
+
+
+@app.command()
+def sync(
+    ctx: typer.Context,
+    lockfile_path: Annotated[str | None, typer.Option("--lockfile", "-f", help="Path of the lockfile to apply. Defaults to ppm.lock.")] = None,
+    prune: Annotated[bool, typer.Option("--prune", help="Also remove installed plugins that are not in the lockfile.", is_flag=True, show_default=True)] = False,
+    stage: Annotated[bool, typer.Option("--stage", help="Download into the staging area; apply later with 'ppm apply-staged'.", is_flag=True, show_default=True)] = False,
+    yes: Annotated[bool, typer.Option("--yes", "-y", help="Skip confirmation prompts.", is_flag=True, show_default=True)] = False,
+):
+    """install the plugin versions recorded in a lockfile"""
+    from rich.table import Table
+
+    from .config import Config
+    from .exceptions import LockfileException
+    from .lockfile import Lockfile
+    pm = get_plugin_manager()
+    context: CliContext = ctx.obj
+    path = Path(lockfile_path or Config.LOCKFILE)
+
+    if prune and stage:
+        console.print_error("--prune cannot be combined with --stage.")
+        raise typer.Exit(code=1)
+    if not path.exists():
+        console.print_error(f"Lockfile '{path}' not found. Run [green]ppm lock[/green] to create one.")
+        raise typer.Exit(code=1)
+    try:
+        lockfile = Lockfile.read(path)
+    except LockfileException as e:
+        console.print_error(str(e))
+        raise typer.Exit(code=1)
+    if lockfile.game_version and lockfile.game_version != context.game_version:
+        console.print_warning(f"Lockfile was created for PaperMC {lockfile.game_version}, this server runs {context.game_version}.")
+
+    plan = pm.plan_sync(lockfile, prune)
+    if plan.empty:
+        console.print(f"All {len(plan.unchanged)} locked plugins are already installed.")
+        raise typer.Exit()
+
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("Plugin Name", style="dim", width=30)
+    table.add_column("Current Version", style="dim", width=20)
+    table.add_column("Locked Version", style="dim", width=20)
+    for step in plan.install:
+        current_version = step.project.current_version.version_name if step.project.current_version else "N/A"
+        table.add_row(step.project.name, current_version, step.file_info.version_name)
+    for installation in plan.remove:
+        table.add_row(installation.filename, "", "[red]remove[/red]")
+    for locked in plan.retrack:
+        table.add_row(locked.name, locked.version_name, f"track {locked.track}")
+    console.print(table)
+
+    if not yes:
+        typer.confirm("Do you want to proceed with the sync?", abort=True, default=False)
+
+    pm.apply_tracks(plan.retrack)
+    pm.remove_installations(plan.remove, console.print)
+    if plan.install and _apply_installs(pm, plan.install, stage):
+        raise typer.Exit(code=1)
+
+
 @app.command()
 def remove(
     ctx: typer.Context,
@@ -299,12 +537,7 @@ def remove(
     if installation is None:
         console.print_error(f"No installation record found for plugin '{project.name}'.")
         raise typer.Exit(code=1)
-    plugin_path = Path("plugins") / installation.filename
-    if plugin_path.exists():
-        console.print(f"Removing plugin file '{installation.filename}'...")
-        plugin_path.unlink()
-
-    pm.db.remove_installation(installation.filename)
+    pm.remove_installations([installation], console.print)
     console.print(f"[green]✓[/green] [white]{project.name} removed![/white]")
 
 
@@ -312,10 +545,23 @@ def remove(
 def clean(
     ctx: typer.Context,
     snapshot: Annotated[bool, typer.Option("--snapshot", "-s", help="Remove all snapshots.", is_flag=True, show_default=True)] = False,
+    cache: Annotated[bool, typer.Option("--cache", "-c", help="Remove all cached plugin jars.", is_flag=True, show_default=True)] = False,
     yes: Annotated[bool, typer.Option("--yes", "-y", help="Skip confirmation prompts.", is_flag=True, show_default=True)] = False,
 ):
     """Remove cached database"""
     from .config import Config
+    if cache:
+        from .jar_cache import JarCache
+        jar_cache = JarCache()
+        if not jar_cache.entries():
+            console.print("[yellow]⚠[/yellow] [white]No cached jars found to clean.[/white]")
+            raise typer.Exit()
+        if not yes:
+            typer.confirm(f"Are you sure you want to delete the jar cache at '{jar_cache.root}'?", abort=True, default=False)
+        jar_cache.clear()
+        console.print("[green]✓[/green] [white]Jar cache cleaned.[/white]")
+        raise typer.Exit()
+
     db_path = Path(Config.DB_PATH)
     if not db_path.exists():
         console.print("[yellow]⚠[/yellow] [white]No database found to clean.[/white]")
@@ -364,7 +610,7 @@ def track(
     project.installation_type = track.upper()
     project.current_version
     sha1 = pm.db.get_installed_project_sha1(project.project_id)
-    pm.db.update_installation_type(sha1, project.installation_type)
+    pm.set_track(sha1, project.installation_type)
     console.print(f"[green]✓[/green] [white]Plugin '{project.name}' is now tracking [cyan]{project.installation_type}[/cyan] versions.[/white]")
 
 
@@ -412,10 +658,7 @@ def snapshots(
     console.print(table)
 
 def get_snapshot_names() -> list[str]:
-    logzero.loglevel(logzero.logging.CRITICAL)
-    pm = get_plugin_manager()
-    snapshots = pm.db.get_all_snapshots()
-    return [snapshot.name for snapshot in snapshots]
+    return _completion_names(completion.SNAPSHOTS, lambda pm: pm.db.get_snapshot_names())
 
 @app.command()
 def restore(
@@ -474,11 +717,22 @@ def remove_snapshot(
 @app.callback(invoke_without_command=True)
 def setup_app(
     ctx: typer.Context,
-    default_source: Annotated[str, typer.Option("--source", "-s", help="Default Connector source to use.", show_default=True, autocompletion=list_connectors)] = "Modrinth",
+    default_source: Annotated[str, typer.Option("--source", "-s", help="Default Connector source to use.", show_default=True, autocompletion=connector_names)] = "Modrinth",
+    all_sources: Annotated[bool, typer.Option("--all-sources", help="Query every connector concurrently instead of only the default source.", is_flag=True, show_default=True)] = False,
     show_version: bool = typer.Option(None, "--version", help="Show the application version and exit.", is_eager=True),
     verbose: Annotated[int, typer.Option("--verbose", "-v", count=True)] = 0,
 ):
     setup_logging(verbose)
+    if show_version:
+        from importlib.metadata import PackageNotFoundError
+        from importlib.metadata import version as package_version
+        try:
+            app_version = package_version("papermc_plugin_manager")
+        except PackageNotFoundError:
+            app_version = "unknown"
+        console.print(f"[cyan]PaperMC Plugin Manager[/cyan] [green]v{app_version}[/green]")
+        raise typer.Exit()
+
     game_version = get_papermc_version()
     if game_version is None:
         console.print_warning("Could not determine PaperMC version from version_history.json. Please run this tool in the directory containing your PaperMC server.")
@@ -486,18 +740,21 @@ def setup_app(
 
     from .config import Config
     Config.DEFAULT_SOURCE = default_source
+    Config.GAME_VERSION = game_version
+    Config.MULTI_SOURCE = all_sources
 
     ctx.obj = CliContext(
         game_version=game_version,
         default_source=default_source,
     )
 
-    if show_version:
-        app_version = version("papermc_plugin_manager")
-        console.print(f"[cyan]PaperMC Plugin Manager[/cyan] [green]v{app_version}[/green]")
-        raise typer.Exit()
-
 
 
 def main():
-    app()
+    from .exceptions import PPMException
+
+    try:
+        app()
+    except PPMException as e:
+        console.print_error(str(e))
+        sys.exit(1)
@@ -0,0 +1,55 @@
+"""Cache of the names offered by shell completion.
+
+The database keeps a small JSON file next to itself up to date whenever the installed plugins or
+the snapshots change. Completion callbacks read that file with the standard library only, so a TAB
+press does not import SQLAlchemy or the connectors, open the database or hash any jar.
+"""
+
+import json
+import os
+from pathlib import Path
+
+from logzero import logger
+
+from .config import Config
+
+PLUGINS = "plugins"
+SNAPSHOTS = "snapshots"
+
+
+def cache_path(db_path: str | None = None) -> Path:
+    return Path(f"{db_path or Config.DB_PATH}{Config.COMPLETION_CACHE_SUFFIX}")
+
+
+def read_names(key: str, db_path: str | None = None) -> list[str] | None:
+    """Names cached under ``key``, or None if the cache does not have them yet."""
+    try:
+        with open(cache_path(db_path)) as f:
+            names = json.load(f).get(key)
+    except (OSError, ValueError, AttributeError):
+        return None
+    return names if isinstance(names, list) else None
+
+
+def write_names(db_path: str, **names: list[str]):
+    """Replace the cached names of the given keys, keeping the others.
+
+    Failing to write the cache only makes completion fall back to the database, so errors are
+    logged and ignored.
+    """
+    path = cache_path(db_path)
+    try:
+        with open(path) as f:
+            data = json.load(f)
+        if not isinstance(data, dict):
+            data = {}
+    except (OSError, ValueError):
+        data = {}
+    data.update({key: sorted(set(values)) for key, values in names.items()})
+    tmp = path.with_name(path.name + ".tmp")
+    try:
+        with open(tmp, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+    except OSError as e:
+        logger.debug(f"Could not write completion cache {path}: {e}")
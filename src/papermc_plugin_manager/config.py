@@ -6,4 +6,17 @@ class Config:
 
     # Default settings
     DEFAULT_SOURCE: str = "not_set"
+    GAME_VERSION: str | None = None
+    MULTI_SOURCE: bool = False
+    SOURCE_TIMEOUT: float = 10.0
+    # concurrent requests to a source when fetching data for every installed plugin
+    MAX_SOURCE_REQUESTS: int = 8
     DB_PATH: str = "ppm.db"
+    # appended to the database path to name the shell completion cache
+    COMPLETION_CACHE_SUFFIX: str = ".completion.json"
+    MAX_DOWNLOADS: int = 8
+    MAX_DOWNLOADS_PER_HOST: int = 4
+    JAR_CACHE_DIR: str = ".ppm-cache"
+    JAR_CACHE_MAX_BYTES: int = 512 * 1024 * 1024
+    STAGING_DIR: str = ".ppm-staging"
+    LOCKFILE: str = "ppm.lock"
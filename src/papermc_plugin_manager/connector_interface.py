@@ -1,10 +1,15 @@
 from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterable, Iterator, MutableMapping
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional
+from typing import TYPE_CHECKING, Any, Optional
 
 from logzero import logger
-from semantic_version import Version
+
+from .game_versions import GameVersions, intern_game_versions, version_mask
+
+if TYPE_CHECKING:
+    from semantic_version import Version
 
 
 def sanitize_version_name(version_name: str) -> str:
@@ -16,22 +21,62 @@ def sanitize_version_name(version_name: str) -> str:
     return version_name
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
+class FileDependency:
+    """A dependency declared by a version."""
+
+    # REQUIRED, OPTIONAL, INCOMPATIBLE or EMBEDDED
+    dependency_type: str
+    project_id: str | None = None
+    # set when the dependency is pinned to an exact version
+    version_id: str | None = None
+
+
+@dataclass(slots=True)
 class FileInfo:
     version_id: str
     project_id: str
     version_name: str
     version_type: str
     release_date: datetime
-    game_versions: list[str]
+    # interned; equal lists share one tuple, see game_versions.py
+    game_versions: GameVersions
     sha1: str
     url: str
+    # changelog; empty until loaded on demand with PluginManager.load_description
     description: str = ""
     hashes: dict[str, str] = field(default_factory=dict)
+    # declared dependencies; None when not loaded, see SourceDatabase.get_file_dependencies
+    dependencies: tuple[FileDependency, ...] | None = None
+    # parsed version name, filled on first use; see parsed_version
+    _parsed_version: "tuple[str, Version | None] | None" = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.game_versions = intern_game_versions(self.game_versions)
 
     def __str__(self) -> str:
         return f"{self.version_name} ({self.version_type}) - Released on {self.release_date.strftime('%Y-%m-%d')}"
 
+    @property
+    def game_version_mask(self) -> int:
+        """Bitset of the supported game versions; see game_versions.version_mask."""
+        return version_mask(self.game_versions)
+
+    @property
+    def parsed_version(self) -> "Version | None":
+        """The version name as a semantic version, or None if it cannot be parsed.
+
+        Parsed once and reused until the version name changes.
+        """
+        if self._parsed_version is None or self._parsed_version[0] != self.version_name:
+            from semantic_version import Version
+            try:
+                parsed = Version.coerce(sanitize_version_name(self.version_name))
+            except ValueError:
+                parsed = None
+            self._parsed_version = (self.version_name, parsed)
+        return self._parsed_version[1]
+
 
 def release_type_weights(release_type: str) -> int:
     weights = {
@@ -41,7 +86,161 @@ def release_type_weights(release_type: str) -> int:
     }
     return weights.get(release_type.lower(), 0)
 
-@dataclass
+class VersionMap(MutableMapping[str, FileInfo]):
+    """Versions of a project by version ID, with lookups memoized until the next change.
+
+    Adding, replacing or removing a version drops the memoized results. Changing a FileInfo in
+    place does not, so replace the entry instead.
+    """
+
+    __slots__ = ("_data", "_memo", "revision")
+
+    def __init__(self, versions: dict[str, FileInfo] | Iterable[tuple[str, FileInfo]] = ()):
+        self._data: dict[str, FileInfo] = dict(versions)
+        self._memo: dict[Any, Any] = {}
+        self.revision = 0
+
+    def __getitem__(self, version_id: str) -> FileInfo:
+        return self._data[version_id]
+
+    def __setitem__(self, version_id: str, file_info: FileInfo):
+        self._data[version_id] = file_info
+        self._changed()
+
+    def __delitem__(self, version_id: str):
+        del self._data[version_id]
+        self._changed()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, version_id: object) -> bool:
+        return version_id in self._data
+
+    def __repr__(self) -> str:
+        return f"VersionMap({self._data!r})"
+
+    def values(self):
+        return self._data.values()
+
+    def items(self):
+        return self._data.items()
+
+    def _changed(self):
+        self.revision += 1
+        self._memo.clear()
+
+    def memoize(self, key: Any, compute: Callable[[], Any]) -> Any:
+        """Return the memoized result for ``key``, computing it on the first call after a change."""
+        if key not in self._memo:
+            self._memo[key] = compute()
+        return self._memo[key]
+
+    def _first_by(self, key: str, attribute: Callable[[FileInfo], str]) -> dict[str, tuple[int, FileInfo]]:
+        def build():
+            index: dict[str, tuple[int, FileInfo]] = {}
+            for position, file_info in enumerate(self._data.values()):
+                index.setdefault(attribute(file_info), (position, file_info))
+            return index
+        return self.memoize(key, build)
+
+    def find(self, version: str) -> FileInfo | None:
+        """First version, in insertion order, whose version ID or version name is ``version``."""
+        by_name = self._first_by("by_name", lambda f: f.version_name).get(version)
+        by_id = self._first_by("by_id", lambda f: f.version_id).get(version)
+        if by_name is None or by_id is None:
+            hit = by_name or by_id
+            return hit[1] if hit else None
+        return min(by_name, by_id, key=lambda hit: hit[0])[1]
+
+    def find_by_sha1(self, sha1: str) -> FileInfo | None:
+        hit = self._first_by("by_sha1", lambda f: f.sha1).get(sha1)
+        return hit[1] if hit else None
+
+    def by_type(self) -> dict[str, list[FileInfo]]:
+        """Versions grouped by lowercase release type, in insertion order."""
+        def group():
+            groups: dict[str, list[FileInfo]] = {}
+            for file_info in self._data.values():
+                groups.setdefault(file_info.version_type.lower(), []).append(file_info)
+            return groups
+        return self.memoize("by_type", group)
+
+
+class LazyVersionMap(VersionMap):
+    """VersionMap that starts with a few versions and precomputed lookup results.
+
+    The lookups in ``lookups`` are answered directly. Anything else, such as iterating, a lookup
+    by name or a version that was not preloaded, loads every version with ``loader`` first.
+    """
+
+    __slots__ = ("_loader",)
+
+    def __init__(
+        self,
+        versions: dict[str, FileInfo],
+        lookups: dict[str, FileInfo | None],
+        loader: Callable[[], dict[str, FileInfo]],
+    ):
+        super().__init__(versions)
+        self._memo.update(lookups)
+        self._loader: Callable[[], dict[str, FileInfo]] | None = loader
+
+    @property
+    def loaded(self) -> bool:
+        return self._loader is None
+
+    def load(self):
+        if self._loader is None:
+            return
+        loader, self._loader = self._loader, None
+        self._data = dict(loader())
+        self._memo.clear()
+
+    def __getitem__(self, version_id: str) -> FileInfo:
+        if version_id not in self._data:
+            self.load()
+        return self._data[version_id]
+
+    def __setitem__(self, version_id: str, file_info: FileInfo):
+        self.load()
+        super().__setitem__(version_id, file_info)
+
+    def __delitem__(self, version_id: str):
+        self.load()
+        super().__delitem__(version_id)
+
+    def __iter__(self) -> Iterator[str]:
+        self.load()
+        return super().__iter__()
+
+    def __len__(self) -> int:
+        self.load()
+        return super().__len__()
+
+    def __contains__(self, version_id: object) -> bool:
+        if version_id not in self._data:
+            self.load()
+        return version_id in self._data
+
+    def values(self):
+        self.load()
+        return super().values()
+
+    def items(self):
+        self.load()
+        return super().items()
+
+    def memoize(self, key: Any, compute: Callable[[], Any]) -> Any:
+        if key not in self._memo:
+            self.load()
+        return super().memoize(key, compute)
+
+
+@dataclass(slots=True)
 class ProjectInfo:
     source: str
     project_id: str
@@ -49,9 +248,15 @@ class ProjectInfo:
     author: str
     description: str | None
     downloads: int
-    versions: dict[str, FileInfo] = field(default_factory=dict)
+    versions: VersionMap = field(default_factory=VersionMap)
     current_version: FileInfo | None = None
     installation_type: str = "RELEASE"
+    # URL-friendly name, for sources that have one
+    slug: str | None = None
+
+    def __post_init__(self):
+        if not isinstance(self.versions, VersionMap):
+            self.versions = VersionMap(self.versions)
 
     def __str__(self) -> str:
         return f"{self.name} by {self.author} (ID: {self.project_id})"
@@ -68,47 +273,59 @@ class ProjectInfo:
             bool: True if info is newer than other, False otherwise
         """
 
-        try:
-            info_version_str = sanitize_version_name(info.version_name)
-            other_version_str = sanitize_version_name(other.version_name)
-
-            info_version = Version.coerce(info_version_str)
-            other_version = Version.coerce(other_version_str)
-
-            return info_version > other_version
-        except ValueError:
+        info_version = info.parsed_version
+        other_version = other.parsed_version
+        if info_version is None or other_version is None:
             # If version parsing fails, fall back to date comparison
             logger.debug(f"Version parsing failed for '{info.version_name}' or '{other.version_name}'. Falling back to date comparison.")
             return info.release_date > other.release_date
+        return info_version > other_version
+
+    @classmethod
+    def find_latest(cls, files: Iterable[FileInfo]) -> FileInfo | None:
+        """The newest of ``files`` according to is_newer_than."""
+        # a single pass in insertion order; the comparison is not a total order when some
+        # version names cannot be parsed, so the scan order is part of the result
+        latest = None
+        for file_info in files:
+            if latest is None or cls.is_newer_than(file_info, latest):
+                latest = file_info
+        return latest
 
     def get_latest_type(self, release_type: str = "release") -> FileInfo | None:
-        latest_release = None
-        for file_info in self.versions.values():
-            if file_info.version_type.lower() == release_type.lower() and (latest_release is None or self.is_newer_than(file_info, latest_release)):
-                latest_release = file_info
-        return latest_release
+        release_type = release_type.lower()
+        return self.versions.memoize(
+            f"type:{release_type}",
+            lambda: self.find_latest(self.versions.by_type().get(release_type, [])),
+        )
 
     def get_latest_type_weighted(self, min_release_type: str) -> FileInfo | None:
-        latest = None
-        min_weight = release_type_weights(min_release_type)
-        for file_info in self.versions.values():
-            if release_type_weights(file_info.version_type) >= min_weight:
-                if latest is None or self.is_newer_than(file_info, latest):
-                    latest = file_info
-        return latest
+        return self._get_latest_weighted(release_type_weights(min_release_type))
+
+    def _get_latest_weighted(self, min_weight: int) -> FileInfo | None:
+        return self.versions.memoize(
+            f"weighted:{min_weight}",
+            lambda: self.find_latest(f for f in self.versions.values() if release_type_weights(f.version_type) >= min_weight),
+        )
 
     def get_latest(self) -> FileInfo | None:
-        latest = None
-        for file_info in self.versions.values():
-            if latest is None or self.is_newer_than(file_info, latest):
-                latest = file_info
-        return latest
+        return self.versions.memoize("latest", lambda: self.find_latest(self.versions.values()))
+
+    def precomputed_lookups(self) -> dict[str, FileInfo | None]:
+        """Results of the lookups `list` and `upgrade` need, keyed like the memoized lookups.
+
+        Stored with the project so that a LazyVersionMap can answer them without loading every version.
+        """
+        lookups = {"latest": self.get_latest(), "type:release": self.get_latest_type("release")}
+        for weight in range(release_type_weights("release") + 1):
+            lookups[f"weighted:{weight}"] = self._get_latest_weighted(weight)
+        return lookups
 
     def get_version(self, version: str) -> FileInfo | None:
-        for file_info in self.versions.values():
-            if file_info.version_name == version or file_info.version_id == version:
-                return file_info
-        return None
+        return self.versions.find(version)
+
+    def get_version_by_sha1(self, sha1: str) -> FileInfo | None:
+        return self.versions.find_by_sha1(sha1)
     
     def is_out_dated(self) -> Optional[FileInfo]:
         if not self.current_version:
@@ -128,9 +345,18 @@ class SearchResult:
     author: str
     downloads: int
     description: str
+    source: str = ""
 
 
 class ConnectorInterface(ABC):
+    def __init__(self, game_version: str | None = None):
+        """
+        Args:
+            game_version: When set, project version lists only include versions compatible with this
+                game version. Pass ``full_history=True`` to ``get_project_info`` to fetch everything.
+        """
+        self.game_version = game_version
+
     @abstractmethod
     def get_download_link(self, file: FileInfo) -> str:
         """Get a download link for a given file"""
@@ -142,8 +368,12 @@ class ConnectorInterface(ABC):
         pass
 
     @abstractmethod
-    def get_project_info(self, id: str) -> ProjectInfo:
-        """Get detailed information about a project by its ID."""
+    def get_project_info(self, id: str, full_history: bool = False) -> ProjectInfo:
+        """Get detailed information about a project by its ID.
+
+        Unless ``full_history`` is set, connectors with a ``game_version`` only return the versions
+        compatible with it.
+        """
         pass
 
     @abstractmethod
@@ -151,6 +381,14 @@ class ConnectorInterface(ABC):
         """Get detailed information about a file by its ID."""
         pass
 
+    def prefetch(self, project_ids: list[str]):
+        """Fetch shared metadata for several projects in bulk before they are looked up one by one."""
+        return
+
+    def get_changelog(self, file: FileInfo) -> str:
+        """Get the changelog of a file. Connectors that skip changelogs when listing versions should override this."""
+        return file.description
+
     def refresh_cache(self):
         """Refresh any internal caches if applicable."""
         raise NotImplementedError("Cache refresh not implemented for this connector.")
@@ -169,6 +407,8 @@ def get_connector(connector: str, **kwargs) -> ConnectorInterface:
         DownloadInterface: An instance of the appropriate connector.
     """
 
+    from . import connectors  # noqa: F401  registers the built-in connectors
+
     # Factory method to get the appropriate connector
     # search the subclasses of ConnectorInterface recursively
     def all_subclasses(cls):
@@ -184,6 +424,8 @@ def list_connectors() -> list[str]:
     Returns:
         list[str]: A list of available connector names.
     """
+    from . import connectors  # noqa: F401  registers the built-in connectors
+
     connector_names = []
     def all_subclasses(cls):
         return set(cls.__subclasses__()).union([s for c in cls.__subclasses__() for s in all_subclasses(c)])
@@ -2,15 +2,23 @@ from collections.abc import Callable
 from functools import lru_cache
 from importlib.metadata import version as pkg_version
 
+from logzero import logger
 from requests import HTTPError
 
-from ..connector_interface import ConnectorInterface, FileInfo, ProjectInfo, SearchResult
+from ..connector_interface import ConnectorInterface, FileDependency, FileInfo, ProjectInfo, SearchResult
 from ..exceptions import PluginNotFoundException
 from ..utils import default_feedback_cb
-from .modrinth_models import Project, SearchResponse, TeamMember, Version
+from .modrinth_models import Project, SearchResponse, TeamMember, Version, VersionSummary
 
 
-def version_to_file_info(version: Version) -> FileInfo:
+def find_owner(members: list[TeamMember]) -> str:
+    for member in members:
+        if member.is_owner:
+            return member.user.username
+    return "Unknown"
+
+
+def version_to_file_info(version: Version | VersionSummary) -> FileInfo:
     hashes = {
         "sha1": version.files[0].hashes.sha1,
         "sha512": version.files[0].hashes.sha512,
@@ -24,13 +32,25 @@ def version_to_file_info(version: Version) -> FileInfo:
         game_versions=version.game_versions,
         sha1=version.files[0].hashes.sha1,
         url=version.files[0].url,
-        description=version.changelog or "",
-        hashes=hashes
+        description=(version.changelog if isinstance(version, Version) else None) or "",
+        hashes=hashes,
+        dependencies=tuple(
+            FileDependency(dependency.dependency_type.name, dependency.project_id, dependency.version_id)
+            for dependency in version.dependencies
+        ),
     )
 
 
 class Modrinth(ConnectorInterface):
     API_BASE = "https://api.modrinth.com/v2"
+    PREFETCH_BATCH_SIZE = 100
+
+    def __init__(self, game_version: str | None = None):
+        super().__init__(game_version)
+        # filled by prefetch(); keyed by project ID and slug
+        self._projects: dict[str, Project] = {}
+        # owner usernames keyed by team ID
+        self._owners: dict[str, str] = {}
 
     @property
     def HEADERS(self):
@@ -42,29 +62,65 @@ class Modrinth(ConnectorInterface):
     def get_download_link(self, file: FileInfo) -> str:
         return Version.get(file.version_id).files[0].url
 
+    def get_changelog(self, file: FileInfo) -> str:
+        if file.description:
+            return file.description
+        try:
+            return Version.get(file.version_id).changelog or ""
+        except HTTPError as e:
+            raise PluginNotFoundException(f"Version with ID {file.version_id} not found on Modrinth.") from e
+
     def get_file_info(self, id: str) -> FileInfo:
         return self._get_file_info_cached(id)
 
+    def prefetch(self, project_ids: list[str]):
+        """Fetch projects and their team owners in two batched requests."""
+        ids = [id for id in dict.fromkeys(project_ids) if id not in self._projects]
+        for start in range(0, len(ids), self.PREFETCH_BATCH_SIZE):
+            try:
+                projects = Project.get_multiple(ids[start:start + self.PREFETCH_BATCH_SIZE])
+            except HTTPError as e:
+                logger.debug(f"Failed to prefetch projects from Modrinth: {e}")
+                return
+            for project in projects:
+                self._projects[project.id] = project
+                self._projects[project.slug] = project
+
+            team_ids = list(dict.fromkeys(p.team for p in projects if p.team not in self._owners))
+            if not team_ids:
+                continue
+            try:
+                teams = TeamMember.list_for_teams(team_ids)
+            except HTTPError as e:
+                logger.debug(f"Failed to prefetch team members from Modrinth: {e}")
+                continue
+            for members in teams:
+                if members:
+                    self._owners[members[0].team_id] = find_owner(members)
+
+    def _get_owner(self, team_id: str) -> str:
+        if team_id not in self._owners:
+            self._owners[team_id] = find_owner(TeamMember.list_for_team(team_id))
+        return self._owners[team_id]
+
     def query(self, name: str, mc_version: str | None = None, limit: int = 5) -> list[SearchResult]:
         return self._query_cached(name, mc_version, limit)
 
-    def get_project_info(self, id: str) -> ProjectInfo:
-        return self._get_project_info_cached(id)
+    def get_project_info(self, id: str, full_history: bool = False) -> ProjectInfo:
+        return self._get_project_info_cached(id, full_history)
 
     @lru_cache(maxsize=128)
-    def _get_project_info_cached(self, id: str, cb: Callable[[str], None] = default_feedback_cb) -> ProjectInfo:
-        try:
-            modrinth_project = Project.get(id)
-        except HTTPError as e:
-            raise PluginNotFoundException(f"Project with ID {id} not found on Modrinth.") from e
-
-        cb(f"Fetching team members info for project {modrinth_project.title} ({id})...")
-        members = TeamMember.list_for_project(id)
-        owner = "Unknown"
-        for member in members:
-            if member.is_owner:
-                owner = member.user.username
-                break
+    def _get_project_info_cached(self, id: str, full_history: bool = False, cb: Callable[[str], None] = default_feedback_cb) -> ProjectInfo:
+        modrinth_project = self._projects.get(id)
+        if modrinth_project is None:
+            try:
+                modrinth_project = Project.get(id)
+            except HTTPError as e:
+                raise PluginNotFoundException(f"Project with ID {id} not found on Modrinth.") from e
+
+        if modrinth_project.team not in self._owners:
+            cb(f"Fetching team members info for project {modrinth_project.title} ({id})...")
+        owner = self._get_owner(modrinth_project.team)
 
         plugin_info = ProjectInfo(
             source="Modrinth",
@@ -73,9 +129,11 @@ class Modrinth(ConnectorInterface):
             author=owner,
             description=modrinth_project.description,
             downloads=modrinth_project.downloads,
+            slug=modrinth_project.slug,
         )
         cb(f"Fetching versions info for project {modrinth_project.title} ({id})...")
-        versions = Version.list_for_project(id, loaders=["paper"])
+        game_versions = None if full_history or not self.game_version else [self.game_version]
+        versions = VersionSummary.list_for_project(id, loaders=["paper"], game_versions=game_versions)
         if not versions:
             return plugin_info
         for version in versions:
@@ -93,7 +151,7 @@ class Modrinth(ConnectorInterface):
         response = SearchResponse.search(name, limit=limit, facets=facets)
         results = []
         for hit in response.hits:
-            result = SearchResult(hit.project_id, hit.title, hit.author, hit.downloads, hit.description)
+            result = SearchResult(hit.project_id, hit.title, hit.author, hit.downloads, hit.description, "Modrinth")
             results.append(result)
         return results
 
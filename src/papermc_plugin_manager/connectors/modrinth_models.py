@@ -10,7 +10,7 @@ from enum import Enum
 from typing import Any
 
 import requests
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 
 # ============== API Configuration ==============
 
@@ -43,6 +43,39 @@ class ModrinthAPIConfig:
         response.raise_for_status()
         return response.json()
 
+    @classmethod
+    def api_get_raw(cls, path: str, params: dict[str, Any] | None = None) -> bytes:
+        """Make a GET request to the Modrinth API and return the undecoded body.
+
+        Used together with ``TypeAdapter.validate_json`` so large payloads are parsed
+        by pydantic-core directly instead of going through ``json.loads`` first.
+        """
+        url = f"{cls.BASE_URL}{path}"
+        response = requests.get(url, params=params, headers=cls.HEADERS, timeout=cls.TIMEOUT)
+
+        if response.status_code == 429:
+            reset = response.headers.get("X-Ratelimit-Reset", "?")
+            raise RuntimeError(f"Rate limited by Modrinth API. Retry after ~{reset} seconds.")
+
+        response.raise_for_status()
+        return response.content
+
+
+def _version_list_params(
+    loaders: list[str] | None = None,
+    game_versions: list[str] | None = None,
+    featured: bool | None = None,
+) -> dict[str, str]:
+    """Build query parameters for GET /project/{id}/version."""
+    params = {}
+    if loaders:
+        params["loaders"] = json.dumps(loaders)
+    if game_versions:
+        params["game_versions"] = json.dumps(game_versions)
+    if featured is not None:
+        params["featured"] = str(featured).lower()
+    return params
+
 
 class ProjectType(str, Enum):
     """Type of project on Modrinth."""
@@ -249,18 +282,67 @@ class Version(BaseModel):
         Raises:
             requests.HTTPError: If the API request fails
         """
-        params = {}
-        if loaders:
-            params["loaders"] = json.dumps(loaders)
-        if game_versions:
-            params["game_versions"] = json.dumps(game_versions)
-        if featured is not None:
-            params["featured"] = str(featured).lower()
-
+        params = _version_list_params(loaders, game_versions, featured)
         data = ModrinthAPIConfig.api_get(f"/project/{project_id}/version", params=params)
         return [cls(**version_data) for version_data in data] # type: ignore
 
 
+class VersionFileSummary(BaseModel):
+    """Subset of VersionFile needed to build a FileInfo."""
+
+    hashes: VersionFileHash
+    url: str
+    primary: bool = False
+
+
+class VersionSummary(BaseModel):
+    """Lean view of a version, used when listing every version of a project.
+
+    Only the fields needed by ``FileInfo`` are validated; everything else in the
+    payload (notably the ``changelog`` Markdown) is skipped. Use ``Version.get``
+    to fetch the full record when the changelog is actually needed.
+    """
+
+    id: str
+    project_id: str
+    version_number: str
+    date_published: datetime
+    version_type: VersionType
+    files: list[VersionFileSummary]
+    dependencies: list[VersionDependency] = Field(default_factory=list)
+    game_versions: list[str]
+
+    @classmethod
+    def list_for_project(
+        cls,
+        project_id: str,
+        loaders: list[str] | None = None,
+        game_versions: list[str] | None = None,
+        featured: bool | None = None,
+    ) -> list["VersionSummary"]:
+        """
+        List all versions for a project, validating only the summary fields.
+
+        Args:
+            project_id: The project ID or slug
+            loaders: Filter by loaders (e.g., ["paper", "spigot"])
+            game_versions: Filter by game versions (e.g., ["1.20.1"])
+            featured: Filter by featured status
+
+        Returns:
+            List of VersionSummary objects
+
+        Raises:
+            requests.HTTPError: If the API request fails
+        """
+        params = _version_list_params(loaders, game_versions, featured)
+        raw = ModrinthAPIConfig.api_get_raw(f"/project/{project_id}/version", params=params)
+        return VERSION_SUMMARY_LIST.validate_json(raw)
+
+
+VERSION_SUMMARY_LIST = TypeAdapter(list[VersionSummary])
+
+
 # ============== Project Models ==============
 
 
@@ -563,6 +645,41 @@ class TeamMember(BaseModel):
         data = ModrinthAPIConfig.api_get(f"/project/{project_id}/members")
         return [cls(**member_data) for member_data in data] # type: ignore
 
+    @classmethod
+    def list_for_team(cls, team_id: str) -> list["TeamMember"]:
+        """
+        Get all members of a team.
+
+        Args:
+            team_id: The team ID
+
+        Returns:
+            List of TeamMember objects
+
+        Raises:
+            requests.HTTPError: If the API request fails
+        """
+        data = ModrinthAPIConfig.api_get(f"/team/{team_id}/members")
+        return [cls(**member_data) for member_data in data] # type: ignore
+
+    @classmethod
+    def list_for_teams(cls, team_ids: list[str]) -> list[list["TeamMember"]]:
+        """
+        Get the members of multiple teams in one request.
+
+        Args:
+            team_ids: List of team IDs
+
+        Returns:
+            One list of TeamMember objects per team
+
+        Raises:
+            requests.HTTPError: If the API request fails
+        """
+        params = {"ids": json.dumps(team_ids)}
+        data = ModrinthAPIConfig.api_get("/teams", params=params)
+        return [[cls(**member_data) for member_data in team] for team in data] # type: ignore
+
     @property
     def is_owner(self) -> bool:
         """Check if this team member is the project owner."""
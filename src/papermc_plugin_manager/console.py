@@ -1,5 +1,9 @@
 """Rich console utilities for the PaperMC Plugin Manager CLI."""
 
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
 
 from rich import box
 from rich.console import Console, Group
@@ -8,7 +12,12 @@ from rich.table import Table
 from rich.text import Text
 
 from .connector_interface import FileInfo, ProjectInfo, SearchResult
-from .database import InstallationTable
+from .game_versions import compatibility_score
+
+if TYPE_CHECKING:
+    from .database import InstallationStatusTable, InstallationTable
+    from .downloader import DownloadJob, ProgressCallback
+    from .plugin_manager import PluginReadiness
 
 
 def get_key_value_table(data: list[tuple[str, str]]) -> Table:
@@ -38,6 +47,30 @@ class PpmConsole(Console):
     def print_info(self, message: str):
         self.print(f"[cyan]ℹ[/cyan] {message}")
 
+    @contextmanager
+    def download_progress(self) -> Iterator["ProgressCallback"]:
+        """Show one progress bar per download; yields a callback for DownloadEngine.run."""
+        from rich.progress import BarColumn, DownloadColumn, Progress, TimeRemainingColumn, TransferSpeedColumn
+
+        with Progress(
+            "[progress.description]{task.description}",
+            BarColumn(),
+            DownloadColumn(),
+            TransferSpeedColumn(),
+            TimeRemainingColumn(),
+            console=self,
+        ) as progress:
+            tasks = {}
+            lock = threading.Lock()
+
+            def update(job: "DownloadJob", bytes_downloaded: int, total_size: int):
+                with lock:
+                    if job not in tasks:
+                        tasks[job] = progress.add_task(f"[cyan]Downloading {job.label}...", total=total_size or None)
+                progress.update(tasks[job], completed=bytes_downloaded)
+
+            yield update
+
     def print_project_info_panel(self, info: ProjectInfo, filename: str | None = None, game_version: str | None = None):
 
         latest_version = info.get_latest()
@@ -86,7 +119,7 @@ class PpmConsole(Console):
             )
         )
 
-    def print_installed_plugins_table(self, projects: list[ProjectInfo], game_version: str | None = None):
+    def print_installed_plugins_table(self, statuses: list["InstallationStatusTable"]):
         table = Table(
             title="[bold cyan] Installed Plugins [/bold cyan]",
             box=box.ROUNDED,
@@ -102,33 +135,29 @@ class PpmConsole(Console):
         table.add_column("Date", style="dim")
         table.add_column("Updates", style="white", justify="center")
 
-        for project in projects:
-            # Style the version type
-            file_info = project.current_version
-            if file_info is None:
+        for status in statuses:
+            if not status.recognized:
                 continue
 
-            new_version = project.is_out_dated()
-            if new_version:
-                status_display = f"[yellow]⚠ {new_version.version_name}[/yellow]"
+            if status.outdated:
+                status_display = f"[yellow]⚠ {status.latest_version}[/yellow]"
             else:
                 status_display = "[green]✓ up-to-date[/green]"
 
-            compatibility_info = get_compatibility_info(game_version, file_info.game_versions)
-            version_display = f"{compatibility_info} {file_info.version_name}"
+            version_display = f"{compatibility_icon(status.compatibility)} {status.version_name}"
 
             table.add_row(
-                project.project_id,
-                project.name,
+                status.project_id,
+                status.name,
                 version_display,
-                get_release_type_string(file_info.version_type),
-                project.installation_type,
-                file_info.release_date.strftime("%Y-%m-%d"),
+                get_release_type_string(status.version_type),
+                status.track,
+                status.release_date.strftime("%Y-%m-%d"),
                 status_display,
             )
         self.print(table)
 
-    def print_unidentified_plugins_table(self, unidentified_data: list[InstallationTable]):
+    def print_unidentified_plugins_table(self, unidentified_data: list["InstallationTable"]):
 
         table = Table(
             title="[bold yellow]Unidentified Plugins[/bold yellow]",
@@ -220,6 +249,40 @@ class PpmConsole(Console):
             )
         self.print(table)
 
+    def print_readiness_table(self, report: list["PluginReadiness"], target_version: str):
+        table = Table(
+            title=f"[bold cyan] Readiness for {target_version} [/bold cyan]",
+            box=box.ROUNDED,
+            show_header=True,
+            header_style="bold magenta",
+        )
+        table.add_column("ID", style="dim", width=10)
+        table.add_column("Plugin", style="bold green")
+        table.add_column("Installed", style="cyan")
+        table.add_column("Supported Versions", style="dim")
+        table.add_column("Status", style="white")
+
+        for readiness in report:
+            current = readiness.project.current_version
+            game_versions = readiness.candidate.game_versions if readiness.candidate else current.game_versions
+            mc_versions = ", ".join(reversed(game_versions[-3:]))
+            if len(game_versions) > 3:
+                mc_versions += f" +{len(game_versions) - 3} more"
+            if readiness.current_score == 3:
+                status = "[green]✓ ready[/green]"
+            elif readiness.candidate_score == 3:
+                status = f"[yellow]⚠ upgrade to {readiness.candidate.version_name}[/yellow]"
+            elif readiness.candidate_score == 2:
+                status = f"[yellow]⚠ {readiness.candidate.version_name} supports another patch[/yellow]"
+            elif readiness.current_score == 2:
+                status = "[yellow]⚠ supports another patch[/yellow]"
+            elif readiness.current_score == 0:
+                status = "[red]✗ no supporting version[/red]"
+            else:
+                status = "[dim]? unknown[/dim]"
+            table.add_row(readiness.project.project_id, readiness.project.name, current.version_name, mc_versions, status)
+        self.print(table)
+
     def print_search_results_table(self, results: list[SearchResult]):
         """Create a Rich Table for displaying search results."""
 
@@ -236,18 +299,24 @@ class PpmConsole(Console):
         table.add_column("Author", style="cyan")
         table.add_column("Downloads", justify="right", style="yellow")
         table.add_column("Description", no_wrap=False, style="white")
+        show_source = len({result.source for result in results}) > 1
+        if show_source:
+            table.add_column("Source", style="dim")
 
         for result in results:
             # Truncate description if too long
             desc = result.description or ""
 
-            table.add_row(
+            row = [
                 result.project_id,
                 result.project_name,
                 result.author,
                 f"{result.downloads:,}",
                 desc,
-            )
+            ]
+            if show_source:
+                row.append(result.source)
+            table.add_row(*row)
         self.print(table)
 
 
@@ -258,26 +327,8 @@ console = PpmConsole()
 
 
 def compute_compatibility_score(supported_versions: list[str], current_version: str | None) -> int:
-    # Parse game version into parts
-
-    if current_version and supported_versions:
-        game_parts = current_version.split(".")
-
-        # Check each supported version for best match
-        best_match = 0  # 0 = no match, 2 = two digits, 3 = three digits
-        for mc_version in supported_versions:
-            mc_parts = mc_version.split(".")
-
-            # Check for three-digit match
-            if len(game_parts) >= 3 and len(mc_parts) >= 3 and game_parts[:3] == mc_parts[:3]:
-                best_match = 3
-                break
-
-            # Check for two-digit match
-            if len(game_parts) >= 2 and len(mc_parts) >= 2 and game_parts[:2] == mc_parts[:2]:
-                best_match = max(best_match, 2)
-        return best_match
-    return -1
+    # 3 = three-digit match, 2 = two-digit match, 0 = no match, -1 = unknown
+    return compatibility_score(supported_versions, current_version)
 
 def get_compatibility_info(current_version: str | None, supported_versions: list[str], full: bool = False) -> str:
     score = compute_compatibility_score(supported_versions, current_version)
@@ -289,6 +340,9 @@ def get_compatibility_info(current_version: str | None, supported_versions: list
         if score == 1:
             return f"[red]✗ Not Compatible[/red] (supports [cyan]{', '.join(supported_versions)}[/cyan], server is [cyan]{current_version}[/cyan])"
         return "[dim]? Compatibility Unknown[/dim]"
+    return compatibility_icon(score)
+
+def compatibility_icon(score: int) -> str:
     if score == 3:
         return "[green]✓[/green]"
     if score == 2:
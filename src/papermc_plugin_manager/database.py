@@ -1,13 +1,42 @@
+import re
+import threading
 from datetime import datetime
+from typing import Optional
+
 from logzero import logger
-from sqlalchemy import DateTime, Integer, String, Text, create_engine, select, ForeignKey, LargeBinary
+from sqlalchemy import (
+    Boolean,
+    Connection,
+    DateTime,
+    Engine,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    Row,
+    String,
+    Text,
+    bindparam,
+    case,
+    create_engine,
+    delete,
+    inspect,
+    literal,
+    make_url,
+    or_,
+    select,
+    text,
+)
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.ext.mutable import MutableList
 from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column
 from sqlalchemy.types import JSON
-from typing import Optional
 
-from .connector_interface import FileInfo, ProjectInfo
+from . import completion
 from .config import Config
+from .connector_interface import FileDependency, FileInfo, LazyVersionMap, ProjectInfo, SearchResult, VersionMap
+from .exceptions import SchemaVersionException
+
 
 class Base(DeclarativeBase):
     pass
@@ -32,6 +61,7 @@ class SnapshotFileTable(Base):
 
 class FileHashTable(Base):
     __tablename__ = 'file_hash'
+    __table_args__ = (Index("ix_file_hash_sha1_hash_type", "sha1", "hash_type", unique=True),)
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     sha1: Mapped[str] = mapped_column(String, index=True)
     hash_type: Mapped[str] = mapped_column(String, nullable=False)
@@ -59,7 +89,8 @@ class FileTable(Base):
     release_date: Mapped[datetime] = mapped_column(DateTime)
     game_versions: Mapped[list[str]] = mapped_column(MutableList.as_mutable(JSON), default=list)
     url: Mapped[str] = mapped_column(String)
-    description: Mapped[str] = mapped_column(Text)
+    # changelogs can be large; only loaded when asked for, see get_file_description
+    description: Mapped[str] = mapped_column(Text, deferred=True)
     sha1: Mapped[str] = mapped_column(String, unique=True, index=True)
 
     @classmethod
@@ -70,21 +101,27 @@ class FileTable(Base):
             version_name=info.version_name,
             version_type=info.version_type,
             release_date=info.release_date,
-            game_versions=info.game_versions,
+            game_versions=list(info.game_versions),
             sha1=info.sha1,
             url=info.url,
             description=info.description,
         )
 
-    def update(self, info: FileInfo):
+    def update(self, info: FileInfo) -> bool:
+        """Update the row from ``info``; returns whether the game versions changed."""
         self.project_id = info.project_id
         self.version_name = info.version_name
         self.version_type = info.version_type
         self.release_date = info.release_date
-        self.game_versions = info.game_versions
+        game_versions_changed = list(info.game_versions) != self.game_versions
+        if game_versions_changed:
+            self.game_versions = list(info.game_versions)
         self.sha1 = info.sha1
         self.url = info.url
-        self.description = info.description
+        # version lists are fetched without changelogs; keep the one loaded on demand
+        if info.description:
+            self.description = info.description
+        return game_versions_changed
 
     def to_file_info(self) -> FileInfo:
         return FileInfo(
@@ -96,16 +133,63 @@ class FileTable(Base):
             game_versions=self.game_versions,
             sha1=self.sha1,
             url=self.url,
-            description=self.description or "",
         )
 
 
+def game_minor_version(game_version: str) -> str | None:
+    parts = game_version.split(".")
+    return ".".join(parts[:2]) if len(parts) >= 2 else None
+
+
+class FileGameVersionTable(Base):
+    """One row per supported game version of a file, so files can be looked up by game version."""
+    __tablename__ = 'file_game_version'
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    sha1: Mapped[str] = mapped_column(String, index=True)
+    game_version: Mapped[str] = mapped_column(String, index=True)
+    # major.minor of game_version, for partial matches
+    game_minor: Mapped[str | None] = mapped_column(String, index=True, nullable=True)
+
+    @classmethod
+    def from_file_info(cls, info: FileInfo) -> list["FileGameVersionTable"]:
+        return [
+            FileGameVersionTable(sha1=info.sha1, game_version=game_version, game_minor=game_minor_version(game_version))
+            for game_version in dict.fromkeys(info.game_versions)
+        ]
+
+
+class FileDependencyTable(Base):
+    """Dependencies declared by a file."""
+    __tablename__ = 'file_dependency'
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    sha1: Mapped[str] = mapped_column(String, index=True)
+    dependency_type: Mapped[str] = mapped_column(String, nullable=False)
+    project_id: Mapped[str | None] = mapped_column(String, nullable=True)
+    version_id: Mapped[str | None] = mapped_column(String, nullable=True)
+
+    @classmethod
+    def from_file_info(cls, info: FileInfo) -> list["FileDependencyTable"]:
+        return [
+            FileDependencyTable(
+                sha1=info.sha1,
+                dependency_type=dependency.dependency_type,
+                project_id=dependency.project_id,
+                version_id=dependency.version_id,
+            )
+            for dependency in info.dependencies or ()
+        ]
+
+    def to_file_dependency(self) -> FileDependency:
+        return FileDependency(self.dependency_type, self.project_id, self.version_id)
+
+
 class ProjectTable(Base):
     __tablename__ = 'project'
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     source: Mapped[str] = mapped_column(String, nullable=False)
-    project_id: Mapped[str] = mapped_column(String, index=True)
+    project_id: Mapped[str] = mapped_column(String, index=True, unique=True)
     name: Mapped[str] = mapped_column(String, index=True, nullable=False)
+    slug: Mapped[str | None] = mapped_column(String, index=True, nullable=True)
     author: Mapped[str] = mapped_column(String, nullable=False)
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
     downloads: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
@@ -116,6 +200,7 @@ class ProjectTable(Base):
             source=info.source,
             project_id=info.project_id,
             name=info.name,
+            slug=info.slug,
             author=info.author,
             description=info.description,
             downloads=info.downloads,
@@ -123,11 +208,13 @@ class ProjectTable(Base):
 
     def update(self, info: ProjectInfo):
         self.name = info.name
+        # records rebuilt from a lockfile have no slug
+        self.slug = info.slug or self.slug
         self.author = info.author
         self.description = info.description
         self.downloads = info.downloads
 
-    def to_project_info(self, info_list: list[FileTable], hashes: list[dict[str, str]]) -> ProjectInfo:
+    def to_project_info(self, versions: dict[str, FileInfo] | VersionMap) -> ProjectInfo:
         return ProjectInfo(
             source=self.source,
             project_id=self.project_id,
@@ -135,9 +222,21 @@ class ProjectTable(Base):
             author=self.author,
             description=self.description,
             downloads=self.downloads,
-            versions={file.version_id: file.to_file_info() for file in info_list},
+            versions=versions,
+            slug=self.slug,
         )
 
+
+class LatestVersionTable(Base):
+    """Precomputed results of ProjectInfo.precomputed_lookups, maintained by save_project_info."""
+    __tablename__ = 'latest_version'
+    __table_args__ = (Index("ix_latest_version_project_id_lookup", "project_id", "lookup", unique=True),)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    project_id: Mapped[str] = mapped_column(String, index=True)
+    lookup: Mapped[str] = mapped_column(String, nullable=False)
+    # None when no version matches the lookup
+    sha1: Mapped[str | None] = mapped_column(String, nullable=True)
+
 class InstallationTable(Base):
     __tablename__ = 'installation'
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
@@ -146,11 +245,190 @@ class InstallationTable(Base):
     filesize: Mapped[int] = mapped_column(Integer, nullable=False)
     installation_type: Mapped[str] = mapped_column(String, nullable=False, default="RELEASE")
 
+class InstallationStatusTable(Base):
+    """What `ppm list` shows for each jar in the plugin directory, rebuilt by PluginManager.refresh_status."""
+    __tablename__ = 'installation_status'
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    filename: Mapped[str] = mapped_column(String, nullable=False, unique=True)
+    sha1: Mapped[str] = mapped_column(String, nullable=False)
+    filesize: Mapped[int] = mapped_column(Integer, nullable=False)
+    # modification time of the jar when it was hashed; a stat that differs means the row is stale
+    mtime_ns: Mapped[int] = mapped_column(Integer, nullable=False)
+    # server version the compatibility score was computed for
+    game_version: Mapped[str | None] = mapped_column(String, nullable=True)
+    # the project columns are None for jars that are not recognized
+    project_id: Mapped[str | None] = mapped_column(String, nullable=True)
+    name: Mapped[str | None] = mapped_column(String, nullable=True)
+    version_name: Mapped[str | None] = mapped_column(String, nullable=True)
+    version_type: Mapped[str | None] = mapped_column(String, nullable=True)
+    release_date: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    track: Mapped[str | None] = mapped_column(String, nullable=True)
+    # newest version on the track when it is not the installed one
+    latest_version: Mapped[str | None] = mapped_column(String, nullable=True)
+    outdated: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    compatibility: Mapped[int] = mapped_column(Integer, nullable=False, default=-1)
+
+    @property
+    def recognized(self) -> bool:
+        return self.project_id is not None
+
+
+# Hot lookups run these through a plain connection: no Session, no identity map and no entity
+# hydration. They are built once, so every call reuses SQLAlchemy's compiled form.
+_FILE_INFO_COLUMNS = (
+    FileTable.version_id,
+    FileTable.project_id,
+    FileTable.version_name,
+    FileTable.version_type,
+    FileTable.release_date,
+    FileTable.game_versions,
+    FileTable.sha1,
+    FileTable.url,
+)
+_FILE_BY_SHA1 = select(*_FILE_INFO_COLUMNS).where(FileTable.sha1 == bindparam("sha1"))
+_FILE_BY_VERSION_ID = (
+    select(*_FILE_INFO_COLUMNS).where(FileTable.version_id == bindparam("version_id")).order_by(FileTable.id).limit(1)
+)
+# a version by project and version, with one row per hash; the project is matched by ID, then slug,
+# then name, and the first stored version of the best match wins
+_PROJECT_MATCH = bindparam("project")
+_FILE_BY_PROJECT_VERSION = (
+    select(*_FILE_INFO_COLUMNS, FileHashTable.hash_type, FileHashTable.hash_digest)
+    .join(ProjectTable, ProjectTable.project_id == FileTable.project_id)
+    .outerjoin(FileHashTable, FileHashTable.sha1 == FileTable.sha1)
+    .where(
+        or_(ProjectTable.project_id == _PROJECT_MATCH, ProjectTable.slug == _PROJECT_MATCH, ProjectTable.name == _PROJECT_MATCH),
+        or_(FileTable.version_id == bindparam("version"), FileTable.version_name == bindparam("version")),
+    )
+    .order_by(
+        case((ProjectTable.project_id == _PROJECT_MATCH, 0), (ProjectTable.slug == _PROJECT_MATCH, 1), else_=2),
+        FileTable.id,
+    )
+)
+_HASHES_BY_SHA1 = select(FileHashTable.hash_type, FileHashTable.hash_digest).where(FileHashTable.sha1 == bindparam("sha1"))
+_INSTALLATION_BY_SHA1 = select(*InstallationTable.__table__.c).where(InstallationTable.sha1 == bindparam("sha1"))
+_SHA1_KNOWN = select(literal(1)).where(InstallationTable.sha1 == bindparam("sha1")).limit(1)
+_SNAPSHOT_NAMES = select(SnapshotInfoTable.name).order_by(SnapshotInfoTable.id)
+
+# the full-text index is an FTS5 virtual table that the models do not describe, see _project_search
+_FTS_DELETE = text("DELETE FROM project_fts WHERE project_id = :project_id")
+_FTS_INSERT = text(
+    "INSERT INTO project_fts (project_id, name, slug, author, description) "
+    "VALUES (:project_id, :name, :slug, :author, :description)"
+)
+# bm25 is lower for better matches; the weights follow the column order, and matching the name or
+# slug counts for far more than matching the description. With a game version, only projects with a
+# stored version that supports it are returned, like the sources filter their search results.
+_FTS_SEARCH = text(
+    "SELECT project.project_id, project.name, project.author, project.downloads, project.description, project.source "
+    "FROM project_fts JOIN project ON project.project_id = project_fts.project_id "
+    "WHERE project_fts MATCH :match AND (:game_version IS NULL OR EXISTS ("
+    "SELECT 1 FROM file JOIN file_game_version ON file_game_version.sha1 = file.sha1 "
+    "WHERE file.project_id = project.project_id AND file_game_version.game_version = :game_version)) "
+    "ORDER BY bm25(project_fts, 0.0, 10.0, 8.0, 2.0, 1.0), project.downloads DESC LIMIT :limit"
+)
+
+
+def _unique_keys(connection: Connection):
+    """Drop duplicate rows and enforce the keys the lookups rely on with unique indexes."""
+    connection.exec_driver_sql("DELETE FROM project WHERE id NOT IN (SELECT MAX(id) FROM project GROUP BY project_id)")
+    connection.exec_driver_sql("DELETE FROM file_hash WHERE id NOT IN (SELECT MIN(id) FROM file_hash GROUP BY sha1, hash_type)")
+    connection.exec_driver_sql(
+        "DELETE FROM latest_version WHERE id NOT IN (SELECT MAX(id) FROM latest_version GROUP BY project_id, lookup)"
+    )
+    connection.exec_driver_sql("DROP INDEX IF EXISTS ix_project_project_id")
+    connection.exec_driver_sql("CREATE UNIQUE INDEX ix_project_project_id ON project (project_id)")
+    connection.exec_driver_sql("CREATE UNIQUE INDEX IF NOT EXISTS ix_file_hash_sha1_hash_type ON file_hash (sha1, hash_type)")
+    connection.exec_driver_sql(
+        "CREATE UNIQUE INDEX IF NOT EXISTS ix_latest_version_project_id_lookup ON latest_version (project_id, lookup)"
+    )
+
+
+def _project_search(connection: Connection):
+    """Add the project slug and fill the full-text index over the projects."""
+    if "slug" not in {column["name"] for column in inspect(connection).get_columns("project")}:
+        connection.exec_driver_sql("ALTER TABLE project ADD COLUMN slug VARCHAR")
+    try:
+        connection.exec_driver_sql(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS project_fts USING fts5("
+            "project_id UNINDEXED, name, slug, author, description, tokenize = 'unicode61 remove_diacritics 2')"
+        )
+    except OperationalError as e:
+        logger.warning(f"SQLite was built without FTS5, local search is disabled: {e}")
+        return
+    connection.exec_driver_sql("DELETE FROM project_fts")
+    connection.exec_driver_sql(
+        "INSERT INTO project_fts (project_id, name, slug, author, description) "
+        "SELECT project_id, name, coalesce(slug, ''), author, coalesce(description, '') FROM project"
+    )
+
+
+def _project_slug_index(connection: Connection):
+    """Index the project slug, so that a project is found by ID, slug or name through indexes only."""
+    connection.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_project_slug ON project (slug)")
+
+
+# Schema changes by the version they bring the database to. Databases created before versioning are
+# at version 0, new ones run every migration. Missing tables are created before the migrations run,
+# with the current models, so a migration must also work on a table that already has its change.
+MIGRATIONS = {
+    1: _unique_keys,
+    2: _project_search,
+    3: _project_slug_index,
+}
+SCHEMA_VERSION = max(MIGRATIONS)
+
+
+def migrate(connection: Connection) -> int:
+    """Bring the schema up to SCHEMA_VERSION; returns the version the database was at.
+
+    An up-to-date database costs a single PRAGMA read and no DDL.
+
+    Raises:
+        SchemaVersionException: If the database was written by a newer version of ppm.
+    """
+    version = connection.exec_driver_sql("PRAGMA user_version").scalar()
+    if version == SCHEMA_VERSION:
+        return version
+    if version > SCHEMA_VERSION:
+        raise SchemaVersionException(version, SCHEMA_VERSION)
+    Base.metadata.create_all(connection)
+    for target in sorted(MIGRATIONS):
+        if target > version:
+            logger.debug(f"Migrating database schema to version {target}.")
+            MIGRATIONS[target](connection)
+    # PRAGMA does not take bound parameters; SCHEMA_VERSION is an int
+    connection.exec_driver_sql(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    return version
+
+
 class SourceDatabase:
 
     def __init__(self, db_url: str = f"sqlite:///{Config.DB_PATH}"):
-        self.engine = create_engine(db_url, echo=False)
-        Base.metadata.create_all(self.engine)
+        self.db_url = db_url
+        self._engine: Engine | None = None
+        self._engine_lock = threading.Lock()
+        # whether the full-text index exists; SQLite may be built without FTS5
+        self._search_index = False
+        # the completion cache lives next to a file database; in-memory databases have none
+        url = make_url(db_url)
+        file_db = url.get_backend_name() == "sqlite" and url.database not in (None, "", ":memory:")
+        self.completion_db_path = url.database if file_db else None
+
+    @property
+    def engine(self) -> Engine:
+        """The engine, created on first use after migrating the schema if it is out of date."""
+        if self._engine is None:
+            with self._engine_lock:
+                if self._engine is None:
+                    engine = create_engine(self.db_url, echo=False)
+                    with engine.begin() as connection:
+                        migrate(connection)
+                        self._search_index = connection.execute(
+                            text("SELECT 1 FROM sqlite_master WHERE name = 'project_fts'")
+                        ).first() is not None
+                    self._engine = engine
+        return self._engine
 
     def get_project_table_by_id(self, project_id: str) -> ProjectTable | None:
         with Session(self.engine) as session:
@@ -162,51 +440,187 @@ class SourceDatabase:
             stmt = select(ProjectTable).where(ProjectTable.name == name)
             return session.execute(stmt).scalar_one_or_none()
 
+    def get_project_table_by_slug(self, slug: str) -> ProjectTable | None:
+        with Session(self.engine) as session:
+            stmt = select(ProjectTable).where(ProjectTable.slug == slug).limit(1)
+            return session.execute(stmt).scalar_one_or_none()
+
     def get_project_table(self, name) -> ProjectTable | None:
         project = self.get_project_table_by_id(name)
+        if project is None:
+            project = self.get_project_table_by_slug(name)
         if project is None:
             project = self.get_project_table_by_name(name)
         return project
 
+    def search_projects(self, query: str, limit: int = 10, game_version: str | None = None) -> list[SearchResult]:
+        """Ranked full-text search over the stored projects.
+
+        Every word of ``query`` must prefix-match a word of the name, slug, author or description.
+        Returns an empty list when SQLite has no FTS5.
+
+        Args:
+            game_version: Only return projects with a stored version that supports this game version.
+        """
+        terms = re.findall(r"\w+", query.lower())
+        with self.engine.connect() as connection:
+            if not terms or not self._search_index:
+                return []
+            match = " ".join(f'"{term}"*' for term in terms)
+            rows = connection.execute(_FTS_SEARCH, {"match": match, "limit": limit, "game_version": game_version})
+            return [
+                SearchResult(project_id, name, author, downloads, description or "", source)
+                for project_id, name, author, downloads, description, source in rows
+            ]
+
     def get_all_files(self, project_id: str) -> list[FileTable]:
         with Session(self.engine) as session:
-            stmt = select(FileTable).where(FileTable.project_id == project_id)
+            stmt = select(FileTable).where(FileTable.project_id == project_id).order_by(FileTable.id)
             files = session.execute(stmt).scalars().all()
             return list(files)
 
-    def get_file_by_sha1(self, sha1: str) -> FileTable | None:
+    def load_versions(self, project_id: str, sha1s: set[str] | None = None, with_hashes: bool = True) -> dict[str, FileInfo]:
+        """Versions of a project in insertion order, optionally only those with the given SHA1s."""
+        stmt = select(FileTable).where(FileTable.project_id == project_id).order_by(FileTable.id)
+        hash_stmt = (
+            select(FileHashTable)
+            .join(FileTable, FileHashTable.sha1 == FileTable.sha1)
+            .where(FileTable.project_id == project_id)
+        )
+        if sha1s is not None:
+            stmt = stmt.where(FileTable.sha1.in_(sha1s))
+            hash_stmt = hash_stmt.where(FileHashTable.sha1.in_(sha1s))
+        with Session(self.engine) as session:
+            files = session.execute(stmt).scalars().all()
+            hashes: dict[str, dict[str, str]] = {}
+            if with_hashes:
+                for hash_table in session.execute(hash_stmt).scalars():
+                    hashes.setdefault(hash_table.sha1, {})[hash_table.hash_type] = hash_table.hash_digest
+        versions = {}
+        for file in files:
+            file_info = file.to_file_info()
+            file_info.hashes = hashes.get(file.sha1, {})
+            versions[file.version_id] = file_info
+        return versions
+
+    def update_latest_versions(self, project_id: str) -> dict[str, str | None]:
+        """Recompute the stored lookup results of a project from all of its versions."""
+        return self._store_latest_versions(project_id, self.load_versions(project_id, with_hashes=False))
+
+    def _store_latest_versions(self, project_id: str, versions: dict[str, FileInfo]) -> dict[str, str | None]:
+        project = ProjectInfo("", project_id, "", "", None, 0, versions)
+        lookups = {lookup: file_info.sha1 if file_info else None for lookup, file_info in project.precomputed_lookups().items()}
+        with Session(self.engine) as session:
+            session.execute(delete(LatestVersionTable).where(LatestVersionTable.project_id == project_id))
+            session.add_all(LatestVersionTable(project_id=project_id, lookup=lookup, sha1=sha1) for lookup, sha1 in lookups.items())
+            session.commit()
+        return lookups
+
+    def lazy_versions(self, project_id: str) -> VersionMap:
+        """Versions of a project that load only the precomputed latest versions up front."""
+        with Session(self.engine) as session:
+            stmt = select(LatestVersionTable).where(LatestVersionTable.project_id == project_id)
+            lookups = {row.lookup: row.sha1 for row in session.execute(stmt).scalars()}
+        if not lookups:
+            # project saved before the lookups were stored
+            lookups = self.update_latest_versions(project_id)
+        preloaded = self.load_versions(project_id, {sha1 for sha1 in lookups.values() if sha1})
+        by_sha1 = {file_info.sha1: file_info for file_info in preloaded.values()}
+        if any(sha1 and sha1 not in by_sha1 for sha1 in lookups.values()):
+            logger.debug(f"Stored latest versions of {project_id} are stale, loading all versions.")
+            return VersionMap(self.load_versions(project_id))
+        return LazyVersionMap(
+            preloaded,
+            {lookup: by_sha1[sha1] if sha1 else None for lookup, sha1 in lookups.items()},
+            lambda: self.load_versions(project_id),
+        )
+
+    def _file_info(self, stmt, with_hashes: bool, **params) -> FileInfo | None:
+        with self.engine.connect() as connection:
+            row = connection.execute(stmt, params).first()
+            if row is None:
+                return None
+            file_info = FileInfo(**row._mapping)
+            if with_hashes:
+                file_info.hashes = dict(connection.execute(_HASHES_BY_SHA1, {"sha1": file_info.sha1}).all())
+        return file_info
+
+    def get_file_by_sha1(self, sha1: str, with_hashes: bool = True) -> FileInfo | None:
+        return self._file_info(_FILE_BY_SHA1, with_hashes, sha1=sha1)
+
+    def get_file_by_version_id(self, version_id: str, with_hashes: bool = True) -> FileInfo | None:
+        return self._file_info(_FILE_BY_VERSION_ID, with_hashes, version_id=version_id)
+
+    def get_file_dependencies(self, sha1s: list[str]) -> dict[str, tuple[FileDependency, ...]]:
+        """Declared dependencies of several files in one query; files without any map to an empty tuple."""
+        dependencies: dict[str, list[FileDependency]] = {sha1: [] for sha1 in sha1s}
+        stmt = select(FileDependencyTable).where(FileDependencyTable.sha1.in_(sha1s)).order_by(FileDependencyTable.id)
+        with Session(self.engine) as session:
+            for row in session.execute(stmt).scalars():
+                dependencies[row.sha1].append(row.to_file_dependency())
+        return {sha1: tuple(deps) for sha1, deps in dependencies.items()}
+
+    def get_file_info(self, project: str, version: str) -> FileInfo | None:
+        """Look up a single version of a project, with its hashes, without loading the whole project.
+
+        Args:
+            project: Project ID, slug or name, matched in that order like get_project_table.
+            version: Version ID or version name.
+        """
+        with self.engine.connect() as connection:
+            rows = connection.execute(_FILE_BY_PROJECT_VERSION, {"project": project, "version": version}).all()
+        if not rows:
+            return None
+        columns = dict(rows[0]._mapping)
+        del columns["hash_type"], columns["hash_digest"]
+        file_info = FileInfo(**columns)
+        file_info.hashes = {
+            row.hash_type: row.hash_digest for row in rows if row.sha1 == file_info.sha1 and row.hash_type is not None
+        }
+        return file_info
+
+    def get_file_description(self, sha1: str) -> str:
+        with Session(self.engine) as session:
+            stmt = select(FileTable.description).where(FileTable.sha1 == sha1)
+            return session.execute(stmt).scalar_one_or_none() or ""
+
+    def update_file_description(self, sha1: str, description: str):
         with Session(self.engine) as session:
             stmt = select(FileTable).where(FileTable.sha1 == sha1)
-            return session.execute(stmt).scalar_one_or_none()
+            file_table = session.execute(stmt).scalar_one_or_none()
+            if file_table:
+                file_table.description = description
+                session.commit()
 
-    def get_project_by_file_sha1(self, sha1: str) -> ProjectInfo | None:
-        file_table = self.get_file_by_sha1(sha1)
-        if file_table is None:
+    def get_project_by_file_sha1(self, sha1: str, lazy: bool = False) -> ProjectInfo | None:
+        file_info = self.get_file_by_sha1(sha1, with_hashes=False)
+        if file_info is None:
             return None
-        project_table = self.get_project_table_by_id(file_table.project_id)
+        project_table = self.get_project_table_by_id(file_info.project_id)
         if project_table is None:
             return None
-        return self.get_project_info(project_table.project_id)
+        return self.get_project_info(project_table.project_id, lazy)
 
     def get_hashes_by_file_sha1(self, sha1: str) -> dict[str, str]:
-        stmt = select(FileHashTable).where(FileHashTable.sha1 == sha1)
-        with Session(self.engine) as session:
-            hash_tables = session.execute(stmt).scalars().all()
-            if not hash_tables:
-                return {}
-            return {hash_table.hash_type: hash_table.hash_digest for hash_table in hash_tables}
+        with self.engine.connect() as connection:
+            return dict(connection.execute(_HASHES_BY_SHA1, {"sha1": sha1}).all())
+
+    def get_project_info(self, name: str, lazy: bool = False) -> ProjectInfo | None:
+        """Load a project with its versions and current installation.
 
-    def get_project_info(self, name: str) -> ProjectInfo | None:
+        Args:
+            name: Project ID or name.
+            lazy: Load only the current and latest versions up front; the rest is loaded on first use.
+        """
         project_table = self.get_project_table(name)
         if project_table is None:
             return None
-        files = self.get_all_files(project_table.project_id)
-        hashes = []
-        for file in files:
-            file_hashes = self.get_hashes_by_file_sha1(file.sha1)
-            hashes.append(file_hashes)
+        if lazy:
+            versions = self.lazy_versions(project_table.project_id)
+        else:
+            versions = self.load_versions(project_table.project_id)
 
-        project_info = project_table.to_project_info(files, hashes)
+        project_info = project_table.to_project_info(versions)
         with Session(self.engine) as session:
             stmt = (
                 select(InstallationTable.sha1)
@@ -219,8 +633,7 @@ class SourceDatabase:
             if installation_sha1:
                 installed_file = self.get_file_by_sha1(installation_sha1)
                 if installed_file:
-                    project_info.current_version = installed_file.to_file_info()
-                    project_info.current_version.hashes = self.get_hashes_by_file_sha1(installation_sha1)
+                    project_info.current_version = installed_file
                 else:
                     logger.error(f"Installation with SHA1 {installation_sha1} not found in database.")
                 installation = self.get_installation_by_sha1(installation_sha1)
@@ -244,16 +657,37 @@ class SourceDatabase:
 
     def save_project_info(self, info: ProjectInfo):
         with Session(self.engine) as session:
-            project_table = self.get_project_table_by_id(info.project_id)
-            if project_table is None:
+            stmt = select(ProjectTable).where(ProjectTable.project_id == info.project_id)
+            project_table = session.execute(stmt).scalar_one_or_none()
+            new_project = project_table is None
+            if new_project:
                 project_table = ProjectTable.from_project_info(info)
                 session.add(project_table)
-                session.commit()
             else:
                 project_table.update(info)
-                session.commit()
+            if self._search_index:
+                session.execute(_FTS_DELETE, {"project_id": info.project_id})
+                session.execute(_FTS_INSERT, {
+                    "project_id": info.project_id,
+                    "name": project_table.name,
+                    "slug": project_table.slug or "",
+                    "author": project_table.author,
+                    "description": project_table.description or "",
+                })
+            session.commit()
 
+            # an existing version whose name or type changed can move the latest versions anywhere
+            reranked = False
+            stored_dependencies = {
+                sha1: set(deps)
+                for sha1, deps in self.get_file_dependencies(
+                    [f.sha1 for f in info.versions.values() if f.dependencies is not None]
+                ).items()
+            }
             for file_info in info.versions.values():
+                if file_info.dependencies is not None and set(file_info.dependencies) != stored_dependencies[file_info.sha1]:
+                    session.execute(delete(FileDependencyTable).where(FileDependencyTable.sha1 == file_info.sha1))
+                    session.add_all(FileDependencyTable.from_file_info(file_info))
                 stmt = select(FileTable).where(
                     FileTable.sha1 == file_info.sha1
                 )
@@ -261,8 +695,13 @@ class SourceDatabase:
                 if file_table is None:
                     file_table = FileTable.from_file_info(file_info)
                     session.add(file_table)
+                    session.add_all(FileGameVersionTable.from_file_info(file_info))
                 else:
-                    file_table.update(file_info)
+                    if (file_table.version_name, file_table.version_type) != (file_info.version_name, file_info.version_type):
+                        reranked = True
+                    if file_table.update(file_info):
+                        session.execute(delete(FileGameVersionTable).where(FileGameVersionTable.sha1 == file_info.sha1))
+                        session.add_all(FileGameVersionTable.from_file_info(file_info))
 
                 hash_tables = FileHashTable.from_hashes(file_info.hashes)
 
@@ -276,6 +715,82 @@ class SourceDatabase:
                         session.add(hash_table)
             logger.debug(f"Saved project info for '{info.name}' into database.")
             session.commit()
+        if new_project:
+            self._store_latest_versions(info.project_id, dict(info.versions))
+        elif not reranked:
+            self._merge_latest_versions(info)
+        else:
+            self.update_latest_versions(info.project_id)
+
+    def _merge_latest_versions(self, info: ProjectInfo):
+        """Update the stored lookup results of an existing project after saving ``info``.
+
+        Each new result is the best of the previous result and the saved versions, so the versions
+        already in memory are ranked together with only the previous results that are not among them.
+        """
+        with Session(self.engine) as session:
+            stmt = select(LatestVersionTable.sha1).where(LatestVersionTable.project_id == info.project_id)
+            previous = session.execute(stmt).scalars().all()
+        if not previous:
+            # project saved before the lookups were stored
+            self.update_latest_versions(info.project_id)
+            return
+        versions = dict(info.versions)
+        missing = {sha1 for sha1 in previous if sha1} - {file_info.sha1 for file_info in versions.values()}
+        if missing:
+            versions = self.load_versions(info.project_id, missing, with_hashes=False) | versions
+        self._store_latest_versions(info.project_id, versions)
+
+    def get_installed_versions(self) -> list[tuple[ProjectInfo, InstallationTable]]:
+        """Installed projects with only their current version, in a single query."""
+        stmt = (
+            select(ProjectTable, FileTable, InstallationTable)
+            .join(FileTable, FileTable.project_id == ProjectTable.project_id)
+            .join(InstallationTable, InstallationTable.sha1 == FileTable.sha1)
+            .order_by(ProjectTable.name)
+        )
+        installed = []
+        with Session(self.engine) as session:
+            for project_table, file_table, installation in session.execute(stmt):
+                project = project_table.to_project_info({})
+                project.current_version = file_table.to_file_info()
+                project.installation_type = installation.installation_type
+                installed.append((project, installation))
+        return installed
+
+    def index_game_versions(self, project_ids: list[str]):
+        """Add the game version rows of files stored before they were indexed."""
+        stmt = (
+            select(FileTable)
+            .outerjoin(FileGameVersionTable, FileGameVersionTable.sha1 == FileTable.sha1)
+            .where(FileTable.project_id.in_(project_ids), FileGameVersionTable.id.is_(None))
+        )
+        with Session(self.engine) as session:
+            missing = [file for file in session.execute(stmt).scalars() if file.game_versions]
+            for file in missing:
+                session.add_all(FileGameVersionTable.from_file_info(file.to_file_info()))
+            if missing:
+                logger.debug(f"Indexed game versions of {len(missing)} files.")
+                session.commit()
+
+    def get_files_for_game_version(self, project_ids: list[str], game_version: str) -> list[FileInfo]:
+        """Versions of the given projects that support ``game_version`` or another patch of its minor version.
+
+        Returned in insertion order.
+        """
+        matches = [FileGameVersionTable.game_version == game_version]
+        game_minor = game_minor_version(game_version)
+        if game_minor:
+            matches.append(FileGameVersionTable.game_minor == game_minor)
+        stmt = (
+            select(FileTable)
+            .join(FileGameVersionTable, FileGameVersionTable.sha1 == FileTable.sha1)
+            .where(FileTable.project_id.in_(project_ids), or_(*matches))
+            .distinct()
+            .order_by(FileTable.id)
+        )
+        with Session(self.engine) as session:
+            return [file.to_file_info() for file in session.execute(stmt).scalars()]
 
     def save_installation_info(self, filename: str, sha1: str, filesize: int, installation_type: str = "RELEASE"):
         with Session(self.engine) as session:
@@ -313,22 +828,45 @@ class SourceDatabase:
                 session.delete(installation)
             session.commit()
 
+    def get_installation_status(self) -> list[InstallationStatusTable]:
+        with Session(self.engine) as session:
+            stmt = select(InstallationStatusTable).order_by(InstallationStatusTable.id)
+            return list(session.execute(stmt).scalars())
+
+    def replace_installation_status(self, rows: list[InstallationStatusTable]):
+        with Session(self.engine, expire_on_commit=False) as session:
+            session.execute(delete(InstallationStatusTable))
+            # merge, so that rows read back from an earlier call are inserted again
+            for row in rows:
+                session.merge(row)
+            session.commit()
+        self._update_completion(plugins=[name for row in rows if row.recognized for name in (row.name, row.project_id)])
+
+    def _update_completion(self, **names: list[str]):
+        if self.completion_db_path is not None:
+            completion.write_names(self.completion_db_path, **names)
+
+    def update_completion_cache(self):
+        """Rewrite the completion cache from the database."""
+        self._update_completion(
+            plugins=[name for row in self.get_installation_status() if row.recognized for name in (row.name, row.project_id)],
+            snapshots=self.get_snapshot_names(),
+        )
+
     def get_all_installations(self) -> list[InstallationTable]:
         with Session(self.engine) as session:
             stmt = select(InstallationTable)
             installations = session.execute(stmt).scalars().all()
             return list(installations)
 
-    def get_installation_by_sha1(self, sha1: str) -> InstallationTable | None:
-        with Session(self.engine) as session:
-            stmt = select(InstallationTable).where(InstallationTable.sha1 == sha1)
-            return session.execute(stmt).scalar_one_or_none()
+    def get_installation_by_sha1(self, sha1: str) -> Row | None:
+        """Read-only row with the installation columns, accessed by name like the table."""
+        with self.engine.connect() as connection:
+            return connection.execute(_INSTALLATION_BY_SHA1, {"sha1": sha1}).first()
 
     def is_sha1_known(self, sha1: str) -> bool:
-        with Session(self.engine) as session:
-            stmt = select(InstallationTable).where(InstallationTable.sha1 == sha1)
-            installation = session.execute(stmt).scalar_one_or_none()
-            return installation is not None
+        with self.engine.connect() as connection:
+            return connection.execute(_SHA1_KNOWN, {"sha1": sha1}).first() is not None
         
     def update_installation_type(self, sha1: str, installation_type: str):
         with Session(self.engine) as session:
@@ -348,7 +886,8 @@ class SourceDatabase:
             session.add(snapshot)
             session.commit()
             logger.debug(f"Created snapshot '{name}' with ID {snapshot.id}.")
-            return snapshot
+        self._update_completion(snapshots=self.get_snapshot_names())
+        return snapshot
         
     def add_file_to_snapshot(self, snapshot_id: int, filename: str, blob: bytes) -> SnapshotFileTable:
         with Session(self.engine) as session:
@@ -380,10 +919,8 @@ class SourceDatabase:
             return session.execute(stmt).scalar_one_or_none()
         
     def get_snapshot_names(self) -> list[str]:
-        with Session(self.engine) as session:
-            stmt = select(SnapshotInfoTable.name)
-            names = session.execute(stmt).scalars().all()
-            return list(names)
+        with self.engine.connect() as connection:
+            return list(connection.execute(_SNAPSHOT_NAMES).scalars())
         
     def delete_snapshot(self, snapshot_id: int):
         with Session(self.engine) as session:
@@ -395,4 +932,5 @@ class SourceDatabase:
             for file in files:
                 logger.debug(f"Deleting snapshot file '{file.filename}' from snapshot ID {snapshot_id}.")
                 session.delete(file)
-            session.commit()
\ No newline at end of file
+            session.commit()
+        self._update_completion(snapshots=self.get_snapshot_names())
\ No newline at end of file
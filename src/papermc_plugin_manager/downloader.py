@@ -0,0 +1,165 @@
+"""Parallel download engine used by install and upgrade."""
+
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from urllib.parse import urlparse
+
+from logzero import logger
+
+from .config import Config
+from .exceptions import DownloadFailedException
+from .jar_cache import JarCache
+from .utils import download_file
+
+
+@dataclass(frozen=True, eq=False)
+class DownloadJob:
+    url: str
+    dest: Path
+    label: str
+    # expected digests by hash type; the download fails if any of them does not match
+    hashes: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class DownloadResult:
+    job: DownloadJob
+    size: int = 0
+    hashes: dict[str, str] = field(default_factory=dict)
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """How the engine retries a failed transfer."""
+
+    max_attempts: int = 5
+    # seconds to wait before the second attempt; doubled after every further failure
+    backoff: float = 1.0
+    # continue from the partial file with an HTTP Range request instead of starting over
+    resume: bool = True
+    # (connect, read) timeout in seconds for each attempt
+    timeout: tuple[float, float] = (10, 60)
+
+    def should_retry(self, error: Exception) -> bool:
+        import requests
+
+        if isinstance(error, DownloadFailedException):
+            return False
+        if isinstance(error, requests.HTTPError) and error.response is not None:
+            return error.response.status_code >= 500 or error.response.status_code == 429
+        return isinstance(error, (requests.RequestException, OSError))
+
+
+ProgressCallback = Callable[[DownloadJob, int, int], None]
+
+
+def _no_progress(job: DownloadJob, bytes_downloaded: int, total_size: int):
+    return
+
+
+class DownloadEngine:
+    """Download several files concurrently.
+
+    At most ``max_workers`` transfers run at once, and at most ``max_per_host`` of them
+    against the same host.
+    """
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        max_per_host: int | None = None,
+        retry_policy: RetryPolicy | None = None,
+        cache: JarCache | None = None,
+    ):
+        """
+        Args:
+            max_workers: Maximum number of concurrent transfers.
+            max_per_host: Maximum number of concurrent transfers against one host.
+            retry_policy: How failed transfers are retried.
+            cache: Jar cache checked by SHA1 before going to the network, and filled after each download.
+        """
+        self.max_workers = max_workers or Config.MAX_DOWNLOADS
+        self.max_per_host = max_per_host or Config.MAX_DOWNLOADS_PER_HOST
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.cache = cache
+        self._host_limits: dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def _host_limit(self, url: str) -> threading.BoundedSemaphore:
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._host_limits:
+                self._host_limits[host] = threading.BoundedSemaphore(self.max_per_host)
+            return self._host_limits[host]
+
+    def _from_cache(self, job: DownloadJob, progress_cb: ProgressCallback) -> DownloadResult | None:
+        sha1 = job.hashes.get("sha1")
+        if self.cache is None or not sha1:
+            return None
+        try:
+            copied = self.cache.copy_to(sha1, job.dest)
+        except OSError as e:
+            logger.debug(f"Could not copy {sha1} from jar cache: {e}")
+            return None
+        if copied is None:
+            return None
+        size, hashes = copied
+        logger.debug(f"Copied {job.label} from jar cache")
+        progress_cb(job, size, size)
+        return DownloadResult(job, size=size, hashes=hashes)
+
+    def _to_cache(self, result: DownloadResult):
+        if self.cache is None:
+            return
+        try:
+            self.cache.put(result.hashes["sha1"], result.job.dest)
+        except OSError as e:
+            logger.debug(f"Could not add {result.job.dest} to jar cache: {e}")
+
+    def _run_job(self, job: DownloadJob, progress_cb: ProgressCallback) -> DownloadResult:
+        cached = self._from_cache(job, progress_cb)
+        if cached is not None:
+            return cached
+        policy = self.retry_policy
+        delay = policy.backoff
+        attempt = 1
+        while True:
+            with self._host_limit(job.url):
+                logger.debug(f"Downloading {job.url} to {job.dest} (attempt {attempt}/{policy.max_attempts})")
+                try:
+                    size, hashes = download_file(
+                        job.url,
+                        str(job.dest),
+                        lambda done, total: progress_cb(job, done, total),
+                        expected_hashes=job.hashes,
+                        resume=policy.resume,
+                        timeout=policy.timeout,
+                    )
+                    result = DownloadResult(job, size=size, hashes=hashes)
+                    self._to_cache(result)
+                    return result
+                except Exception as e:
+                    logger.debug(f"Download of {job.url} failed: {e}")
+                    if attempt >= policy.max_attempts or not policy.should_retry(e):
+                        return DownloadResult(job, error=e)
+            # back off outside the host limit so other transfers can use the slot
+            time.sleep(delay)
+            delay *= 2
+            attempt += 1
+
+    def run(self, jobs: list[DownloadJob], progress_cb: ProgressCallback = _no_progress) -> list[DownloadResult]:
+        """Download all jobs and return one result per job, in the same order."""
+        if not jobs:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(jobs))) as executor:
+            futures = [executor.submit(self._run_job, job, progress_cb) for job in jobs]
+            return [future.result() for future in futures]
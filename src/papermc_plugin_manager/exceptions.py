@@ -73,3 +73,41 @@ class ServerVersionException(PPMException):
     def __init__(self, message: str | None = None):
         self.message = message or "Could not determine PaperMC server version"
         super().__init__(self.message)
+
+
+class LockfileException(PPMException):
+    """Raised when a lockfile cannot be read."""
+
+    def __init__(self, path: str, reason: str):
+        self.path = path
+        self.reason = reason
+        self.message = f"Invalid lockfile '{path}': {reason}"
+        super().__init__(self.message)
+
+
+class DependencyConflictException(PPMException):
+    """Raised when the dependencies of an install plan cannot be satisfied together."""
+
+    def __init__(self, conflicts: list[str]):
+        self.conflicts = conflicts
+        self.message = "Dependency conflicts: " + "; ".join(conflicts)
+        super().__init__(self.message)
+
+
+class DependencyCycleException(PPMException):
+    """Raised when plugins require each other in a cycle."""
+
+    def __init__(self, cycle: list[str]):
+        self.cycle = cycle
+        self.message = "Circular dependency: " + " -> ".join(cycle)
+        super().__init__(self.message)
+
+
+class SchemaVersionException(PPMException):
+    """Raised when the database was written by a newer version of ppm."""
+
+    def __init__(self, version: int, supported: int):
+        self.version = version
+        self.supported = supported
+        self.message = f"Database schema version {version} is newer than the supported version {supported}; please upgrade ppm"
+        super().__init__(self.message)
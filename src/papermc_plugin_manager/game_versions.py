@@ -0,0 +1,115 @@
+"""Shared table of game version lists.
+
+Thousands of versions of a project usually support the same few game version lists, such as
+``("1.21.3", "1.21.4")``. Interning them means every equal list is one shared tuple of shared
+strings instead of a new list of new strings per version.
+
+Every distinct game version also gets a dense integer ID, and every interned list a bitset of
+those IDs, so checking a list against a server version is a single AND with the server's masks.
+"""
+
+import sys
+import threading
+from collections.abc import Iterable
+
+GameVersions = tuple[str, ...]
+
+_table: dict[GameVersions, GameVersions] = {}
+_lock = threading.Lock()
+
+# dense ID of every game version seen so far
+_ids: dict[str, int] = {}
+# (major.minor, major.minor.patch) parts of each version by ID; None when the version is shorter
+_prefixes: list[tuple[GameVersions | None, GameVersions | None]] = []
+# bitset of version IDs by id() of the interned tuple; interned tuples are never freed
+_masks: dict[int, int] = {}
+# [major.minor.patch, major.minor, patch mask, minor mask] by server version
+_server_masks: dict[str, list] = {}
+# compatibility score by (id() of the interned tuple, server version)
+_scores: dict[tuple[int, str], int] = {}
+
+
+def _version_id(version: str) -> int:
+    # caller holds _lock
+    version_id = _ids.get(version)
+    if version_id is None:
+        version_id = len(_prefixes)
+        minor, patch = _split(version)
+        _prefixes.append((minor, patch))
+        _ids[version] = version_id
+        # no existing list contains the new ID, so cached scores stay valid; only the server masks grow
+        for server in _server_masks.values():
+            if server[0] is not None and server[0] == patch:
+                server[2] |= 1 << version_id
+            if server[1] is not None and server[1] == minor:
+                server[3] |= 1 << version_id
+    return version_id
+
+
+def _split(version: str) -> tuple[GameVersions | None, GameVersions | None]:
+    parts = tuple(version.split("."))
+    return parts[:2] if len(parts) >= 2 else None, parts[:3] if len(parts) >= 3 else None
+
+
+def intern_game_versions(versions: Iterable[str] | None) -> GameVersions:
+    """Return the shared tuple equal to ``versions``, adding it to the table if it is new."""
+    key = tuple(versions or ())
+    shared = _table.get(key)
+    if shared is not None:
+        return shared
+    with _lock:
+        shared = _table.get(key)
+        if shared is None:
+            shared = tuple(sys.intern(version) for version in key)
+            mask = 0
+            for version in shared:
+                mask |= 1 << _version_id(version)
+            _masks[id(shared)] = mask
+            _table[shared] = shared
+        return shared
+
+
+def version_mask(versions: Iterable[str] | None) -> int:
+    """Bitset of the dense IDs of ``versions``."""
+    return _masks[id(intern_game_versions(versions))]
+
+
+def _masks_for_server(server_version: str) -> tuple[int, int]:
+    server = _server_masks.get(server_version)
+    if server is None:
+        minor, patch = _split(server_version)
+        with _lock:
+            patch_mask = minor_mask = 0
+            for version_id, (version_minor, version_patch) in enumerate(_prefixes):
+                if patch is not None and version_patch == patch:
+                    patch_mask |= 1 << version_id
+                if minor is not None and version_minor == minor:
+                    minor_mask |= 1 << version_id
+            server = _server_masks.setdefault(server_version, [patch, minor, patch_mask, minor_mask])
+    return server[2], server[3]
+
+
+def compatibility_score(supported_versions: Iterable[str] | None, server_version: str | None) -> int:
+    """How well a list of supported game versions matches the server version.
+
+    Returns:
+        int: 3 if a supported version matches major.minor.patch, 2 if one matches major.minor,
+        0 if none match, and -1 if either side is unknown.
+    """
+    if not server_version:
+        return -1
+    shared = intern_game_versions(supported_versions)
+    if not shared:
+        return -1
+    key = (id(shared), server_version)
+    score = _scores.get(key)
+    if score is None:
+        patch_mask, minor_mask = _masks_for_server(server_version)
+        mask = _masks[id(shared)]
+        score = 3 if mask & patch_mask else 2 if mask & minor_mask else 0
+        _scores[key] = score
+    return score
+
+
+def table_size() -> int:
+    return len(_table)
@@ -0,0 +1,105 @@
+"""Local content-addressed cache of plugin jars."""
+
+import hashlib
+import os
+import shutil
+from pathlib import Path
+
+from logzero import logger
+
+from .config import Config
+from .utils import DOWNLOAD_HASH_TYPES
+
+
+class JarCache:
+    """Jars stored by SHA1, bounded in size with least-recently-used eviction.
+
+    Entries live at ``<root>/<sha1[:2]>/<sha1>.jar``. The modification time of an entry is
+    bumped on every hit and used as its last-use time, since atime is often disabled.
+    """
+
+    def __init__(self, root: str | Path | None = None, max_bytes: int | None = None):
+        self.root = Path(root or Config.JAR_CACHE_DIR)
+        self.max_bytes = Config.JAR_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+
+    def path_for(self, sha1: str) -> Path:
+        sha1 = sha1.lower()
+        return self.root / sha1[:2] / f"{sha1}.jar"
+
+    def get(self, sha1: str) -> Path | None:
+        """Return the cached jar for ``sha1`` and mark it as recently used."""
+        path = self.path_for(sha1)
+        if not path.is_file():
+            return None
+        os.utime(path)
+        return path
+
+    def put(self, sha1: str, src: str | Path, move: bool = False) -> Path:
+        """Store ``src`` under ``sha1``. With ``move`` the source file is moved instead of copied."""
+        path = self.path_for(sha1)
+        if path.is_file():
+            os.utime(path)
+            if move:
+                Path(src).unlink()
+            return path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        if move:
+            shutil.move(src, tmp)
+        else:
+            shutil.copyfile(src, tmp)
+        os.replace(tmp, path)
+        logger.debug(f"Cached {src} as {path}")
+        self.evict()
+        return path
+
+    def copy_to(self, sha1: str, dest: str | Path) -> tuple[int, dict[str, str]] | None:
+        """Copy the cached jar to ``dest``, verifying its SHA1 on the way.
+
+        The copy goes through ``<dest>.part`` and is renamed into place, like a download.
+
+        Returns:
+            The size and sha1/sha512 digests of the copied file, or None on a cache miss.
+        """
+        path = self.get(sha1)
+        if path is None:
+            return None
+        part = Path(f"{dest}.part")
+        digests = {hash_type: hashlib.new(hash_type) for hash_type in DOWNLOAD_HASH_TYPES}
+        size = 0
+        with open(path, "rb") as src, open(part, "wb") as out:
+            while chunk := src.read(1024 * 1024):
+                out.write(chunk)
+                for digest in digests.values():
+                    digest.update(chunk)
+                size += len(chunk)
+        hashes = {hash_type: digest.hexdigest() for hash_type, digest in digests.items()}
+        if hashes["sha1"] != sha1.lower():
+            logger.warning(f"Cached jar {path} is corrupt, removing it.")
+            part.unlink()
+            path.unlink()
+            return None
+        os.replace(part, dest)
+        return size, hashes
+
+    def entries(self) -> list[Path]:
+        if not self.root.exists():
+            return []
+        return list(self.root.glob("*/*.jar"))
+
+    def size(self) -> int:
+        return sum(path.stat().st_size for path in self.entries())
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits in ``max_bytes``."""
+        entries = [(path, path.stat()) for path in self.entries()]
+        total = sum(stat.st_size for _, stat in entries)
+        for path, stat in sorted(entries, key=lambda entry: entry[1].st_mtime):
+            if total <= self.max_bytes:
+                break
+            logger.debug(f"Evicting {path} from jar cache")
+            path.unlink(missing_ok=True)
+            total -= stat.st_size
+
+    def clear(self):
+        shutil.rmtree(self.root, ignore_errors=True)
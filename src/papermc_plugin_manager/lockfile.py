@@ -0,0 +1,118 @@
+"""Lockfile describing an exact set of installed plugins."""
+
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+from .connector_interface import FileInfo, ProjectInfo
+from .exceptions import LockfileException
+
+LOCKFILE_VERSION = 1
+
+
+@dataclass
+class LockedPlugin:
+    source: str
+    project_id: str
+    name: str
+    author: str
+    version_id: str
+    version_name: str
+    version_type: str
+    release_date: datetime
+    game_versions: list[str]
+    sha1: str
+    url: str
+    # release type the installation tracks for upgrades
+    track: str = "RELEASE"
+    hashes: dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def from_project(cls, project: ProjectInfo, file_info: FileInfo) -> "LockedPlugin":
+        return cls(
+            source=project.source,
+            project_id=project.project_id,
+            name=project.name,
+            author=project.author,
+            version_id=file_info.version_id,
+            version_name=file_info.version_name,
+            version_type=file_info.version_type,
+            release_date=file_info.release_date,
+            game_versions=list(file_info.game_versions),
+            sha1=file_info.sha1,
+            url=file_info.url,
+            track=project.installation_type,
+            hashes=dict(file_info.hashes),
+        )
+
+    def to_file_info(self) -> FileInfo:
+        return FileInfo(
+            version_id=self.version_id,
+            project_id=self.project_id,
+            version_name=self.version_name,
+            version_type=self.version_type,
+            release_date=self.release_date,
+            game_versions=list(self.game_versions),
+            sha1=self.sha1,
+            url=self.url,
+            hashes=dict(self.hashes) or {"sha1": self.sha1},
+        )
+
+    def to_project_info(self) -> ProjectInfo:
+        """Minimal project record for a plugin the local database does not know yet."""
+        return ProjectInfo(
+            source=self.source,
+            project_id=self.project_id,
+            name=self.name,
+            author=self.author,
+            description=None,
+            downloads=0,
+            installation_type=self.track,
+        )
+
+
+@dataclass
+class Lockfile:
+    plugins: list[LockedPlugin] = field(default_factory=list)
+    game_version: str | None = None
+
+    def write(self, path: str | Path):
+        """Write the lockfile atomically, plugins sorted by project ID for stable diffs."""
+        plugins = []
+        for plugin in sorted(self.plugins, key=lambda p: p.project_id):
+            entry = asdict(plugin)
+            entry["release_date"] = plugin.release_date.isoformat()
+            plugins.append(entry)
+        data = {"version": LOCKFILE_VERSION, "game_version": self.game_version, "plugins": plugins}
+        tmp = Path(f"{path}.tmp")
+        with open(tmp, "w") as f:
+            json.dump(data, f, indent=2)
+            f.write("\n")
+        os.replace(tmp, path)
+
+    @classmethod
+    def read(cls, path: str | Path) -> "Lockfile":
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except json.JSONDecodeError as e:
+            raise LockfileException(str(path), str(e)) from e
+        if not isinstance(data, dict):
+            raise LockfileException(str(path), "expected a JSON object")
+        if data.get("version") != LOCKFILE_VERSION:
+            raise LockfileException(str(path), f"unsupported version {data.get('version')!r}")
+        entries = data.get("plugins", [])
+        if not isinstance(entries, list):
+            raise LockfileException(str(path), "'plugins' must be a list")
+        plugins = []
+        for entry in entries:
+            if not isinstance(entry, dict):
+                raise LockfileException(str(path), f"bad plugin entry {entry!r}: expected a JSON object")
+            try:
+                entry["release_date"] = datetime.fromisoformat(entry["release_date"])
+                plugins.append(LockedPlugin(**entry))
+            except (KeyError, TypeError, ValueError) as e:
+                raise LockfileException(str(path), f"bad plugin entry {entry.get('project_id', '?')!r}: {e}") from e
+        return cls(plugins=plugins, game_version=data.get("game_version"))
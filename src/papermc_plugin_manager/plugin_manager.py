@@ -1,28 +1,133 @@
 import glob
 import os
 from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field, replace
+from functools import partial
+from itertools import zip_longest
 from pathlib import Path
+from time import monotonic
 
 from logzero import logger
+from sqlalchemy import Row
 
-from .connector_interface import ConnectorInterface, ProjectInfo, SearchResult, get_connector, list_connectors
-from .database import InstallationTable, SourceDatabase
+from .config import Config
+from .connector_interface import (
+    ConnectorInterface,
+    FileDependency,
+    FileInfo,
+    ProjectInfo,
+    SearchResult,
+    get_connector,
+    list_connectors,
+    release_type_weights,
+)
+from .database import InstallationStatusTable, InstallationTable, SourceDatabase
+from .downloader import DownloadEngine, DownloadJob, DownloadResult, ProgressCallback
 from .exceptions import PluginNotFoundException
-from .utils import compute_sha1, default_feedback_cb
+from .game_versions import compatibility_score
+from .jar_cache import JarCache
+from .lockfile import LockedPlugin, Lockfile
+from .resolver import DependencyResolver, Resolution
+from .staging import StagedInstall, StagingArea
+from .utils import compute_sha1, default_feedback_cb, first_result, run_concurrently
+
+
+@dataclass
+class InstallStep:
+    """A resolved version to install, replacing the current installation of its project."""
+
+    project: ProjectInfo
+    file_info: FileInfo
+
+    @property
+    def filename(self) -> str:
+        return self.project.name.replace(" ", "_") + "-" + self.file_info.version_name + ".jar"
+
+
+@dataclass
+class SyncPlan:
+    """Changes needed to make the plugin directory match a lockfile."""
+
+    install: list[InstallStep]
+    remove: list[InstallationTable]
+    unchanged: list[LockedPlugin]
+    # installed at the locked version, but tracking another release type than the lockfile
+    retrack: list[LockedPlugin] = field(default_factory=list)
+
+    @property
+    def empty(self) -> bool:
+        return not self.install and not self.remove and not self.retrack
+
+
+@dataclass
+class PluginReadiness:
+    """How ready an installed plugin is for a game version; scores as in compatibility_score."""
+
+    project: ProjectInfo
+    current_score: int
+    # newest version on the plugin's track that supports the target better than the installed one
+    candidate: FileInfo | None = None
+    candidate_score: int = -1
+
+    @property
+    def best_score(self) -> int:
+        return max(self.current_score, self.candidate_score)
 
 
 class PluginManager:
 
-    def __init__(self, default_source: str):
+    def __init__(
+        self,
+        default_source: str,
+        game_version: str | None = None,
+        multi_source: bool = False,
+        source_timeout: float | None = None,
+    ):
+        """
+        Args:
+            default_source: Connector used for lookups when ``multi_source`` is off.
+            game_version: Server game version, used to filter version lists.
+            multi_source: Query every connector concurrently instead of only the default source.
+            source_timeout: Seconds to wait for each source before ignoring it in multi-source mode,
+                and for each batch of requests in refresh_full_history.
+        """
         self.db = SourceDatabase()
         self.plugin_dir = "plugins"
-        self.connectors: dict[str, ConnectorInterface] = {}
-        for connector_name in list_connectors():
-            self.connectors[connector_name] = get_connector(connector_name)
+        self.game_version = game_version
+        self._connectors: dict[str, ConnectorInterface] | None = None
         self.default_source = default_source
+        self.multi_source = multi_source
+        self.source_timeout = source_timeout
         # if self.default_source not in self.connectors:
         #     raise ValueError(f"Default source '{self.default_source}' is not a valid connector.")
 
+    @property
+    def connectors(self) -> dict[str, ConnectorInterface]:
+        """Connector instances by name, created on first use so that offline commands never import them."""
+        if self._connectors is None:
+            self._connectors = {name: get_connector(name, game_version=self.game_version) for name in list_connectors()}
+        return self._connectors
+
+    def get_lookup_connectors(self) -> dict[str, ConnectorInterface]:
+        """Connectors to query for lookups, default source first."""
+        default = {self.default_source: self.connectors[self.default_source]}
+        if not self.multi_source:
+            return default
+        return default | {name: c for name, c in self.connectors.items() if name != self.default_source}
+
+    def identify_file(self, sha1: str) -> tuple[ConnectorInterface, FileInfo] | None:
+        """Identify a jar by its SHA1, taking the first source that knows it."""
+        connectors = self.get_lookup_connectors()
+        hit = first_result(
+            {name: partial(connector.get_file_info, sha1) for name, connector in connectors.items()},
+            timeout=self.source_timeout,
+        )
+        if hit is None:
+            return None
+        name, fileinfo = hit
+        return connectors[name], fileinfo
+
     def get_installed_plugins_filename(self) -> list[str]:
         """Get a list of installed plugin filenames."""
         if not os.path.exists(self.plugin_dir):
@@ -39,25 +144,84 @@ class PluginManager:
                 return True
         return False
 
-    def remove_stale_installations(self):
-        # get the installed plugins and their hashes.
-        plugins = self.get_installed_plugins_filename()
-        plugin_hashes = []
-        for plugin in plugins:
-            sha1 = compute_sha1(plugin)
-            filesize = Path(plugin).stat().st_size
+    def scan_plugin_dir(self) -> dict[str, tuple[int, int]]:
+        """Size and modification time in nanoseconds of every jar in the plugin directory, without reading them."""
+        scanned = {}
+        for plugin in self.get_installed_plugins_filename():
+            stat = os.stat(plugin)
+            scanned[os.path.basename(plugin)] = (stat.st_size, stat.st_mtime_ns)
+        return scanned
+
+    def remove_stale_installations(self) -> dict[str, tuple[str, int, int]]:
+        """Record the jars in the plugin directory as installations and drop the records of removed ones.
+
+        Jars whose name, size and modification time match the installation status table are not
+        hashed again.
+
+        Returns:
+            dict: SHA1, size and modification time of each jar, by filename.
+        """
+        known = {(row.filename, row.filesize, row.mtime_ns): row.sha1 for row in self.db.get_installation_status()}
+        scanned = {}
+        for filename, (filesize, mtime_ns) in self.scan_plugin_dir().items():
+            plugin = os.path.join(self.plugin_dir, filename)
+            sha1 = known.get((filename, filesize, mtime_ns)) or compute_sha1(plugin)
             logger.debug(f"Plugin: {plugin}, SHA1: {sha1}")
-            self.db.save_installation_info(os.path.basename(plugin), sha1, filesize, "UNKNOWN")
-            plugin_hashes.append(sha1)
+            self.db.save_installation_info(filename, sha1, filesize, "UNKNOWN")
+            scanned[filename] = (sha1, filesize, mtime_ns)
         # remove stale installations
-        self.db.remove_stale_installations(plugin_hashes)
+        self.db.remove_stale_installations([sha1 for sha1, _, _ in scanned.values()])
+        return scanned
+
+    def get_status(self) -> list[InstallationStatusTable]:
+        """Status of every installed jar, as shown by `ppm list`.
+
+        Served from the installation status table as long as a stat of the plugin directory shows
+        no change since it was built; otherwise the table is rebuilt first.
+        """
+        rows = self.db.get_installation_status()
+        stored = {row.filename: (row.filesize, row.mtime_ns) for row in rows}
+        if self.scan_plugin_dir() == stored and all(row.game_version == self.game_version for row in rows):
+            return rows
+        logger.debug("Installation status is stale, rebuilding it.")
+        return self.refresh_status()
+
+    def refresh_status(self) -> list[InstallationStatusTable]:
+        """Rebuild the installation status table from the plugin directory and the database."""
+        scanned = self.remove_stale_installations()
+        installed = {installation.sha1: (project, installation) for project, installation in self.db.get_installed_versions()}
+        order = {installation.sha1: installation.id for installation in self.db.get_all_installations()}
+        rows = []
+        for filename, (sha1, filesize, mtime_ns) in scanned.items():
+            row = InstallationStatusTable(
+                filename=filename, sha1=sha1, filesize=filesize, mtime_ns=mtime_ns, game_version=self.game_version,
+            )
+            if sha1 in installed:
+                project, _ = installed[sha1]
+                project.versions = self.db.lazy_versions(project.project_id)
+                current = project.current_version
+                latest = project.is_out_dated()
+                row.project_id = project.project_id
+                row.name = project.name
+                row.version_name = current.version_name
+                row.version_type = current.version_type
+                row.release_date = current.release_date
+                row.track = project.installation_type
+                row.latest_version = latest.version_name if latest else None
+                row.outdated = latest is not None
+                row.compatibility = compatibility_score(current.game_versions, self.game_version)
+            rows.append(row)
+        rows.sort(key=lambda row: order.get(row.sha1, len(order)))
+        self.db.replace_installation_status(rows)
+        return rows
 
     def update(self, feedback_cb: Callable[[str], None] = default_feedback_cb):
         self.remove_stale_installations()
         # fetch installation info
         installations = self.db.get_all_installations()
+        identified: list[tuple[InstallationTable, ConnectorInterface, FileInfo]] = []
         for installation in installations:
-            project_info = self.db.get_project_by_file_sha1(installation.sha1)
+            project_info = self.db.get_project_by_file_sha1(installation.sha1, lazy=True)
             if project_info is not None:
                 connector = self.connectors[project_info.source]
             else:
@@ -65,21 +229,34 @@ class PluginManager:
 
             fileinfo = self.db.get_file_by_sha1(installation.sha1)
             if fileinfo is None:
-                feedback_cb(f"Fetching file info for {installation.filename} from {connector.__class__.__name__}")
-                try:
-                    fileinfo = connector.get_file_info(installation.sha1)
-                except PluginNotFoundException as e:
-                    logger.debug(f"Plugin with SHA1 {installation.sha1} not found on {connector.__class__.__name__}: {e}")
+                feedback_cb(f"Identifying {installation.filename}")
+                found = self.identify_file(installation.sha1)
+                if found is None:
+                    logger.debug(f"Plugin with SHA1 {installation.sha1} not found on any source")
                     continue
+                connector, fileinfo = found
             logger.info(f"Plugin: {installation.filename}, Version: {fileinfo.version_name}, Released: {fileinfo.release_date}")
             if installation.installation_type == "UNKNOWN":
                 self.db.update_installation_type(installation.sha1, fileinfo.version_type)
+            identified.append((installation, connector, fileinfo))
+
+        # let each connector fetch shared metadata (e.g. project owners) in bulk
+        for connector in dict.fromkeys(c for _, c, _ in identified):
+            feedback_cb(f"Fetching project metadata from {connector.__class__.__name__}")
+            connector.prefetch([fileinfo.project_id for _, c, fileinfo in identified if c is connector])
+
+        for installation, connector, fileinfo in identified:
             try:
                 feedback_cb(f"Fetching project info for {installation.filename} from {connector.__class__.__name__}")
                 project_info = connector.get_project_info(fileinfo.project_id)
+                # the version list may be filtered by game version; always keep the installed one.
+                # Connectors may cache the project, so extend a copy instead of the shared version list.
+                if fileinfo.version_id not in project_info.versions:
+                    project_info = replace(project_info, versions={**project_info.versions, fileinfo.version_id: fileinfo})
                 self.db.save_project_info(project_info)
             except PluginNotFoundException as e:
                 logger.warning(f"Plugin with SHA1 {installation.sha1} not found on {connector.__class__.__name__}: {e}")
+        self.refresh_status()
 
     def get_installations(self) -> tuple[list[ProjectInfo], list[InstallationTable]]:
         self.remove_stale_installations()
@@ -88,7 +265,7 @@ class PluginManager:
         unrecognized = []
         for installation in installations:
             logger.debug(f"Installation: {installation.filename}, SHA1: {installation.sha1}")
-            project = self.db.get_project_by_file_sha1(installation.sha1)
+            project = self.db.get_project_by_file_sha1(installation.sha1, lazy=True)
             if project is None:
                 unrecognized.append(installation)
                 continue
@@ -97,8 +274,8 @@ class PluginManager:
 
     def get_installation_names(self) -> list[str]:
         """Get a list of installed plugin names for autocompletion."""
-        installations, _ = self.get_installations()
-        return [plugin.name for plugin in installations] + [plugin.project_id for plugin in installations]
+        statuses = [status for status in self.get_status() if status.recognized]
+        return [status.name for status in statuses] + [status.project_id for status in statuses]
 
     def get_project_info(self, name):
         project_info = self.db.get_project_info(name)
@@ -106,54 +283,510 @@ class PluginManager:
             logger.debug(f"Found local project info for '{name}': '{project_info.name}'")
             return project_info
 
-        logger.debug(f"Project '{name}' not found in local database. Querying default source '{self.default_source}'")
+        logger.debug(f"Project '{name}' not found in local database. Querying {', '.join(self.get_lookup_connectors())}")
+        return self.get_remote_project_info(name)
 
+    def get_remote_project_info(self, name: str) -> ProjectInfo | None:
+        """Look up a project by ID on the lookup sources, preferring the local copy if one exists.
+
+        In single-source mode the default source is asked directly and without a timeout; only a
+        PluginNotFoundException counts as a miss, other errors propagate. In multi-source mode all
+        sources are asked concurrently and the ones that fail are reported.
+        """
+        if not self.multi_source:
+            try:
+                project_info = self.connectors[self.default_source].get_project_info(name)
+            except PluginNotFoundException:
+                return None
+            return self._prefer_local(name, project_info)
+
+        errors: dict[str, Exception] = {}
+        connectors = self.get_lookup_connectors()
+        results = run_concurrently(
+            {source: partial(connector.get_project_info, name) for source, connector in connectors.items()},
+            timeout=self.source_timeout,
+            errors=errors,
+        )
+        self._report_source_errors(f"Could not look up '{name}'", errors)
+        # results keep the source preference order, so the default source wins ties
+        for project_info in results.values():
+            return self._prefer_local(name, project_info)
+        return None
+
+    def _prefer_local(self, name: str, project_info: ProjectInfo) -> ProjectInfo:
+        local_project = self.db.get_project_info(project_info.project_id)
+        if local_project:
+            logger.debug(f"Found local project match for '{name}': '{local_project.name}'")
+            return local_project
+        return project_info
+
+    @staticmethod
+    def _report_source_errors(action: str, errors: dict[str, Exception]):
+        """Log the failures of a multi-source request; a plugin a source does not have is not a failure."""
+        for source, error in errors.items():
+            if not isinstance(error, PluginNotFoundException):
+                logger.error(f"{action} on {source}: {error}")
+
+    def fetch_full_history(self, project: ProjectInfo) -> ProjectInfo | None:
+        """Fetch every published version of a project, ignoring the game version filter."""
+        connector = self.connectors.get(project.source, self.connectors[self.default_source])
         try:
-            logger.debug(f"Fetching project info for '{name}' from default source '{self.default_source}'")
-            project_info = self.connectors[self.default_source].get_project_info(name)
-            local_project = self.db.get_project_info(project_info.project_id)
-            if local_project:
-                logger.debug(f"Found local project match for '{name}': '{local_project.name}'")
-                return local_project
-            return project_info
+            return connector.get_project_info(project.project_id, full_history=True)
+        except PluginNotFoundException as e:
+            logger.debug(f"Could not fetch full version history for '{project.name}': {e}")
+            return None
+
+    def load_description(self, project: ProjectInfo, file_info: FileInfo) -> str:
+        """Load the changelog of a version on demand and cache it in the database."""
+        if file_info.description:
+            return file_info.description
+        file_info.description = self.db.get_file_description(file_info.sha1)
+        if file_info.description:
+            return file_info.description
+        connector = self.connectors.get(project.source, self.connectors[self.default_source])
+        try:
+            file_info.description = connector.get_changelog(file_info)
+        except PluginNotFoundException as e:
+            logger.debug(f"Could not fetch changelog for {file_info.version_name}: {e}")
+            return ""
+        if file_info.description:
+            self.db.update_file_description(file_info.sha1, file_info.description)
+        return file_info.description
+
+    def _load_dependency_project(self, source: str, project_id: str) -> ProjectInfo | None:
+        project = self.db.get_project_info(project_id, lazy=True)
+        if project is not None:
+            return project
+        connector = self.connectors.get(source, self.connectors[self.default_source])
+        try:
+            return connector.get_project_info(project_id)
         except PluginNotFoundException:
-            pass
+            return None
 
-        return None
+    def _load_dependency_version(self, source: str, version_id: str) -> FileInfo | None:
+        file_info = self.db.get_file_by_version_id(version_id)
+        if file_info is not None:
+            return file_info
+        connector = self.connectors.get(source, self.connectors[self.default_source])
+        try:
+            return connector.get_file_info(version_id)
+        except PluginNotFoundException:
+            return None
+
+    def _load_dependencies(self, files: list[FileInfo]) -> dict[str, tuple[FileDependency, ...]]:
+        known = {f.sha1: f.dependencies for f in files if f.dependencies is not None}
+        return known | self.db.get_file_dependencies([f.sha1 for f in files if f.dependencies is None])
+
+    def resolve_dependencies(self, plan: list[InstallStep], include_optional: bool = False) -> Resolution:
+        """Add the missing dependencies of an install plan and order it, dependencies first.
+
+        Metadata comes from the local database where possible; see DependencyResolver.
+        """
+        installed = [project for project, _ in self.db.get_installed_versions()]
+        resolver = DependencyResolver(
+            self._load_dependency_project,
+            self._load_dependency_version,
+            self._load_dependencies,
+            installed,
+            include_optional=include_optional,
+            timeout=self.source_timeout,
+        )
+        return resolver.resolve([(step.project, step.file_info) for step in plan])
+
+    def retire_plugin_file(self, plugin_path: Path, sha1: str):
+        """Delete an installed jar, keeping a copy in the jar cache for reinstalls and rollbacks."""
+        try:
+            JarCache().put(sha1, plugin_path, move=True)
+        except OSError as e:
+            logger.debug(f"Could not cache {plugin_path}: {e}")
+            plugin_path.unlink(missing_ok=True)
+
+    def get_download_url(self, step: InstallStep) -> str:
+        """Download URL of a resolved version, asking the source only if it is not already known."""
+        if step.file_info.url:
+            return step.file_info.url
+        connector = self.connectors.get(step.project.source, self.connectors[self.default_source])
+        return connector.get_download_link(step.file_info)
+
+    def execute_install_plan(
+        self,
+        plan: list[InstallStep],
+        progress_cb: ProgressCallback | None = None,
+        feedback_cb: Callable[[str], None] = default_feedback_cb,
+        stage: bool = False,
+    ) -> list[DownloadResult]:
+        """Download the planned versions concurrently and replace the existing installations.
+
+        The steps are used as they are; nothing is looked up again. Jars already in the jar cache
+        are copied from it, and the previous jar of a project is removed only once its new jar is
+        in place.
+
+        Args:
+            plan: The resolved versions to install.
+            progress_cb: Called with the progress of each download.
+            feedback_cb: Called with status messages.
+            stage: Download into the staging area and leave the installed jars untouched.
+                The staged jars are swapped in later by ``apply_staged``.
+
+        Returns:
+            list[DownloadResult]: One result per step, in the same order.
+        """
+        cache = JarCache()
+        staging = StagingArea(self.plugin_dir)
+        jobs = []
+        for step in plan:
+            url = step.file_info.url if cache.get(step.file_info.sha1) else self.get_download_url(step)
+            hashes = step.file_info.hashes or {"sha1": step.file_info.sha1}
+            if stage:
+                staging.root.mkdir(parents=True, exist_ok=True)
+                dest = staging.path_for(step.filename)
+            else:
+                dest = Path(self.plugin_dir) / step.filename
+            jobs.append(DownloadJob(url=url, dest=dest, label=step.filename, hashes=hashes))
+
+        engine = DownloadEngine(cache=cache)
+        results = engine.run(jobs, progress_cb) if progress_cb else engine.run(jobs)
+        for step, result in zip(plan, results, strict=True):
+            if not result.ok:
+                continue
+            if stage:
+                self._stage_install(staging, step, result)
+            else:
+                self._commit_install(step, result, feedback_cb)
+        if not stage:
+            self.refresh_status()
+        return results
+
+    def _current_installation(self, project: ProjectInfo) -> Row | None:
+        if project.current_version is None:
+            return None
+        return self.db.get_installation_by_sha1(project.current_version.sha1)
+
+    def _commit_install(self, step: InstallStep, result: DownloadResult, feedback_cb: Callable[[str], None]):
+        project = step.project
+        installation = self._current_installation(project)
+        if installation:
+            plugin_path = Path(self.plugin_dir) / installation.filename
+            if plugin_path.exists() and plugin_path != result.job.dest:
+                feedback_cb(f"Removing existing installation '{installation.filename}'...")
+                self.retire_plugin_file(plugin_path, installation.sha1)
+            self.db.remove_installation(installation.filename)
+        self.db.save_project_info(project)
+        self.db.save_installation_info(result.job.dest.name, result.hashes["sha1"], result.size, project.installation_type)
+
+    def _stage_install(self, staging: StagingArea, step: InstallStep, result: DownloadResult):
+        installation = self._current_installation(step.project)
+        # version metadata is safe to save now; the installation record changes only when applied
+        self.db.save_project_info(step.project)
+        staging.add(StagedInstall(
+            project_id=step.project.project_id,
+            filename=step.filename,
+            sha1=result.hashes["sha1"],
+            size=result.size,
+            installation_type=step.project.installation_type,
+            replaces=installation.filename if installation else None,
+            replaces_sha1=installation.sha1 if installation else None,
+        ))
+
+    def get_staged(self) -> list[StagedInstall]:
+        return StagingArea(self.plugin_dir).load()
+
+    def apply_staged(self, feedback_cb: Callable[[str], None] = default_feedback_cb) -> tuple[list[StagedInstall], list[StagedInstall]]:
+        """Move staged jars into the plugin directory and retire the jars they replace.
+
+        Only renames and database updates happen here, so it is quick enough to run right before
+        the server starts. Entries whose staged jar is missing or truncated stay in the manifest.
+
+        Returns:
+            tuple: The applied entries and the entries that could not be applied.
+        """
+        staging = StagingArea(self.plugin_dir)
+        applied, failed = [], []
+        for entry in staging.load():
+            staged_path = staging.path_for(entry.filename)
+            if not staged_path.is_file() or staged_path.stat().st_size != entry.size:
+                logger.warning(f"Staged jar {staged_path} is missing or incomplete.")
+                failed.append(entry)
+                continue
+            dest = Path(self.plugin_dir) / entry.filename
+            os.replace(staged_path, dest)
+            if entry.replaces and entry.replaces != entry.filename:
+                old_path = Path(self.plugin_dir) / entry.replaces
+                if old_path.exists():
+                    feedback_cb(f"Removing existing installation '{entry.replaces}'...")
+                    self.retire_plugin_file(old_path, entry.replaces_sha1 or compute_sha1(old_path))
+            if entry.replaces:
+                self.db.remove_installation(entry.replaces)
+            self.db.save_installation_info(entry.filename, entry.sha1, entry.size, entry.installation_type)
+            applied.append(entry)
+        staging.save(failed)
+        if applied:
+            self.refresh_status()
+        return applied, failed
+
+    def create_lockfile(self, game_version: str | None = None) -> tuple[Lockfile, list[InstallationTable]]:
+        """Lock the installed versions of all recognized plugins.
+
+        Returns:
+            tuple: The lockfile and the installations that could not be locked because they are not recognized.
+        """
+        projects, unrecognized = self.get_installations()
+        plugins = [LockedPlugin.from_project(p, p.current_version) for p in projects if p.current_version]
+        return Lockfile(plugins=plugins, game_version=game_version), unrecognized
+
+    def plan_sync(self, lockfile: Lockfile, prune: bool = False) -> SyncPlan:
+        """Compare a lockfile with the scanned plugin directory.
+
+        Locked plugins are installed from the lockfile as they are; the sources are not asked for
+        metadata. An installed version of a locked project is replaced by the locked one.
+
+        Args:
+            lockfile: The plugin set to sync to.
+            prune: Also remove installed jars that are not in the lockfile.
+        """
+        self.remove_stale_installations()
+        installed = {installation.sha1: installation for installation in self.db.get_all_installations()}
+        install, unchanged, retrack = [], [], []
+        for locked in lockfile.plugins:
+            if locked.sha1 in installed:
+                unchanged.append(locked)
+                if installed[locked.sha1].installation_type != locked.track:
+                    retrack.append(locked)
+                continue
+            project = self.db.get_project_info(locked.project_id, lazy=True)
+            # a stored version is already among the project's versions and resolves with one query
+            file_info = self.db.get_file_info(locked.project_id, locked.version_id) if project else None
+            if file_info is None or file_info.sha1 != locked.sha1:
+                project = project or locked.to_project_info()
+                file_info = locked.to_file_info()
+                project.versions[file_info.version_id] = file_info
+            project.installation_type = locked.track
+            install.append(InstallStep(project, file_info))
+
+        remove = []
+        if prune:
+            keep = {locked.sha1 for locked in lockfile.plugins}
+            # installations replaced by an install step are removed once the new jar is in place
+            keep.update(step.project.current_version.sha1 for step in install if step.project.current_version)
+            remove = [installation for sha1, installation in installed.items() if sha1 not in keep]
+        return SyncPlan(install=install, remove=remove, unchanged=unchanged, retrack=retrack)
+
+    def remove_installations(self, installations: list[InstallationTable], feedback_cb: Callable[[str], None] = default_feedback_cb):
+        for installation in installations:
+            plugin_path = Path(self.plugin_dir) / installation.filename
+            if plugin_path.exists():
+                feedback_cb(f"Removing plugin file '{installation.filename}'...")
+                self.retire_plugin_file(plugin_path, installation.sha1)
+            self.db.remove_installation(installation.filename)
+        if installations:
+            self.refresh_status()
+
+    def set_track(self, sha1: str, track: str):
+        """Change the release type an installation is upgraded along."""
+        self.db.update_installation_type(sha1, track)
+        self.refresh_status()
+
+    def apply_tracks(self, locked: list[LockedPlugin]):
+        """Make the installations of locked versions track the release types of the lockfile."""
+        for plugin in locked:
+            self.db.update_installation_type(plugin.sha1, plugin.track)
+        if locked:
+            self.refresh_status()
+
+    def check_readiness(self, game_version: str) -> list[PluginReadiness]:
+        """Check from the local database whether each installed plugin supports ``game_version``.
+
+        Only stored versions are considered; see refresh_full_history.
+        """
+        installed = [project for project, _ in self.db.get_installed_versions()]
+        project_ids = [project.project_id for project in installed]
+        self.db.index_game_versions(project_ids)
+        supporting: dict[str, list[FileInfo]] = {}
+        for file_info in self.db.get_files_for_game_version(project_ids, game_version):
+            supporting.setdefault(file_info.project_id, []).append(file_info)
+
+        report = []
+        for project in installed:
+            readiness = PluginReadiness(project, compatibility_score(project.current_version.game_versions, game_version))
+            min_weight = release_type_weights(project.installation_type)
+            candidates = [f for f in supporting.get(project.project_id, []) if release_type_weights(f.version_type) >= min_weight]
+            for score in (3, 2):
+                if score <= readiness.current_score:
+                    break
+                candidate = ProjectInfo.find_latest(f for f in candidates if compatibility_score(f.game_versions, game_version) == score)
+                if candidate:
+                    readiness.candidate, readiness.candidate_score = candidate, score
+                    break
+            report.append(readiness)
+        return report
+
+    def refresh_full_history(self, feedback_cb: Callable[[str], None] = default_feedback_cb) -> dict[str, Exception]:
+        """Fetch and store the full version history of every installed plugin, a few at a time.
+
+        Returns:
+            dict: The error of each plugin, by name, whose history could not be fetched. Their
+            stored versions are left as they were.
+        """
+        projects = {project.project_id: project for project, _ in self.db.get_installed_versions()}
+        feedback_cb(f"Fetching version history of {len(projects)} plugins...")
+        errors: dict[str, Exception] = {}
+        results = run_concurrently(
+            {project_id: partial(self.fetch_full_history, project) for project_id, project in projects.items()},
+            timeout=self.source_timeout,
+            errors=errors,
+            max_workers=Config.MAX_SOURCE_REQUESTS,
+        )
+        for project_info in results.values():
+            if project_info is not None:
+                self.db.save_project_info(project_info)
+        failed = {projects[project_id].name: error for project_id, error in errors.items()}
+        for name, error in failed.items():
+            logger.error(f"Could not fetch the version history of {name}: {error}")
+            feedback_cb(f"Could not fetch the version history of {name}")
+        self.refresh_status()
+        return failed
 
     def fuzzy_find_project(self, name: str) -> tuple[bool, ProjectInfo | None]:
-        """Fuzzy find projects by name across all connectors."""
-        project = self.get_project_info(name)
+        """Fuzzy find projects by name across all connectors.
+
+        The local database is checked first, by ID, slug or name and then through its full-text
+        index. Otherwise the exact remote lookup and a fuzzy search run concurrently; an exact hit
+        wins as soon as it arrives, and the project behind the search hit is fetched while the exact
+        lookup is still in flight. When the sources find nothing, the best local match is returned.
+        """
+        project = self.db.get_project_info(name)
         if project:
+            logger.debug(f"Found local project info for '{name}': '{project.name}'")
             return True, project
+        local_hits = self.db.search_projects(name, 1)
+        exact_hit = self._exact_local_hit(name, local_hits)
+        if exact_hit is not None:
+            logger.debug(f"Found local project match for '{name}': '{exact_hit.project_name}'")
+            return True, self.db.get_project_info(exact_hit.project_id)
+
+        logger.debug(f"Fuzzy searching for project '{name}' in {', '.join(self.get_lookup_connectors())}")
+        executor = ThreadPoolExecutor(max_workers=3)
+        exact = executor.submit(self.get_remote_project_info, name)
+        search = executor.submit(self.search_remote_projects, name, None, 1)
+        hit: Future | None = None
+        pending = {exact, search}
+        exact_failed = False
+        exact_error: Exception | None = None
+        fuzzy_project = None
+        # single-source lookups wait for the source like any other request
+        timed = self.multi_source and self.source_timeout is not None
+        deadline = monotonic() + 2 * self.source_timeout if timed else None
         try:
-            logger.debug(f"Fuzzy searching for project '{name}' in default source '{self.default_source}'")
-            query = self.connectors[self.default_source].query(name, limit=1)
-            if query:
-                for result in query:
-                    local_project = self.db.get_project_info(result.project_id)
-                    if local_project:
-                        logger.debug(f"Found local project match for '{name}': '{local_project.name}'")
-                        return False, local_project
-                    project_info = self.connectors[self.default_source].get_project_info(result.project_id)
-                    return False, project_info
+            while pending:
+                remaining = None if deadline is None else max(deadline - monotonic(), 0)
+                done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+                if not done:
+                    logger.debug(f"Fuzzy search for '{name}' timed out")
+                    break
+                if exact in done:
+                    exact_error = exact.exception()
+                    project = exact.result() if exact_error is None else None
+                    if project:
+                        return True, project
+                    exact_failed = True
+                if search in done and search.exception() is None and search.result():
+                    hit = executor.submit(self._resolve_search_hit, search.result()[0])
+                    pending.add(hit)
+                if hit in done and hit.exception() is None:
+                    fuzzy_project = hit.result()
+                    if fuzzy_project and name.lower() in (fuzzy_project.project_id.lower(), fuzzy_project.name.lower()):
+                        return True, fuzzy_project
+                if fuzzy_project and exact_failed:
+                    return False, fuzzy_project
+            if fuzzy_project is None and exact_error is not None:
+                # the source failed rather than not knowing the plugin; do not report it as missing
+                if not local_hits:
+                    raise exact_error
+                logger.error(f"Could not look up '{name}' on {self.default_source}: {exact_error}")
+            if fuzzy_project is None and local_hits:
+                logger.debug(f"No remote match for '{name}', using local match '{local_hits[0].project_name}'")
+                fuzzy_project = self.db.get_project_info(local_hits[0].project_id)
+            return False, fuzzy_project
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _resolve_search_hit(self, result: SearchResult) -> ProjectInfo | None:
+        local_project = self.db.get_project_info(result.project_id)
+        if local_project:
+            logger.debug(f"Found local project match for '{result.project_name}': '{local_project.name}'")
+            return local_project
+        connector = self.connectors.get(result.source, self.connectors[self.default_source])
+        try:
+            return connector.get_project_info(result.project_id)
         except PluginNotFoundException:
-            pass
+            return None
 
-        return False, None
+    def _exact_local_hit(self, query: str, hits: list[SearchResult]) -> SearchResult | None:
+        """The top local hit if ``query`` is its ID, slug or name, ignoring case."""
+        if not hits:
+            return None
+        top = hits[0]
+        if query.lower() in (top.project_id.lower(), top.project_name.lower()):
+            return top
+        by_slug = self.db.get_project_table_by_slug(query.lower())
+        return top if by_slug is not None and by_slug.project_id == top.project_id else None
 
-    def search_projects(self, query: str, mc_version: str | None = None, limit: int = 10) -> list[SearchResult]:
-        """Search for projects across all connectors."""
-        connector = self.connectors[self.default_source]
-        try:
-            return connector.query(query, mc_version, limit)
-        except Exception as e:
-            logger.error(f"Error searching for projects: {e}")
-            return []
+    def search_projects(self, query: str, mc_version: str | None = None, limit: int = 10, offline: bool = False) -> list[SearchResult]:
+        """Search the local full-text index and the connectors.
+
+        The sources are skipped when searching offline or when the best local match is exactly the
+        plugin asked for. Otherwise the remote results come first, in their own rank order, and the
+        local matches they do not include fill the remaining places.
+
+        Args:
+            offline: Only search the local database.
+        """
+        local = self.db.search_projects(query, limit, game_version=mc_version)
+        if offline or self._exact_local_hit(query, local) is not None:
+            return local
+        remote = self.search_remote_projects(query, mc_version, limit)
+        seen = {(result.source, result.project_id) for result in remote}
+        return (remote + [result for result in local if (result.source, result.project_id) not in seen])[:limit]
+
+    def search_remote_projects(self, query: str, mc_version: str | None = None, limit: int = 10) -> list[SearchResult]:
+        """Search for projects across all connectors.
+
+        In multi-source mode every source is queried concurrently and the results are interleaved
+        by rank, default source first.
+        """
+        if not self.multi_source:
+            try:
+                return self.connectors[self.default_source].query(query, mc_version, limit)
+            except Exception as e:
+                logger.error(f"Error searching for projects: {e}")
+                return []
+
+        errors: dict[str, Exception] = {}
+        connectors = self.get_lookup_connectors()
+        results = run_concurrently(
+            {source: partial(connector.query, query, mc_version, limit) for source, connector in connectors.items()},
+            timeout=self.source_timeout,
+            errors=errors,
+        )
+        self._report_source_errors("Error searching for projects", errors)
+
+        merged = []
+        seen = set()
+        for ranked in zip_longest(*results.values()):
+            for result in ranked:
+                if result is None or (result.source, result.project_id) in seen:
+                    continue
+                seen.add((result.source, result.project_id))
+                merged.append(result)
+        return merged[:limit]
 
 def get_plugin_manager() -> PluginManager:
     """Get an instance of the PluginManager."""
-    from .config import Config
     if not hasattr(get_plugin_manager, '_instance'):
-        get_plugin_manager._instance = PluginManager(Config.DEFAULT_SOURCE)  # type: ignore
+        get_plugin_manager._instance = PluginManager(  # type: ignore
+            Config.DEFAULT_SOURCE,
+            Config.GAME_VERSION,
+            multi_source=Config.MULTI_SOURCE,
+            source_timeout=Config.SOURCE_TIMEOUT,
+        )
     return get_plugin_manager._instance # type: ignore
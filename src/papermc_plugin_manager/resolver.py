@@ -0,0 +1,302 @@
+"""Dependency resolution for install plans."""
+
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from functools import partial
+from itertools import pairwise
+
+from logzero import logger
+
+from .connector_interface import FileDependency, FileInfo, ProjectInfo
+from .exceptions import DependencyConflictException, DependencyCycleException
+from .utils import run_concurrently
+
+REQUIRED = "REQUIRED"
+OPTIONAL = "OPTIONAL"
+INCOMPATIBLE = "INCOMPATIBLE"
+
+
+@dataclass
+class DependencyNode:
+    project: ProjectInfo
+    file_info: FileInfo
+    # project IDs of the plugins that depend on this one; empty for requested plugins
+    required_by: list[str] = field(default_factory=list)
+    # already installed in a suitable version, so there is nothing to download
+    installed: bool = False
+    # only wanted as an optional dependency
+    optional: bool = False
+    # project IDs this one depends on, mapped to whether the dependency is required
+    depends_on: dict[str, bool] = field(default_factory=dict)
+
+
+@dataclass
+class MissingDependency:
+    """A dependency that could not be found on the source of the plugin that declares it."""
+
+    required_by: str
+    project_id: str | None
+    version_id: str | None
+    optional: bool = False
+
+
+@dataclass
+class Resolution:
+    # plugins to install, dependencies before the plugins that need them
+    install: list[DependencyNode]
+    # optional dependencies that are not installed and were not added
+    suggested: list[DependencyNode] = field(default_factory=list)
+    missing: list[MissingDependency] = field(default_factory=list)
+
+    @property
+    def added(self) -> list[DependencyNode]:
+        """Plugins added to the plan as dependencies."""
+        return [node for node in self.install if node.required_by]
+
+
+class DependencyResolver:
+    """Build the dependency graph of an install plan and order it for installation.
+
+    The graph is walked breadth first. The projects and pinned versions one level down are looked
+    up in a single parallel batch before the next level is visited. Plugins that are already
+    installed in a suitable version are not looked up and their dependencies are not followed.
+    """
+
+    def __init__(
+        self,
+        load_project: Callable[[str, str], ProjectInfo | None],
+        load_version: Callable[[str, str], FileInfo | None],
+        load_dependencies: Callable[[list[FileInfo]], dict[str, tuple[FileDependency, ...]]],
+        installed: list[ProjectInfo],
+        include_optional: bool = False,
+        timeout: float | None = None,
+    ):
+        """
+        Args:
+            load_project: Look up a project by ``(source, project_id)``.
+            load_version: Look up a version by ``(source, version_id)``.
+            load_dependencies: Declared dependencies of several files, keyed by SHA1.
+            installed: Installed projects with their current version.
+            include_optional: Install optional dependencies too instead of only suggesting them.
+            timeout: Seconds to wait for each batch of lookups.
+        """
+        self.load_project = load_project
+        self.load_version = load_version
+        self.load_dependencies = load_dependencies
+        self.installed = {project.project_id: project for project in installed if project.current_version}
+        self.include_optional = include_optional
+        self.timeout = timeout
+
+    def resolve(self, plan: list[tuple[ProjectInfo, FileInfo]]) -> Resolution:
+        """Resolve the dependencies of the planned versions.
+
+        Raises:
+            DependencyConflictException: If two plugins need different versions of a plugin, or a
+                plugin in the result declares another one as incompatible.
+            DependencyCycleException: If plugins to install require each other in a cycle.
+        """
+        nodes: dict[str, DependencyNode] = {}
+        for project, file_info in plan:
+            nodes[project.project_id] = DependencyNode(project, file_info)
+        missing: list[MissingDependency] = []
+        conflicts: list[str] = []
+        incompatible: list[tuple[DependencyNode, FileDependency]] = []
+
+        level = list(nodes.values())
+        while level:
+            wanted: list[tuple[DependencyNode, FileDependency]] = []
+            for node, dependencies in zip(level, self._dependencies_of(level), strict=True):
+                for dependency in dependencies:
+                    if dependency.dependency_type == INCOMPATIBLE:
+                        incompatible.append((node, dependency))
+                    elif dependency.dependency_type in (REQUIRED, OPTIONAL):
+                        wanted.append((node, dependency))
+            level = self._visit(wanted, nodes, missing, conflicts)
+
+        kept = self._kept_dependencies(nodes)
+        conflicts += self._pin_conflicts(nodes, kept)
+        conflicts += self._incompatibilities(nodes, incompatible + [(n, d) for n, d in kept if d.dependency_type == INCOMPATIBLE])
+        if conflicts:
+            raise DependencyConflictException(conflicts)
+
+        order = self._topological_order(nodes)
+        return Resolution(
+            install=[node for node in order if not node.installed and (not node.optional or self.include_optional)],
+            suggested=[node for node in order if node.optional and not node.installed and not self.include_optional],
+            missing=missing,
+        )
+
+    def _dependencies_of(self, level: list[DependencyNode]) -> list[tuple[FileDependency, ...]]:
+        unknown = [node.file_info for node in level if node.file_info.dependencies is None]
+        loaded = self.load_dependencies(unknown) if unknown else {}
+        return [
+            node.file_info.dependencies if node.file_info.dependencies is not None else loaded.get(node.file_info.sha1, ())
+            for node in level
+        ]
+
+    def _visit(
+        self,
+        wanted: list[tuple[DependencyNode, FileDependency]],
+        nodes: dict[str, DependencyNode],
+        missing: list[MissingDependency],
+        conflicts: list[str],
+    ) -> list[DependencyNode]:
+        """Add the dependencies of one level to the graph and return the nodes of the next level."""
+        # pinned versions first, since a dependency may only name the version
+        version_ids = {
+            dependency.version_id: node.project.source
+            for node, dependency in wanted
+            if dependency.version_id and not self._known_version(dependency.version_id, nodes)
+        }
+        versions = self._batch(self.load_version, version_ids)
+
+        targets: list[tuple[DependencyNode, FileDependency, str | None, FileInfo | None]] = []
+        for node, dependency in wanted:
+            pinned = None
+            if dependency.version_id:
+                pinned = self._known_version(dependency.version_id, nodes) or versions.get(dependency.version_id)
+            project_id = dependency.project_id or (pinned.project_id if pinned else None)
+            targets.append((node, dependency, project_id, pinned))
+
+        project_ids = {
+            project_id: node.project.source
+            for node, _, project_id, pinned in targets
+            if project_id and project_id not in nodes and not self._satisfied_by_installed(project_id, pinned)
+        }
+        projects = self._batch(self.load_project, project_ids)
+
+        next_level = []
+        for node, dependency, project_id, pinned in targets:
+            optional = dependency.dependency_type == OPTIONAL
+            requirer = node.project.project_id
+            if project_id is None or (dependency.version_id and pinned is None):
+                missing.append(MissingDependency(requirer, project_id, dependency.version_id, optional))
+                continue
+            existing = nodes.get(project_id)
+            if existing is not None:
+                if pinned and existing.file_info.version_id != pinned.version_id:
+                    conflicts.append(
+                        f"{node.project.name} requires {existing.project.name} {pinned.version_name}, "
+                        f"but {existing.file_info.version_name} is selected"
+                    )
+                existing.required_by.append(requirer)
+                node.depends_on[project_id] = not optional
+                if existing.optional and not optional:
+                    existing.optional = False
+                    if not existing.installed and not self.include_optional:
+                        next_level.append(existing)
+                continue
+            if self._satisfied_by_installed(project_id, pinned):
+                current = self.installed[project_id]
+                nodes[project_id] = DependencyNode(current, current.current_version, [requirer], installed=True, optional=optional)
+                node.depends_on[project_id] = not optional
+                continue
+            project = projects.get(project_id)
+            file_info = None
+            if project is not None:
+                file_info = pinned or project.get_latest_type("release") or project.get_latest()
+            if file_info is None:
+                missing.append(MissingDependency(requirer, project_id, dependency.version_id, optional))
+                continue
+            node.depends_on[project_id] = not optional
+            if project_id not in self.installed:
+                project.installation_type = file_info.version_type
+            project.versions.setdefault(file_info.version_id, file_info)
+            new_node = DependencyNode(project, file_info, [requirer], optional=optional)
+            nodes[project_id] = new_node
+            # optional dependencies are only suggested; their own dependencies are not followed
+            if not optional or self.include_optional:
+                next_level.append(new_node)
+        return next_level
+
+    def _batch(self, load: Callable[[str, str], object], keys: dict[str, str]) -> dict:
+        if not keys:
+            return {}
+        logger.debug(f"Resolving dependencies: looking up {', '.join(keys)}")
+        results = run_concurrently({key: partial(load, source, key) for key, source in keys.items()}, timeout=self.timeout)
+        return {key: result for key, result in results.items() if result is not None}
+
+    def _known_version(self, version_id: str, nodes: dict[str, DependencyNode]) -> FileInfo | None:
+        candidates = [node.file_info for node in nodes.values()] + [p.current_version for p in self.installed.values()]
+        return next((file_info for file_info in candidates if file_info.version_id == version_id), None)
+
+    def _satisfied_by_installed(self, project_id: str, pinned: FileInfo | None) -> bool:
+        current = self.installed.get(project_id)
+        if current is None:
+            return False
+        return pinned is None or current.current_version.version_id == pinned.version_id
+
+    def _kept_dependencies(self, nodes: dict[str, DependencyNode]) -> list[tuple[DependencyNode, FileDependency]]:
+        """Dependencies declared by the installed plugins that the plan leaves alone."""
+        kept = [project for project_id, project in self.installed.items() if project_id not in nodes]
+        declared = self.load_dependencies([project.current_version for project in kept]) if kept else {}
+        return [
+            (DependencyNode(project, project.current_version, installed=True), dependency)
+            for project in kept
+            for dependency in declared.get(project.current_version.sha1, ())
+        ]
+
+    def _pin_conflicts(self, nodes: dict[str, DependencyNode], kept: list[tuple[DependencyNode, FileDependency]]) -> list[str]:
+        conflicts = []
+        for node, dependency in kept:
+            if dependency.dependency_type != REQUIRED or not dependency.version_id:
+                continue
+            target = nodes.get(dependency.project_id or "")
+            if target is not None and not target.installed and target.file_info.version_id != dependency.version_id:
+                conflicts.append(
+                    f"{node.project.name} requires a different version of {target.project.name} "
+                    f"than {target.file_info.version_name}"
+                )
+        return conflicts
+
+    def _incompatibilities(
+        self,
+        nodes: dict[str, DependencyNode],
+        incompatible: list[tuple[DependencyNode, FileDependency]],
+    ) -> list[str]:
+        present = {project_id: node.file_info for project_id, node in nodes.items() if not node.optional or self.include_optional}
+        for project_id, project in self.installed.items():
+            present.setdefault(project_id, project.current_version)
+        conflicts = []
+        for node, dependency in incompatible:
+            for project_id, file_info in present.items():
+                if project_id == node.project.project_id or dependency.project_id not in (None, project_id):
+                    continue
+                # without a project ID the dependency names an exact version
+                if dependency.version_id not in (None, file_info.version_id) or not (dependency.project_id or dependency.version_id):
+                    continue
+                name = nodes[project_id].project.name if project_id in nodes else self.installed[project_id].name
+                conflicts.append(f"{node.project.name} is incompatible with {name} {file_info.version_name}")
+        return conflicts
+
+    def _topological_order(self, nodes: dict[str, DependencyNode]) -> list[DependencyNode]:
+        """Depth-first post-order: every node comes after the nodes it depends on.
+
+        A cycle of required dependencies is an error. A cycle that goes through an optional
+        dependency is broken at the dependency that closes it.
+        """
+        order: list[DependencyNode] = []
+        done: set[str] = set()
+        path: list[str] = []
+
+        def visit(project_id: str):
+            if project_id in done:
+                return
+            path.append(project_id)
+            node = nodes[project_id]
+            for dependency_id in node.depends_on:
+                if dependency_id in done:
+                    continue
+                if dependency_id in path:
+                    cycle = path[path.index(dependency_id):] + [dependency_id]
+                    if all(nodes[a].depends_on[b] for a, b in pairwise(cycle)):
+                        raise DependencyCycleException([nodes[p].project.name for p in cycle])
+                    continue
+                visit(dependency_id)
+            path.pop()
+            done.add(project_id)
+            order.append(node)
+
+        for project_id in nodes:
+            visit(project_id)
+        return order
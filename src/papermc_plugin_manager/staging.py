@@ -0,0 +1,83 @@
+"""Staging area for installs that are downloaded now and swapped into place later."""
+
+import json
+import os
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from logzero import logger
+
+from .config import Config
+
+
+@dataclass
+class StagedInstall:
+    project_id: str
+    # name of the jar once it is moved into the plugin directory
+    filename: str
+    sha1: str
+    size: int
+    installation_type: str
+    # installed jar that is removed when this one is applied
+    replaces: str | None = None
+    replaces_sha1: str | None = None
+
+
+class StagingArea:
+    """Verified jars waiting in ``<plugin_dir>/<Config.STAGING_DIR>``, described by a manifest.
+
+    The staging directory sits inside the plugin directory so that applying an entry is a rename
+    on the same filesystem. The server only loads jars directly in the plugin directory, so staged
+    jars are ignored until they are applied.
+    """
+
+    MANIFEST = "manifest.json"
+
+    def __init__(self, plugin_dir: str | Path = "plugins"):
+        self.root = Path(plugin_dir) / Config.STAGING_DIR
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.root / self.MANIFEST
+
+    def path_for(self, filename: str) -> Path:
+        return self.root / filename
+
+    def load(self) -> list[StagedInstall]:
+        if not self.manifest_path.exists():
+            return []
+        try:
+            with open(self.manifest_path) as f:
+                return [StagedInstall(**entry) for entry in json.load(f)]
+        except (json.JSONDecodeError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable staging manifest {self.manifest_path}: {e}")
+            return []
+
+    def save(self, entries: list[StagedInstall]):
+        """Write the manifest atomically, removing the staging directory once nothing is left."""
+        if not entries:
+            self.clear()
+            return
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.manifest_path.with_name(self.MANIFEST + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump([asdict(entry) for entry in entries], f, indent=2)
+        os.replace(tmp, self.manifest_path)
+
+    def add(self, entry: StagedInstall):
+        """Record a staged jar, replacing anything staged earlier for the same project."""
+        entries = []
+        for staged in self.load():
+            if staged.project_id != entry.project_id:
+                entries.append(staged)
+            elif staged.filename != entry.filename:
+                self.path_for(staged.filename).unlink(missing_ok=True)
+        entries.append(entry)
+        self.save(entries)
+
+    def clear(self):
+        if not self.root.exists():
+            return
+        for path in self.root.iterdir():
+            path.unlink()
+        self.root.rmdir()
@@ -1,11 +1,15 @@
 import hashlib
 import json
 import os
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
+from time import monotonic
 
-import requests
 from logzero import logger
 
+from .exceptions import DownloadFailedException
+
 
 def compute_md5(file_path):
     m = hashlib.md5()
@@ -75,14 +79,183 @@ def default_feedback_cb(msg: str):
     return
 
 
-def download_file(url: str, dest: str):
-    response = requests.get(url, stream=True, timeout=120)
-    response.raise_for_status()
-    total_size = int(response.headers.get("content-length", 0))
-    bytes_downloaded = 0
-    with open(dest, "wb") as f:
-        for chunk in response.iter_content(chunk_size=1024 * 8):
-            if chunk:
-                f.write(chunk)
-                bytes_downloaded += len(chunk)
-                yield (bytes_downloaded, total_size)
+def run_concurrently[T](
+    tasks: dict[str, Callable[[], T]],
+    timeout: float | None = None,
+    errors: dict[str, Exception] | None = None,
+    max_workers: int | None = None,
+) -> dict[str, T]:
+    """Run callables in parallel threads and collect their results.
+
+    Tasks that raise or do not finish within ``timeout`` seconds are left out of the result.
+    The returned dict keeps the order of ``tasks``.
+
+    Args:
+        errors: Filled with the exception of every task that raised, and a TimeoutError for
+            every task that did not finish in time.
+        max_workers: Run at most this many tasks at a time. The tasks then run in waves, and
+            each wave gets ``timeout`` seconds.
+    """
+    if not tasks:
+        return {}
+    workers = min(len(tasks), max_workers or len(tasks))
+    executor = ThreadPoolExecutor(max_workers=workers)
+    futures = {key: executor.submit(task) for key, task in tasks.items()}
+    waves = -(-len(tasks) // workers)
+    wait(futures.values(), timeout=None if timeout is None else timeout * waves)
+    executor.shutdown(wait=False, cancel_futures=True)
+    results = {}
+    for key, future in futures.items():
+        if not future.done():
+            logger.debug(f"Task '{key}' did not finish in time")
+            if errors is not None:
+                errors[key] = TimeoutError(f"timed out after {timeout}s" if waves == 1 else "did not finish in time")
+        elif future.exception() is not None:
+            logger.debug(f"Task '{key}' failed: {future.exception()}")
+            if errors is not None:
+                errors[key] = future.exception()
+        else:
+            results[key] = future.result()
+    return results
+
+
+def first_result[T](
+    tasks: dict[str, Callable[[], T]],
+    timeout: float | None = None,
+    accept: Callable[[T], bool] = lambda result: result is not None,
+) -> tuple[str, T] | None:
+    """Run callables in parallel threads and return the first accepted result as ``(key, result)``.
+
+    Remaining tasks are abandoned as soon as one result is accepted. Returns None if every task
+    fails, is rejected by ``accept`` or does not finish within ``timeout`` seconds.
+    """
+    if not tasks:
+        return None
+    executor = ThreadPoolExecutor(max_workers=len(tasks))
+    pending = {executor.submit(task): key for key, task in tasks.items()}
+    deadline = None if timeout is None else monotonic() + timeout
+    try:
+        while pending:
+            remaining = None if deadline is None else max(deadline - monotonic(), 0)
+            done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            if not done:
+                logger.debug(f"Tasks {list(pending.values())} timed out after {timeout}s")
+                return None
+            for future in done:
+                key = pending.pop(future)
+                if future.exception() is not None:
+                    logger.debug(f"Task '{key}' failed: {future.exception()}")
+                elif accept(future.result()):
+                    return key, future.result()
+        return None
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+DOWNLOAD_HASH_TYPES = ("sha1", "sha512")
+
+
+def _read_part_meta(meta_path: Path, url: str) -> dict[str, str] | None:
+    """Read the validators saved next to a partial download, if they belong to ``url``."""
+    try:
+        meta = json.loads(meta_path.read_text())
+    except (OSError, json.JSONDecodeError):
+        return None
+    if meta.get("url") != url or not (meta.get("etag") or meta.get("last_modified")):
+        return None
+    return meta
+
+
+def download_file(
+    url: str,
+    dest: str,
+    progress_cb: Callable[[int, int], None] | None = None,
+    expected_hashes: dict[str, str] | None = None,
+    resume: bool = False,
+    timeout: float | tuple[float, float] = 120,
+) -> tuple[int, dict[str, str]]:
+    """Download a file, hashing it while it streams.
+
+    The data is written to ``<dest>.part`` and only renamed to ``dest`` once every hash in
+    ``expected_hashes`` matches, so a partial or corrupt file never ends up at ``dest``.
+    Progress is reported as ``(bytes_downloaded, total_size)`` to ``progress_cb``.
+
+    With ``resume``, a failed transfer keeps its ``.part`` file together with the ETag and
+    Last-Modified validators in ``<dest>.part.json``. The next call continues from the size of the
+    partial file with a ``Range`` request guarded by ``If-Range``; if the server no longer matches
+    the validators it sends the whole file and the download starts over.
+
+    Returns:
+        tuple[int, dict[str, str]]: The file size and the sha1/sha512 digests.
+
+    Raises:
+        DownloadFailedException: If a hash does not match.
+    """
+    import requests
+
+    part = Path(f"{dest}.part")
+    meta_path = Path(f"{dest}.part.json")
+    digests = {hash_type: hashlib.new(hash_type) for hash_type in DOWNLOAD_HASH_TYPES}
+    headers = {}
+    offset = 0
+
+    meta = _read_part_meta(meta_path, url) if resume and part.exists() else None
+    if meta:
+        offset = part.stat().st_size
+        headers["Range"] = f"bytes={offset}-"
+        headers["If-Range"] = meta.get("etag") or meta["last_modified"]
+
+    try:
+        response = requests.get(url, stream=True, timeout=timeout, headers=headers)
+        if response.status_code == 416:
+            # the partial file is no longer valid for this resource; start over
+            response.close()
+            headers.clear()
+            offset = 0
+            response = requests.get(url, stream=True, timeout=timeout)
+        response.raise_for_status()
+
+        if offset and response.status_code == 206:
+            logger.debug(f"Resuming download of {url} at byte {offset}")
+            with open(part, "rb") as f:
+                while chunk := f.read(1024 * 1024):
+                    for digest in digests.values():
+                        digest.update(chunk)
+            mode = "ab"
+        else:
+            offset = 0
+            mode = "wb"
+            if resume:
+                meta_path.write_text(json.dumps({
+                    "url": url,
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified"),
+                }))
+
+        total_size = int(response.headers.get("content-length", 0))
+        if total_size:
+            total_size += offset
+        bytes_downloaded = offset
+        with open(part, mode) as f:
+            for chunk in response.iter_content(chunk_size=1024 * 8):
+                if chunk:
+                    f.write(chunk)
+                    for digest in digests.values():
+                        digest.update(chunk)
+                    bytes_downloaded += len(chunk)
+                    if progress_cb:
+                        progress_cb(bytes_downloaded, total_size)
+
+        hashes = {hash_type: digest.hexdigest() for hash_type, digest in digests.items()}
+        for hash_type, expected in (expected_hashes or {}).items():
+            if expected and hash_type in hashes and hashes[hash_type] != expected.lower():
+                raise DownloadFailedException(url, f"{hash_type} mismatch: expected {expected}, got {hashes[hash_type]}")
+        os.replace(part, dest)
+        meta_path.unlink(missing_ok=True)
+    except BaseException as e:
+        # keep the partial file for the next attempt unless its content is known to be bad
+        if not resume or isinstance(e, DownloadFailedException):
+            part.unlink(missing_ok=True)
+            meta_path.unlink(missing_ok=True)
+        raise
+    return bytes_downloaded, hashes
@@ -0,0 +1,56 @@
+"""Unit tests for the shell completion cache."""
+
+from papermc_plugin_manager import completion
+from papermc_plugin_manager.database import InstallationStatusTable, SourceDatabase
+
+
+class TestCompletionCache:
+    """Tests for the completion cache and the database writes that maintain it."""
+
+    def test_missing_cache(self, tmp_path):
+        assert completion.read_names(completion.PLUGINS, str(tmp_path / "ppm.db")) is None
+
+    def test_write_keeps_other_keys(self, tmp_path):
+        db_path = str(tmp_path / "ppm.db")
+        completion.write_names(db_path, plugins=["b", "a", "a"], snapshots=["s1"])
+        completion.write_names(db_path, plugins=["c"])
+
+        assert completion.read_names(completion.PLUGINS, db_path) == ["c"]
+        assert completion.read_names(completion.SNAPSHOTS, db_path) == ["s1"]
+
+    def test_corrupt_cache_is_ignored(self, tmp_path):
+        db_path = str(tmp_path / "ppm.db")
+        completion.cache_path(db_path).write_text("[1, 2")
+
+        assert completion.read_names(completion.PLUGINS, db_path) is None
+        completion.write_names(db_path, plugins=["a"])
+        assert completion.read_names(completion.PLUGINS, db_path) == ["a"]
+
+    def test_database_writes_update_cache(self, tmp_path):
+        db_path = str(tmp_path / "ppm.db")
+        db = SourceDatabase(f"sqlite:///{db_path}")
+
+        db.replace_installation_status([
+            InstallationStatusTable(filename="a.jar", sha1="sha-a", filesize=1, mtime_ns=10, project_id="abc", name="Alpha"),
+            InstallationStatusTable(filename="b.jar", sha1="sha-b", filesize=2, mtime_ns=20),
+        ])
+        snapshot = db.create_snapshot("before-upgrade")
+        db.create_snapshot("nightly")
+
+        assert completion.read_names(completion.PLUGINS, db_path) == ["Alpha", "abc"]
+        assert completion.read_names(completion.SNAPSHOTS, db_path) == ["before-upgrade", "nightly"]
+
+        db.delete_snapshot(snapshot.id)
+        db.replace_installation_status([])
+
+        assert completion.read_names(completion.PLUGINS, db_path) == []
+        assert completion.read_names(completion.SNAPSHOTS, db_path) == ["nightly"]
+
+    def test_in_memory_database_has_no_cache(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        db = SourceDatabase("sqlite://")
+
+        db.create_snapshot("nightly")
+
+        assert db.completion_db_path is None
+        assert list(tmp_path.iterdir()) == []
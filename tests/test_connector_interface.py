@@ -2,7 +2,7 @@
 
 from datetime import datetime
 
-from papermc_plugin_manager.connector_interface import FileInfo, ProjectInfo
+from papermc_plugin_manager.connector_interface import FileInfo, LazyVersionMap, ProjectInfo, VersionMap
 
 
 class TestProjectInfoGetLatestType:
@@ -408,3 +408,131 @@ class TestProjectInfoGetLatestType:
             versions={"v1": v1, "v2": v2},
         )
         assert project.get_latest_type() == v2
+
+
+def _file(version_id, version_name, version_type="RELEASE", day=1):
+    return FileInfo(
+        version_id=version_id,
+        project_id="test-project",
+        version_name=version_name,
+        version_type=version_type,
+        release_date=datetime(2025, 1, day),
+        game_versions=["1.21"],
+        sha1=f"sha-{version_id}",
+        url=f"https://example.com/{version_id}.jar",
+    )
+
+
+class TestVersionIndex:
+    """Tests for the memoized version lookups."""
+
+    def test_versions_are_wrapped(self):
+        project = ProjectInfo("test", "test-project", "Test Project", "Test Author", None, 0, versions={"v1": _file("v1", "1.0.0")})
+        assert isinstance(project.versions, VersionMap)
+        assert project.versions == {"v1": _file("v1", "1.0.0")}
+
+    def test_parsed_version_follows_version_name(self):
+        file_info = _file("v1", "v1.2.3")
+        assert str(file_info.parsed_version) == "1.2.3"
+        file_info.version_name = "2.0.0"
+        assert str(file_info.parsed_version) == "2.0.0"
+        file_info.version_name = "no digits"
+        assert file_info.parsed_version is None
+
+    def test_lookups_see_new_versions(self):
+        project = ProjectInfo("test", "test-project", "Test Project", "Test Author", None, 0)
+        project.versions["v1"] = _file("v1", "1.0.0")
+        project.current_version = project.versions["v1"]
+        assert project.is_out_dated() is None
+
+        project.versions.setdefault("v2", _file("v2", "1.1.0", day=2))
+        assert project.is_out_dated() == project.versions["v2"]
+        assert project.get_latest() == project.versions["v2"]
+
+        del project.versions["v2"]
+        assert project.get_latest() == project.versions["v1"]
+
+    def test_lookups_by_type(self):
+        project = ProjectInfo("test", "test-project", "Test Project", "Test Author", None, 0, versions={
+            "v1": _file("v1", "1.0.0"),
+            "v2": _file("v2", "1.1.0-beta", "BETA", day=2),
+            "v3": _file("v3", "1.2.0-alpha", "ALPHA", day=3),
+        })
+        assert project.get_latest_type("release").version_id == "v1"
+        assert project.get_latest_type("BETA").version_id == "v2"
+        assert project.get_latest_type_weighted("BETA").version_id == "v2"
+        assert project.get_latest_type_weighted("ALPHA").version_id == "v3"
+        assert project.versions.by_type().keys() == {"release", "beta", "alpha"}
+
+
+class TestGetVersion:
+    """Tests for ProjectInfo.get_version lookups."""
+
+    def test_by_name_id_and_sha1(self):
+        project = ProjectInfo("test", "test-project", "Test Project", "Test Author", None, 0, versions={
+            "v1": _file("v1", "1.0.0"),
+            "v2": _file("v2", "1.1.0", day=2),
+        })
+        assert project.get_version("1.1.0").version_id == "v2"
+        assert project.get_version("v1").version_name == "1.0.0"
+        assert project.get_version("2.0.0") is None
+        assert project.get_version_by_sha1("sha-v2").version_id == "v2"
+
+    def test_first_match_in_insertion_order_wins(self):
+        # a version name that equals another version's ID
+        project = ProjectInfo("test", "test-project", "Test Project", "Test Author", None, 0, versions={
+            "v1": _file("v1", "v2"),
+            "v2": _file("v2", "2.0.0", day=2),
+        })
+        assert project.get_version("v2").version_id == "v1"
+
+    def test_index_follows_changes(self):
+        project = ProjectInfo("test", "test-project", "Test Project", "Test Author", None, 0)
+        assert project.get_version("1.0.0") is None
+        project.versions["v1"] = _file("v1", "1.0.0")
+        assert project.get_version("1.0.0").version_id == "v1"
+        project.versions["v1"] = _file("v1", "1.0.1")
+        assert project.get_version("1.0.0") is None
+        assert project.get_version_by_sha1("sha-v1").version_name == "1.0.1"
+
+
+class TestLazyVersionMap:
+    """Tests for LazyVersionMap."""
+
+    def _lazy_project(self, loads):
+        all_versions = {"v1": _file("v1", "1.0.0"), "v2": _file("v2", "1.1.0", "BETA", day=2)}
+        lookups = ProjectInfo("test", "test-project", "Test Project", "Test Author", None, 0, versions=all_versions).precomputed_lookups()
+
+        def loader():
+            loads.append(1)
+            return all_versions
+
+        versions = LazyVersionMap({"v1": all_versions["v1"]}, lookups, loader)
+        return ProjectInfo("test", "test-project", "Test Project", "Test Author", None, 0, versions=versions)
+
+    def test_precomputed_lookups_do_not_load(self):
+        loads = []
+        project = self._lazy_project(loads)
+        project.current_version = project.versions["v1"]
+        project.installation_type = "BETA"
+
+        assert project.is_out_dated().version_id == "v2"
+        assert project.get_latest_type("release").version_id == "v1"
+        assert project.get_latest().version_id == "v2"
+        assert loads == []
+        assert not project.versions.loaded
+
+    def test_other_access_loads_everything_once(self):
+        loads = []
+        project = self._lazy_project(loads)
+
+        assert project.get_version("1.1.0").version_id == "v2"
+        assert len(project.versions) == 2
+        assert "v2" in project.versions
+        assert loads == [1]
+
+    def test_missing_key_loads(self):
+        loads = []
+        project = self._lazy_project(loads)
+        assert project.versions["v2"].version_name == "1.1.0"
+        assert loads == [1]
@@ -0,0 +1,361 @@
+"""Unit tests for database module."""
+
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+from papermc_plugin_manager.connector_interface import FileDependency, FileInfo, ProjectInfo
+from papermc_plugin_manager.database import SCHEMA_VERSION, Base, SourceDatabase
+from papermc_plugin_manager.exceptions import SchemaVersionException
+
+
+@pytest.fixture
+def db(tmp_path):
+    return SourceDatabase(f"sqlite:///{tmp_path / 'ppm.db'}")
+
+
+def _project(*versions: tuple[str, str]) -> ProjectInfo:
+    project = ProjectInfo("test", "test-project", "Test Project", "Test Author", None, 0)
+    for day, (version_id, version_name) in enumerate(versions, start=1):
+        project.versions[version_id] = FileInfo(
+            version_id, "test-project", version_name, "RELEASE", datetime(2025, 1, day), ["1.21"],
+            f"sha-{version_id}", f"https://example.com/{version_id}.jar", hashes={"sha1": f"sha-{version_id}"},
+        )
+    return project
+
+
+class TestGetFileInfo:
+    """Tests for SourceDatabase.get_file_info."""
+
+    def test_by_version_id_and_name(self, db):
+        db.save_project_info(_project(("v1", "1.0.0"), ("v2", "1.1.0")))
+
+        assert db.get_file_info("test-project", "v2").version_name == "1.1.0"
+        by_name = db.get_file_info("Test Project", "1.0.0")
+        assert by_name.version_id == "v1"
+        assert by_name.hashes == {"sha1": "sha-v1"}
+
+    def test_single_query_with_all_hashes(self, db):
+        from sqlalchemy import event
+
+        project = _project(("v1", "1.0.0"))
+        project.slug = "test-slug"
+        project.versions["v1"].hashes["sha512"] = "digest"
+        db.save_project_info(project)
+        statements = []
+        event.listen(db.engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+        file_info = db.get_file_info("test-slug", "v1")
+
+        assert file_info.hashes == {"sha1": "sha-v1", "sha512": "digest"}
+        assert len(statements) == 1
+
+    def test_project_id_wins_over_name(self, db):
+        db.save_project_info(_project(("v1", "1.0.0")))
+        # another project named like the first one's ID
+        other = ProjectInfo("test", "other-project", "test-project", "Test Author", None, 0)
+        other.versions["o1"] = FileInfo(
+            "o1", "other-project", "1.0.0", "RELEASE", datetime(2025, 1, 1), ["1.21"], "sha-o1", "https://example.com/o1.jar",
+        )
+        db.save_project_info(other)
+
+        assert db.get_file_info("test-project", "1.0.0").version_id == "v1"
+        assert db.get_file_info("other-project", "1.0.0").version_id == "o1"
+
+    def test_missing(self, db):
+        db.save_project_info(_project(("v1", "1.0.0")))
+
+        assert db.get_file_info("test-project", "2.0.0") is None
+        assert db.get_file_info("other-project", "1.0.0") is None
+
+
+class TestHotLookups:
+    """Tests for the Core lookups that skip the ORM."""
+
+    def test_file_lookups(self, db):
+        db.save_project_info(_project(("v1", "1.0.0"), ("v2", "1.1.0")))
+
+        by_sha1 = db.get_file_by_sha1("sha-v2")
+        assert (by_sha1.version_id, by_sha1.version_name, by_sha1.game_versions) == ("v2", "1.1.0", ("1.21",))
+        assert by_sha1.hashes == {"sha1": "sha-v2"}
+        assert db.get_file_by_sha1("sha-v2", with_hashes=False).hashes == {}
+        assert db.get_file_by_version_id("v1").sha1 == "sha-v1"
+        assert db.get_file_by_sha1("missing") is None
+        assert db.get_file_by_version_id("missing") is None
+
+    def test_installation_lookups(self, db):
+        db.save_installation_info("a.jar", "sha-a", 10, "BETA")
+
+        assert db.is_sha1_known("sha-a")
+        assert not db.is_sha1_known("sha-b")
+        installation = db.get_installation_by_sha1("sha-a")
+        assert (installation.filename, installation.filesize, installation.installation_type) == ("a.jar", 10, "BETA")
+        assert db.get_installation_by_sha1("sha-b") is None
+
+
+class TestFileDescription:
+    """Tests for the deferred changelog column."""
+
+    def test_description_is_loaded_on_demand(self, db):
+        project = _project(("v1", "1.0.0"))
+        project.versions["v1"].description = "changelog"
+        db.save_project_info(project)
+
+        assert db.get_project_info("test-project").versions["v1"].description == ""
+        assert db.get_file_description("sha-v1") == "changelog"
+
+    def test_saving_without_description_keeps_it(self, db):
+        project = _project(("v1", "1.0.0"))
+        project.versions["v1"].description = "changelog"
+        db.save_project_info(project)
+
+        db.save_project_info(_project(("v1", "1.0.0")))
+
+        assert db.get_file_description("sha-v1") == "changelog"
+
+
+class TestLazyProjectInfo:
+    """Tests for loading projects with lazy versions."""
+
+    def test_lazy_project_answers_latest_without_loading(self, db):
+        project = _project(("v1", "1.0.0"), ("v2", "1.1.0"), ("v3", "1.2.0"))
+        db.save_project_info(project)
+        db.save_installation_info("test.jar", "sha-v1", 1, "RELEASE")
+
+        lazy = db.get_project_info("test-project", lazy=True)
+
+        assert lazy.current_version.version_id == "v1"
+        assert lazy.is_out_dated().version_id == "v3"
+        assert lazy.is_out_dated().hashes == {"sha1": "sha-v3"}
+        assert not lazy.versions.loaded
+        assert list(lazy.versions) == ["v1", "v2", "v3"]
+
+    def test_latest_versions_follow_saves(self, db):
+        db.save_project_info(_project(("v1", "1.0.0")))
+        db.save_project_info(_project(("v1", "1.0.0"), ("v2", "1.1.0")))
+
+        assert db.get_project_info("test-project", lazy=True).get_latest().version_id == "v2"
+
+    def test_saves_rank_versions_in_memory(self, db, monkeypatch):
+        db.save_project_info(_project(("v1", "1.0.0"), ("v2", "1.1.0"), ("v3", "1.2.0")))
+        loaded = []
+        load_versions = db.load_versions
+        monkeypatch.setattr(db, "load_versions", lambda *args, **kwargs: loaded.append(args) or load_versions(*args, **kwargs))
+
+        # a version list filtered by game version that no longer includes the latest version
+        db.save_project_info(_project(("v1", "1.0.0"), ("v2", "1.1.0")))
+        # only the previous latest version is read back
+        assert loaded == [("test-project", {"sha-v3"})]
+        db.save_project_info(_project(("v3", "1.2.0"), ("v4", "1.3.0")))
+        assert loaded == [("test-project", {"sha-v3"})]
+        assert db.get_project_info("test-project", lazy=True).get_latest().version_id == "v4"
+
+        loaded.clear()
+        renamed = _project(("v4", "1.3.0"))
+        renamed.versions["v4"].version_type = "BETA"
+        db.save_project_info(renamed)
+        assert db.get_project_info("test-project", lazy=True).get_latest_type("release").version_id == "v3"
+        # a changed release type can move any of the stored latest versions
+        assert loaded[0] == ("test-project",)
+
+    def test_missing_lookups_are_backfilled(self, db):
+        from sqlalchemy import delete
+        from sqlalchemy.orm import Session
+
+        from papermc_plugin_manager.database import LatestVersionTable
+
+        db.save_project_info(_project(("v1", "1.0.0"), ("v2", "1.1.0")))
+        with Session(db.engine) as session:
+            session.execute(delete(LatestVersionTable))
+            session.commit()
+
+        assert db.get_project_info("test-project", lazy=True).get_latest().version_id == "v2"
+        with Session(db.engine) as session:
+            assert session.query(LatestVersionTable).count() > 0
+
+    def test_eager_project_has_hashes(self, db):
+        db.save_project_info(_project(("v1", "1.0.0"), ("v2", "1.1.0")))
+        assert db.get_project_info("test-project").versions["v2"].hashes == {"sha1": "sha-v2"}
+
+
+class TestGameVersionIndex:
+    """Tests for the per-game-version index of stored files."""
+
+    def _save(self, db):
+        project = _project(("v1", "1.0.0"), ("v2", "1.1.0"), ("v3", "1.2.0"))
+        project.versions["v1"].game_versions = ["1.20.4"]
+        project.versions["v2"].game_versions = ["1.21.1", "1.21.3"]
+        project.versions["v3"].game_versions = ["1.21.3", "1.21.4"]
+        db.save_project_info(project)
+
+    def test_exact_and_minor_matches(self, db):
+        self._save(db)
+
+        files = db.get_files_for_game_version(["test-project"], "1.21.4")
+        assert [file.version_id for file in files] == ["v2", "v3"]
+        assert db.get_files_for_game_version(["test-project"], "1.19.2") == []
+        assert db.get_files_for_game_version(["other-project"], "1.21.4") == []
+
+    def test_changed_game_versions_are_reindexed(self, db):
+        self._save(db)
+        project = db.get_project_info("test-project")
+        project.versions["v1"].game_versions = ["1.21.4"]
+        db.save_project_info(project)
+
+        files = db.get_files_for_game_version(["test-project"], "1.21.4")
+        assert [file.version_id for file in files] == ["v1", "v2", "v3"]
+        assert db.get_files_for_game_version(["test-project"], "1.20.4") == []
+
+    def test_unindexed_files_are_backfilled(self, db):
+        from sqlalchemy import delete
+        from sqlalchemy.orm import Session
+
+        from papermc_plugin_manager.database import FileGameVersionTable
+
+        self._save(db)
+        with Session(db.engine) as session:
+            session.execute(delete(FileGameVersionTable))
+            session.commit()
+
+        db.index_game_versions(["test-project"])
+        assert [file.version_id for file in db.get_files_for_game_version(["test-project"], "1.21.4")] == ["v2", "v3"]
+
+
+class TestFileDependencies:
+    """Tests for the stored dependencies of files."""
+
+    def test_dependencies_round_trip(self, db):
+        project = _project(("v1", "1.0.0"), ("v2", "1.1.0"))
+        project.versions["v1"].dependencies = (FileDependency("REQUIRED", "lib"), FileDependency("OPTIONAL", None, "x1"))
+        project.versions["v2"].dependencies = ()
+        db.save_project_info(project)
+
+        dependencies = db.get_file_dependencies(["sha-v1", "sha-v2", "sha-unknown"])
+        assert dependencies["sha-v1"] == (FileDependency("REQUIRED", "lib"), FileDependency("OPTIONAL", None, "x1"))
+        assert dependencies["sha-v2"] == ()
+        assert dependencies["sha-unknown"] == ()
+
+    def test_changed_dependencies_replace_stored_ones(self, db):
+        project = _project(("v1", "1.0.0"))
+        project.versions["v1"].dependencies = (FileDependency("REQUIRED", "lib"),)
+        db.save_project_info(project)
+
+        db.save_project_info(_project(("v1", "1.0.0")))
+        assert db.get_file_dependencies(["sha-v1"])["sha-v1"] == (FileDependency("REQUIRED", "lib"),)
+
+        project.versions["v1"].dependencies = (FileDependency("REQUIRED", "other"),)
+        db.save_project_info(project)
+        assert db.get_file_dependencies(["sha-v1"])["sha-v1"] == (FileDependency("REQUIRED", "other"),)
+
+
+class TestInstallationStatus:
+    """Tests for the installation status table."""
+
+    def test_replace_and_read(self, db):
+        from papermc_plugin_manager.database import InstallationStatusTable
+
+        db.replace_installation_status([
+            InstallationStatusTable(filename="a.jar", sha1="sha-a", filesize=1, mtime_ns=10, project_id="a", name="A"),
+            InstallationStatusTable(filename="b.jar", sha1="sha-b", filesize=2, mtime_ns=20),
+        ])
+        db.replace_installation_status(db.get_installation_status()[:1])
+
+        rows = db.get_installation_status()
+        assert [(row.filename, row.recognized, row.outdated, row.compatibility) for row in rows] == [("a.jar", True, False, -1)]
+
+
+class TestProjectSearch:
+    """Tests for the full-text index over the stored projects."""
+
+    def _save(self, db, project_id, name, slug, description, downloads=0):
+        db.save_project_info(ProjectInfo("Modrinth", project_id, name, "author", description, downloads, slug=slug))
+
+    def test_prefix_match_ranks_name_over_description(self, db):
+        self._save(db, "p1", "EssentialsX", "essentialsx", "Good luck finding a better essentials plugin")
+        self._save(db, "p2", "LuckPerms", "luckperms", "A permissions plugin")
+
+        results = db.search_projects("luck")
+
+        assert [result.project_id for result in results] == ["p2", "p1"]
+        assert results[0].project_name == "LuckPerms"
+        assert results[0].source == "Modrinth"
+
+    def test_every_word_must_match(self, db):
+        self._save(db, "p1", "World Edit", "worldedit", "In-game map editor")
+        self._save(db, "p2", "World Guard", "worldguard", "Protect regions")
+
+        assert [result.project_id for result in db.search_projects("wor edi")] == ["p1"]
+        assert db.search_projects("") == []
+        assert db.search_projects("***") == []
+
+    def test_index_follows_saves(self, db):
+        self._save(db, "p1", "Old Name", "old-name", None)
+        self._save(db, "p1", "New Name", None, "renamed")
+
+        assert db.search_projects("old")[0].project_id == "p1"  # the slug is kept
+        assert db.search_projects("new")[0].project_name == "New Name"
+        assert db.get_project_table_by_id("p1").description == "renamed"
+
+    def test_lookup_by_slug(self, db):
+        self._save(db, "AbC123", "LuckPerms", "luckperms", None)
+
+        assert db.get_project_info("luckperms").project_id == "AbC123"
+        assert db.get_project_info("luckperms").slug == "luckperms"
+
+
+class TestSchemaMigrations:
+    """Tests for the versioned schema."""
+
+    def _user_version(self, path) -> int:
+        with sqlite3.connect(path) as connection:
+            return connection.execute("PRAGMA user_version").fetchone()[0]
+
+    def test_new_database_is_current(self, tmp_path):
+        path = tmp_path / "ppm.db"
+        SourceDatabase(f"sqlite:///{path}").get_all_installations()
+
+        assert self._user_version(path) == SCHEMA_VERSION
+
+    def test_current_database_skips_ddl(self, tmp_path, monkeypatch):
+        path = tmp_path / "ppm.db"
+        SourceDatabase(f"sqlite:///{path}").get_all_installations()
+
+        def fail(*args, **kwargs):
+            raise AssertionError("create_all called on a current database")
+
+        monkeypatch.setattr(Base.metadata, "create_all", fail)
+        assert SourceDatabase(f"sqlite:///{path}").get_all_installations() == []
+
+    def test_unversioned_database_is_migrated(self, tmp_path):
+        path = tmp_path / "ppm.db"
+        with sqlite3.connect(path) as connection:
+            connection.executescript("""
+                CREATE TABLE project (id INTEGER PRIMARY KEY, source VARCHAR, project_id VARCHAR, name VARCHAR,
+                    author VARCHAR, description TEXT, downloads INTEGER);
+                CREATE INDEX ix_project_project_id ON project (project_id);
+                CREATE TABLE file_hash (id INTEGER PRIMARY KEY, sha1 VARCHAR, hash_type VARCHAR, hash_digest VARCHAR);
+                INSERT INTO project VALUES (1, 'test', 'p1', 'Old Name', 'a', NULL, 0);
+                INSERT INTO project VALUES (2, 'test', 'p1', 'New Name', 'a', NULL, 0);
+                INSERT INTO file_hash VALUES (1, 'abc', 'sha1', 'abc');
+                INSERT INTO file_hash VALUES (2, 'abc', 'sha1', 'abc');
+            """)
+
+        db = SourceDatabase(f"sqlite:///{path}")
+
+        assert db.get_project_table_by_id("p1").name == "New Name"
+        assert [result.project_id for result in db.search_projects("new")] == ["p1"]
+        assert db.get_installation_status() == []
+        assert self._user_version(path) == SCHEMA_VERSION
+        with sqlite3.connect(path) as connection:
+            assert connection.execute("SELECT COUNT(*) FROM file_hash").fetchone()[0] == 1
+            with pytest.raises(sqlite3.IntegrityError):
+                connection.execute("INSERT INTO project (source, project_id, name, author, downloads) VALUES ('t', 'p1', 'x', 'a', 0)")
+
+    def test_newer_database_is_refused(self, tmp_path):
+        path = tmp_path / "ppm.db"
+        with sqlite3.connect(path) as connection:
+            connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION + 1}")
+
+        with pytest.raises(SchemaVersionException):
+            SourceDatabase(f"sqlite:///{path}").get_all_installations()
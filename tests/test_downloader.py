@@ -0,0 +1,173 @@
+"""Unit tests for the download engine."""
+
+import hashlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from papermc_plugin_manager.downloader import DownloadEngine, DownloadJob, RetryPolicy
+from papermc_plugin_manager.exceptions import DownloadFailedException
+from papermc_plugin_manager.jar_cache import JarCache
+
+FILES = {
+    "/a.jar": b"a" * 50_000,
+    "/b.jar": b"b" * 20_000,
+    "/flaky.jar": bytes(range(256)) * 400,
+}
+ETAG = '"v1"'
+# paths that drop the connection halfway through their next response
+DROP_ONCE: set[str] = set()
+# (path, Range header) of every request served
+REQUESTS: list[tuple[str, str | None]] = []
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = FILES.get(self.path)
+        if body is None:
+            self.send_error(404)
+            return
+        REQUESTS.append((self.path, self.headers.get("Range")))
+        start = 0
+        if self.headers.get("Range") and self.headers.get("If-Range") == ETAG:
+            start = int(self.headers["Range"].removeprefix("bytes=").split("-")[0])
+        payload = body[start:]
+        if start:
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{len(body) - 1}/{len(body)}")
+        else:
+            self.send_response(200)
+        self.send_header("ETag", ETAG)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        if self.path in DROP_ONCE:
+            DROP_ONCE.discard(self.path)
+            self.wfile.write(payload[: len(payload) // 2])
+            self.close_connection = True
+            return
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+class TestDownloadEngine:
+    """Tests for DownloadEngine.run."""
+
+    def test_downloads_all_jobs(self, server_url, tmp_path):
+        jobs = [DownloadJob(f"{server_url}{path}", tmp_path / path[1:], path[1:]) for path in ("/a.jar", "/b.jar")]
+        progress = {}
+
+        results = DownloadEngine(max_workers=2, max_per_host=1).run(
+            jobs, lambda job, done, total: progress.__setitem__(job.label, (done, total))
+        )
+
+        assert [r.ok for r in results] == [True, True]
+        for job, result in zip(jobs, results, strict=True):
+            expected = FILES["/" + job.label]
+            assert result.job is job
+            assert result.size == len(expected)
+            assert job.dest.read_bytes() == expected
+            assert progress[job.label] == (len(expected), len(expected))
+
+    def test_failed_job_does_not_stop_others(self, server_url, tmp_path):
+        jobs = [
+            DownloadJob(f"{server_url}/missing.jar", tmp_path / "missing.jar", "missing.jar"),
+            DownloadJob(f"{server_url}/a.jar", tmp_path / "a.jar", "a.jar"),
+        ]
+
+        results = DownloadEngine().run(jobs)
+
+        assert not results[0].ok
+        assert results[1].ok
+        assert (tmp_path / "a.jar").read_bytes() == FILES["/a.jar"]
+
+    def test_hashes_are_computed_while_streaming(self, server_url, tmp_path):
+        body = FILES["/a.jar"]
+        job = DownloadJob(f"{server_url}/a.jar", tmp_path / "a.jar", "a.jar", {"sha1": hashlib.sha1(body).hexdigest()})
+
+        (result,) = DownloadEngine().run([job])
+
+        assert result.ok
+        assert result.hashes == {"sha1": hashlib.sha1(body).hexdigest(), "sha512": hashlib.sha512(body).hexdigest()}
+        assert not (tmp_path / "a.jar.part").exists()
+
+    def test_hash_mismatch_leaves_nothing_behind(self, server_url, tmp_path):
+        job = DownloadJob(f"{server_url}/a.jar", tmp_path / "a.jar", "a.jar", {"sha1": "0" * 40})
+
+        (result,) = DownloadEngine().run([job])
+
+        assert isinstance(result.error, DownloadFailedException)
+        assert "sha1 mismatch" in str(result.error)
+        assert list(tmp_path.iterdir()) == []
+
+    def test_no_jobs(self):
+        assert DownloadEngine().run([]) == []
+
+    def test_cache_hit_skips_network(self, server_url, tmp_path):
+        body = FILES["/a.jar"]
+        sha1 = hashlib.sha1(body).hexdigest()
+        engine = DownloadEngine(cache=JarCache(tmp_path / "cache"))
+        (first,) = engine.run([DownloadJob(f"{server_url}/a.jar", tmp_path / "first.jar", "a.jar", {"sha1": sha1})])
+        REQUESTS.clear()
+
+        (second,) = engine.run([DownloadJob(f"{server_url}/a.jar", tmp_path / "second.jar", "a.jar", {"sha1": sha1})])
+
+        assert first.ok and second.ok
+        assert REQUESTS == []
+        assert second.hashes == first.hashes
+        assert (tmp_path / "second.jar").read_bytes() == body
+
+
+class TestResume:
+    """Tests for resuming interrupted downloads."""
+
+    def test_interrupted_download_resumes_with_range(self, server_url, tmp_path):
+        body = FILES["/flaky.jar"]
+        REQUESTS.clear()
+        DROP_ONCE.add("/flaky.jar")
+        job = DownloadJob(f"{server_url}/flaky.jar", tmp_path / "flaky.jar", "flaky.jar", {"sha1": hashlib.sha1(body).hexdigest()})
+
+        (result,) = DownloadEngine(retry_policy=RetryPolicy(backoff=0)).run([job])
+
+        assert result.ok, result.error
+        assert result.size == len(body)
+        assert (tmp_path / "flaky.jar").read_bytes() == body
+        assert [path for path, _ in REQUESTS] == ["/flaky.jar", "/flaky.jar"]
+        assert REQUESTS[0][1] is None
+        resumed_at = int(REQUESTS[1][1].removeprefix("bytes=").rstrip("-"))
+        assert 0 < resumed_at < len(body)
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["flaky.jar"]
+
+    def test_partial_file_is_kept_when_attempts_run_out(self, server_url, tmp_path):
+        DROP_ONCE.add("/flaky.jar")
+        job = DownloadJob(f"{server_url}/flaky.jar", tmp_path / "flaky.jar", "flaky.jar")
+
+        (result,) = DownloadEngine(retry_policy=RetryPolicy(max_attempts=1)).run([job])
+
+        assert not result.ok
+        assert 0 < (tmp_path / "flaky.jar.part").stat().st_size < len(FILES["/flaky.jar"])
+        assert (tmp_path / "flaky.jar.part.json").exists()
+        assert not (tmp_path / "flaky.jar").exists()
+
+    def test_stale_partial_file_restarts_from_zero(self, server_url, tmp_path):
+        body = FILES["/a.jar"]
+        (tmp_path / "a.jar.part").write_bytes(b"stale")
+        (tmp_path / "a.jar.part.json").write_text(json.dumps({"url": f"{server_url}/a.jar", "etag": '"old"'}))
+        job = DownloadJob(f"{server_url}/a.jar", tmp_path / "a.jar", "a.jar", {"sha1": hashlib.sha1(body).hexdigest()})
+
+        (result,) = DownloadEngine().run([job])
+
+        assert result.ok, result.error
+        assert (tmp_path / "a.jar").read_bytes() == body
@@ -0,0 +1,54 @@
+"""Unit tests for game_versions module."""
+
+from datetime import datetime
+
+from papermc_plugin_manager.connector_interface import FileInfo
+from papermc_plugin_manager.game_versions import compatibility_score, intern_game_versions, version_mask
+
+
+class TestInternGameVersions:
+    """Tests for intern_game_versions."""
+
+    def test_equal_lists_share_one_tuple(self):
+        first = intern_game_versions(["1.21.3", "1.21.4"])
+        second = intern_game_versions(["1.21.3", "".join(["1.21.", "4"])])
+        assert first == ("1.21.3", "1.21.4")
+        assert first is second
+        assert second[1] is first[1]
+
+    def test_empty(self):
+        assert intern_game_versions(None) == ()
+        assert intern_game_versions([]) is intern_game_versions(())
+
+    def test_file_info_interns_on_creation(self):
+        files = [
+            FileInfo(f"v{i}", "p", "1.0.0", "RELEASE", datetime(2025, 1, 1), ["1.21.4"], f"sha{i}", "")
+            for i in range(2)
+        ]
+        assert files[0].game_versions is files[1].game_versions
+        assert not hasattr(files[0], "__dict__")
+
+
+class TestCompatibilityScore:
+    """Tests for compatibility_score."""
+
+    def test_scores(self):
+        assert compatibility_score(["1.21.3", "1.21.4"], "1.21.4") == 3
+        assert compatibility_score(["1.21.3"], "1.21.4") == 2
+        assert compatibility_score(["1.20.6"], "1.21.4") == 0
+        assert compatibility_score(["1.21"], "1.21") == 2
+        assert compatibility_score(["1.21.4.1"], "1.21.4") == 3
+        assert compatibility_score([], "1.21.4") == -1
+        assert compatibility_score(["1.21.4"], None) == -1
+
+    def test_versions_seen_after_the_server_masks(self):
+        server = "7.1.2"
+        assert compatibility_score(["7.0.0"], server) == 0
+        # new game versions must still match a server version whose masks were already built
+        assert compatibility_score(["7.1.5"], server) == 2
+        assert compatibility_score(["7.1.2", "7.1.9"], server) == 3
+
+    def test_version_mask(self):
+        both = version_mask(["8.0.1", "8.0.2"])
+        assert both == version_mask(["8.0.1"]) | version_mask(["8.0.2"])
+        assert version_mask(["8.0.1"]) & version_mask(["8.0.2"]) == 0
@@ -0,0 +1,70 @@
+"""Unit tests for the jar cache."""
+
+import hashlib
+import os
+
+from papermc_plugin_manager.jar_cache import JarCache
+
+
+def _jar(tmp_path, name, content):
+    path = tmp_path / name
+    path.write_bytes(content)
+    return path, hashlib.sha1(content).hexdigest()
+
+
+class TestJarCache:
+    """Tests for JarCache."""
+
+    def test_put_and_copy_to(self, tmp_path):
+        cache = JarCache(tmp_path / "cache")
+        src, sha1 = _jar(tmp_path, "a.jar", b"a" * 100)
+
+        cache.put(sha1, src)
+        size, hashes = cache.copy_to(sha1, tmp_path / "copy.jar")
+
+        assert src.exists()
+        assert size == 100
+        assert hashes["sha1"] == sha1
+        assert (tmp_path / "copy.jar").read_bytes() == b"a" * 100
+        assert not (tmp_path / "copy.jar.part").exists()
+
+    def test_put_move(self, tmp_path):
+        cache = JarCache(tmp_path / "cache")
+        src, sha1 = _jar(tmp_path, "a.jar", b"a")
+
+        path = cache.put(sha1, src, move=True)
+
+        assert not src.exists()
+        assert path.read_bytes() == b"a"
+
+    def test_miss(self, tmp_path):
+        cache = JarCache(tmp_path / "cache")
+        assert cache.get("0" * 40) is None
+        assert cache.copy_to("0" * 40, tmp_path / "x.jar") is None
+
+    def test_corrupt_entry_is_dropped(self, tmp_path):
+        cache = JarCache(tmp_path / "cache")
+        src, sha1 = _jar(tmp_path, "a.jar", b"a")
+        cache.put(sha1, src).write_bytes(b"tampered")
+
+        assert cache.copy_to(sha1, tmp_path / "x.jar") is None
+        assert cache.get(sha1) is None
+        assert not (tmp_path / "x.jar").exists()
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        cache = JarCache(tmp_path / "cache", max_bytes=300)
+        entries = [_jar(tmp_path, f"{i}.jar", bytes([i]) * 100) for i in range(3)]
+        for age, (src, sha1) in enumerate(entries):
+            path = cache.put(sha1, src)
+            os.utime(path, (1000 + age, 1000 + age))
+        # touching the oldest entry makes the second one the eviction candidate
+        cache.get(entries[0][1])
+
+        src, sha1 = _jar(tmp_path, "3.jar", b"3" * 100)
+        cache.put(sha1, src)
+
+        assert cache.get(entries[0][1]) is not None
+        assert cache.get(entries[1][1]) is None
+        assert cache.get(entries[2][1]) is not None
+        assert cache.get(sha1) is not None
+        assert cache.size() == 300
@@ -0,0 +1,66 @@
+"""Unit tests for the lockfile."""
+
+import json
+from datetime import datetime
+
+import pytest
+
+from papermc_plugin_manager.connector_interface import FileInfo, ProjectInfo
+from papermc_plugin_manager.exceptions import LockfileException
+from papermc_plugin_manager.lockfile import LockedPlugin, Lockfile
+
+
+@pytest.fixture
+def locked():
+    project = ProjectInfo("Modrinth", "proj", "Proj", "author", None, 5, installation_type="BETA")
+    file_info = FileInfo(
+        "ver", "proj", "1.2.0", "BETA", datetime(2025, 1, 2, 3, 4), ["1.21.4"], "a" * 40,
+        "https://cdn.example/proj.jar", hashes={"sha1": "a" * 40, "sha512": "b" * 128},
+    )
+    return LockedPlugin.from_project(project, file_info)
+
+
+class TestLockfile:
+    """Tests for Lockfile reading and writing."""
+
+    def test_round_trip(self, tmp_path, locked):
+        path = tmp_path / "ppm.lock"
+        Lockfile(plugins=[locked], game_version="1.21.4").write(path)
+
+        lockfile = Lockfile.read(path)
+
+        assert lockfile.game_version == "1.21.4"
+        assert lockfile.plugins == [locked]
+        assert not (tmp_path / "ppm.lock.tmp").exists()
+
+    def test_plugins_are_sorted(self, tmp_path, locked):
+        other = LockedPlugin(**{**locked.__dict__, "project_id": "aaa"})
+        path = tmp_path / "ppm.lock"
+        Lockfile(plugins=[locked, other]).write(path)
+
+        assert [p["project_id"] for p in json.loads(path.read_text())["plugins"]] == ["aaa", "proj"]
+
+    def test_to_file_info(self, locked):
+        file_info = locked.to_file_info()
+        assert file_info.url == "https://cdn.example/proj.jar"
+        assert file_info.hashes["sha512"] == "b" * 128
+        assert locked.to_project_info().installation_type == "BETA"
+
+    def test_unsupported_version(self, tmp_path):
+        path = tmp_path / "ppm.lock"
+        path.write_text(json.dumps({"version": 99, "plugins": []}))
+        with pytest.raises(LockfileException, match="unsupported version"):
+            Lockfile.read(path)
+
+    def test_bad_entry(self, tmp_path):
+        path = tmp_path / "ppm.lock"
+        path.write_text(json.dumps({"version": 1, "plugins": [{"project_id": "proj"}]}))
+        with pytest.raises(LockfileException, match="proj"):
+            Lockfile.read(path)
+
+    @pytest.mark.parametrize("data", [[], "ppm", {"version": 1, "plugins": {"proj": {}}}, {"version": 1, "plugins": ["proj"]}])
+    def test_wrong_json_types(self, tmp_path, data):
+        path = tmp_path / "ppm.lock"
+        path.write_text(json.dumps(data))
+        with pytest.raises(LockfileException):
+            Lockfile.read(path)
@@ -13,6 +13,7 @@ import pytest
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from papermc_plugin_manager.connectors.modrinth_models import (
+    DependencyType,
     ModrinthAPIConfig,
     Project,
     ProjectStatus,
@@ -21,6 +22,7 @@ from papermc_plugin_manager.connectors.modrinth_models import (
     SearchResponse,
     TeamMember,
     Version,
+    VersionSummary,
     VersionType,
 )
 
@@ -360,6 +362,48 @@ class TestVersion:
     # The Version model exposes `primary_file`; downloading behavior is covered elsewhere.
 
 
+# ============== VersionSummary Model Tests ==============
+
+class TestVersionSummary:
+    """Tests for the lean VersionSummary model."""
+
+    @patch.object(ModrinthAPIConfig, 'api_get_raw')
+    def test_list_for_project(self, mock_api_get_raw, sample_version_data):
+        """Test VersionSummary.list_for_project() validates raw JSON."""
+        mock_api_get_raw.return_value = json.dumps([sample_version_data, sample_version_data]).encode()
+
+        versions = VersionSummary.list_for_project("test_project", loaders=["paper"], game_versions=["1.20.1"])
+
+        assert len(versions) == 2
+        assert versions[0].id == "test_version_id"
+        assert versions[0].version_type == VersionType.RELEASE
+        assert versions[0].files[0].hashes.sha1 == "def456"
+        assert versions[0].game_versions == ["1.20.1", "1.20.2"]
+
+        path = mock_api_get_raw.call_args[0][0]
+        params = mock_api_get_raw.call_args[1]["params"]
+        assert path == "/project/test_project/version"
+        assert json.loads(params["loaders"]) == ["paper"]
+        assert json.loads(params["game_versions"]) == ["1.20.1"]
+
+    def test_changelog_is_not_kept(self, sample_version_data):
+        """Test that fields outside the summary are skipped."""
+        summary = VersionSummary(**sample_version_data)
+
+        assert not hasattr(summary, "changelog")
+
+    def test_dependencies_are_kept(self, sample_version_data):
+        """Test that dependencies are parsed for dependency resolution."""
+        sample_version_data["dependencies"] = [
+            {"project_id": "lib_id", "version_id": None, "file_name": None, "dependency_type": "required"},
+            {"project_id": None, "version_id": "pinned_id", "file_name": None, "dependency_type": "optional"},
+        ]
+        summary = VersionSummary(**sample_version_data)
+
+        assert [d.dependency_type for d in summary.dependencies] == [DependencyType.REQUIRED, DependencyType.OPTIONAL]
+        assert summary.dependencies[1].version_id == "pinned_id"
+
+
 # ============== Project Model Tests ==============
 
 class TestProject:
@@ -542,6 +586,18 @@ class TestTeamMember:
         assert all(isinstance(m, TeamMember) for m in members)
         mock_api_get.assert_called_once_with("/project/test_project/members")
 
+    @patch.object(ModrinthAPIConfig, 'api_get')
+    def test_list_for_teams(self, mock_api_get, sample_team_members_data):
+        """Test TeamMember.list_for_teams() batches teams into one request."""
+        mock_api_get.return_value = [sample_team_members_data, sample_team_members_data[1:]]
+
+        teams = TeamMember.list_for_teams(["team_id_1", "team_id_2"])
+
+        assert len(teams) == 2
+        assert [len(members) for members in teams] == [2, 1]
+        assert teams[0][0].is_owner is True
+        mock_api_get.assert_called_once_with("/teams", params={"ids": json.dumps(["team_id_1", "team_id_2"])})
+
 
 # ============== Integration Tests ==============
 
@@ -0,0 +1,522 @@
+"""Unit tests for PluginManager against in-memory sources and a temporary server directory."""
+
+import os
+import time
+from datetime import datetime
+
+import pytest
+
+from papermc_plugin_manager import plugin_manager as plugin_manager_module
+from papermc_plugin_manager.connector_interface import FileInfo, ProjectInfo, SearchResult
+from papermc_plugin_manager.exceptions import PluginNotFoundException
+from papermc_plugin_manager.jar_cache import JarCache
+from papermc_plugin_manager.lockfile import LockedPlugin, Lockfile
+from papermc_plugin_manager.plugin_manager import InstallStep, PluginManager
+from papermc_plugin_manager.staging import StagingArea
+from papermc_plugin_manager.utils import compute_sha1
+
+
+def _project(source: str, project_id: str, name: str, game_versions=("1.21.4",)) -> ProjectInfo:
+    project = ProjectInfo(source, project_id, name, "author", f"{name} description", 0, slug=project_id)
+    sha1 = f"{project_id}-sha1"
+    project.versions[f"{project_id}-v1"] = FileInfo(
+        f"{project_id}-v1", project_id, "1.0.0", "RELEASE", datetime(2025, 1, 1), list(game_versions),
+        sha1, f"https://cdn.example/{project_id}.jar", hashes={"sha1": sha1},
+    )
+    return project
+
+
+class FakeSource:
+    """Connector double that serves a fixed set of projects."""
+
+    def __init__(self, name: str, projects: list[ProjectInfo] = (), error: Exception | None = None, delay: float = 0):
+        self.name = name
+        self.projects = {project.project_id: project for project in projects}
+        self.error = error
+        self.delay = delay
+        self.queries: list[str] = []
+        # every request made to the source, by method name
+        self.calls: list[str] = []
+        # versions that are not in the version lists, e.g. ones for other game versions, by SHA1
+        self.files: dict[str, FileInfo] = {}
+
+    def _wait(self, call: str):
+        self.calls.append(call)
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+
+    def get_project_info(self, id: str, full_history: bool = False) -> ProjectInfo:
+        self._wait("get_project_info")
+        if id not in self.projects:
+            raise PluginNotFoundException(id)
+        return self.projects[id]
+
+    def get_file_info(self, id: str) -> FileInfo:
+        self._wait("get_file_info")
+        for project in self.projects.values():
+            for file_info in project.versions.values():
+                if id in (file_info.sha1, file_info.version_id):
+                    return file_info
+        if id in self.files:
+            return self.files[id]
+        raise PluginNotFoundException(id)
+
+    def prefetch(self, project_ids: list[str]):
+        pass
+
+    def get_download_link(self, file_info: FileInfo) -> str:
+        self._wait("get_download_link")
+        return file_info.url
+
+    def query(self, name: str, mc_version: str | None = None, limit: int = 5) -> list[SearchResult]:
+        self.queries.append(name)
+        self._wait("query")
+        return [
+            SearchResult(p.project_id, p.name, p.author, p.downloads, p.description or "", self.name)
+            for p in self.projects.values()
+            if name.lower() in p.name.lower()
+        ][:limit]
+
+
+@pytest.fixture
+def make_pm(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "plugins").mkdir()
+
+    def make(*sources: FakeSource, **kwargs) -> PluginManager:
+        pm = PluginManager(sources[0].name, "1.21.4", **kwargs)
+        pm._connectors = {source.name: source for source in sources}
+        return pm
+
+    return make
+
+
+@pytest.fixture
+def errors(monkeypatch):
+    logged = []
+    monkeypatch.setattr(plugin_manager_module.logger, "error", logged.append)
+    return logged
+
+
+class TestSourceLookups:
+    """Tests for how remote lookups treat slow and failing sources."""
+
+    def test_single_source_waits_past_the_timeout(self, make_pm):
+        pm = make_pm(FakeSource("A", [_project("A", "slow", "Slow Plugin")], delay=0.3), source_timeout=0.05)
+
+        assert pm.get_remote_project_info("slow").name == "Slow Plugin"
+        assert [result.project_id for result in pm.search_remote_projects("slow")] == ["slow"]
+
+    def test_single_source_errors_are_not_misses(self, make_pm, errors):
+        pm = make_pm(FakeSource("A", error=RuntimeError("rate limited")))
+
+        with pytest.raises(RuntimeError):
+            pm.get_remote_project_info("anything")
+        with pytest.raises(RuntimeError):
+            pm.fuzzy_find_project("anything")
+        assert pm.search_remote_projects("anything") == []
+        assert any("rate limited" in message for message in errors)
+
+    def test_single_source_miss(self, make_pm):
+        pm = make_pm(FakeSource("A"))
+
+        assert pm.get_remote_project_info("missing") is None
+
+    def test_multi_source_reports_failing_sources(self, make_pm, errors):
+        pm = make_pm(
+            FakeSource("A", error=ConnectionError("connection refused")),
+            FakeSource("B", [_project("B", "p1", "Plugin One")]),
+            multi_source=True,
+            source_timeout=5,
+        )
+
+        assert pm.get_remote_project_info("p1").project_id == "p1"
+        assert [result.project_id for result in pm.search_remote_projects("plugin")] == ["p1"]
+        assert len(errors) == 2
+        assert all("A" in message and "connection refused" in message for message in errors)
+
+    def test_multi_source_misses_are_not_reported(self, make_pm, errors):
+        pm = make_pm(FakeSource("A"), FakeSource("B"), multi_source=True, source_timeout=5)
+
+        assert pm.get_remote_project_info("missing") is None
+        assert errors == []
+
+
+class TestSearch:
+    """Tests for combining the local full-text index with the sources."""
+
+    def test_local_hits_follow_the_game_version(self, make_pm):
+        pm = make_pm(FakeSource("A"))
+        pm.db.save_project_info(_project("A", "new-tool", "Tool Box"))
+        pm.db.save_project_info(_project("A", "old-tool", "Tool Chest", game_versions=("1.20.1",)))
+
+        assert [r.project_id for r in pm.search_projects("tool", "1.21.4", offline=True)] == ["new-tool"]
+        assert {r.project_id for r in pm.search_projects("tool", offline=True)} == {"new-tool", "old-tool"}
+
+    def test_exact_local_match_skips_the_sources(self, make_pm):
+        source = FakeSource("A")
+        pm = make_pm(source)
+        pm.db.save_project_info(_project("A", "luckperms", "LuckPerms"))
+
+        assert [r.project_id for r in pm.search_projects("luckperms", "1.21.4")] == ["luckperms"]
+        assert [r.project_id for r in pm.search_projects("LUCKPERMS", "1.21.4")] == ["luckperms"]
+        assert source.queries == []
+
+    def test_weak_local_hits_do_not_hide_the_sources(self, make_pm):
+        source = FakeSource("A", [_project("A", "chat", "Chat Plus")])
+        pm = make_pm(source)
+        for i in range(12):
+            # every one of them mentions "chat" only in its description
+            project = _project("A", f"local{i}", f"Local {i}")
+            project.description = "adds chat colors"
+            pm.db.save_project_info(project)
+
+        results = pm.search_projects("chat", "1.21.4", limit=10)
+
+        assert source.queries == ["chat"]
+        assert results[0].project_id == "chat"
+        assert len(results) == 10
+        assert {r.project_id for r in results[1:]} <= {f"local{i}" for i in range(12)}
+
+
+class TestInstallationStatus:
+    """Tests for when `ppm list` rebuilds the installation status instead of serving it from the table."""
+
+    @pytest.fixture
+    def hashed(self, monkeypatch):
+        calls = []
+
+        def counting(path):
+            calls.append(os.path.basename(path))
+            return compute_sha1(path)
+
+        monkeypatch.setattr(plugin_manager_module, "compute_sha1", counting)
+        return calls
+
+    def _jar(self, name: str, content: bytes, mtime_ns: int = 1_000_000_000_000_000_000) -> str:
+        path = os.path.join("plugins", name)
+        with open(path, "wb") as f:
+            f.write(content)
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+        return path
+
+    def _filenames(self, rows) -> list[str]:
+        return sorted(row.filename for row in rows)
+
+    def test_unchanged_jars_are_not_hashed_again(self, make_pm, hashed):
+        pm = make_pm(FakeSource("A"))
+        self._jar("a.jar", b"a")
+        self._jar("b.jar", b"b")
+
+        assert self._filenames(pm.get_status()) == ["a.jar", "b.jar"]
+        assert sorted(hashed) == ["a.jar", "b.jar"]
+
+        hashed.clear()
+        assert self._filenames(pm.get_status()) == ["a.jar", "b.jar"]
+        assert self._filenames(pm.refresh_status()) == ["a.jar", "b.jar"]
+        assert hashed == []
+
+    def test_changed_mtime_or_size_rehashes_that_jar(self, make_pm, hashed):
+        pm = make_pm(FakeSource("A"))
+        self._jar("a.jar", b"a")
+        self._jar("b.jar", b"b")
+        pm.get_status()
+
+        hashed.clear()
+        self._jar("a.jar", b"a", mtime_ns=2_000_000_000_000_000_000)
+        pm.get_status()
+        assert hashed == ["a.jar"]
+
+        hashed.clear()
+        path = self._jar("b.jar", b"bigger b")
+        rows = {row.filename: row for row in pm.get_status()}
+        assert hashed == ["b.jar"]
+        assert rows["b.jar"].filesize == os.path.getsize(path)
+        assert rows["b.jar"].sha1 == compute_sha1(path)
+
+    def test_removed_jar_is_dropped(self, make_pm, hashed):
+        pm = make_pm(FakeSource("A"))
+        self._jar("a.jar", b"a")
+        self._jar("b.jar", b"b")
+        pm.get_status()
+
+        hashed.clear()
+        os.remove(os.path.join("plugins", "b.jar"))
+
+        assert self._filenames(pm.get_status()) == ["a.jar"]
+        assert self._filenames(pm.db.get_installation_status()) == ["a.jar"]
+        assert [installation.filename for installation in pm.db.get_all_installations()] == ["a.jar"]
+        assert hashed == []
+
+    def test_other_server_version_rebuilds(self, make_pm, hashed):
+        self._jar("a.jar", b"a")
+        make_pm(FakeSource("A")).get_status()
+
+        hashed.clear()
+        pm = make_pm(FakeSource("A"))
+        pm.game_version = "1.21.5"
+        rows = pm.get_status()
+
+        assert [row.game_version for row in rows] == ["1.21.5"]
+        assert [row.game_version for row in pm.db.get_installation_status()] == ["1.21.5"]
+        # the jar itself did not change
+        assert hashed == []
+
+
+class TestUpdate:
+    """Tests for identifying the installed jars and saving their projects."""
+
+    def test_installed_version_missing_from_the_version_list(self, make_pm):
+        path = os.path.join("plugins", "tool.jar")
+        with open(path, "wb") as f:
+            f.write(b"old tool")
+        sha1 = compute_sha1(path)
+        source = FakeSource("A", [_project("A", "tool", "Tool")])
+        # installed version for an older game version, left out of the filtered version list
+        source.files[sha1] = FileInfo(
+            "tool-v0", "tool", "0.9.0", "RELEASE", datetime(2024, 1, 1), ["1.20.1"], sha1, "https://cdn.example/tool-v0.jar",
+        )
+        pm = make_pm(source)
+
+        pm.update(lambda message: None)
+
+        assert list(pm.db.get_project_info("tool").versions) == ["tool-v1", "tool-v0"]
+        assert pm.db.get_project_info("tool").current_version.version_id == "tool-v0"
+        # the project the source returned, which a connector may cache, is left alone
+        assert list(source.projects["tool"].versions) == ["tool-v1"]
+
+
+def _file(project_id: str, version_id: str, version_name: str, game_versions: list[str], day: int = 1) -> FileInfo:
+    sha1 = f"{version_id}-sha1"
+    return FileInfo(
+        version_id, project_id, version_name, "RELEASE", datetime(2025, 1, day), game_versions, sha1,
+        f"https://cdn.example/{version_id}.jar", hashes={"sha1": sha1},
+    )
+
+
+class TestReadiness:
+    """Tests for checking the installed plugins against another game version."""
+
+    @pytest.fixture(autouse=True)
+    def jar_content_is_sha1(self, monkeypatch):
+        def read_sha1(path):
+            with open(path) as f:
+                return f.read()
+
+        monkeypatch.setattr(plugin_manager_module, "compute_sha1", read_sha1)
+
+    def _install(self, pm: PluginManager, project: ProjectInfo, version_id: str):
+        sha1 = project.versions[version_id].sha1
+        with open(os.path.join("plugins", f"{project.project_id}.jar"), "w") as f:
+            f.write(sha1)
+        pm.db.save_project_info(project)
+        pm.db.save_installation_info(f"{project.project_id}.jar", sha1, len(sha1), "RELEASE")
+
+    def test_check_readiness(self, make_pm):
+        pm = make_pm(FakeSource("A"))
+        ready = ProjectInfo("A", "ready", "Ready", "author", None, 0, versions={"r1": _file("ready", "r1", "1.0.0", ["1.21.4", "1.21.5"])})
+        upgradable = ProjectInfo("A", "upgradable", "Upgradable", "author", None, 0, versions={
+            "u1": _file("upgradable", "u1", "1.0.0", ["1.21.4"]),
+            "u2": _file("upgradable", "u2", "2.0.0", ["1.21.5"], day=2),
+        })
+        stuck = ProjectInfo("A", "stuck", "Stuck", "author", None, 0, versions={"s1": _file("stuck", "s1", "1.0.0", ["1.20.1"])})
+        self._install(pm, ready, "r1")
+        self._install(pm, upgradable, "u1")
+        self._install(pm, stuck, "s1")
+
+        report = {readiness.project.project_id: readiness for readiness in pm.check_readiness("1.21.5")}
+
+        assert (report["ready"].current_score, report["ready"].candidate) == (3, None)
+        assert report["upgradable"].current_score < 3
+        assert (report["upgradable"].candidate.version_id, report["upgradable"].best_score) == ("u2", 3)
+        assert report["stuck"].candidate is None
+        assert report["stuck"].best_score < 3
+
+    def test_refresh_full_history_finds_new_versions(self, make_pm):
+        stored = ProjectInfo("A", "tool", "Tool", "author", None, 0, versions={"t1": _file("tool", "t1", "1.0.0", ["1.21.4"])})
+        full = ProjectInfo("A", "tool", "Tool", "author", None, 0, versions={
+            "t1": _file("tool", "t1", "1.0.0", ["1.21.4"]),
+            "t2": _file("tool", "t2", "2.0.0", ["1.21.5"], day=2),
+        })
+        pm = make_pm(FakeSource("A", [full]))
+        self._install(pm, stored, "t1")
+        assert pm.check_readiness("1.21.5")[0].candidate is None
+
+        assert pm.refresh_full_history() == {}
+        assert pm.check_readiness("1.21.5")[0].candidate.version_id == "t2"
+
+    def test_refresh_full_history_reports_failures(self, make_pm, errors):
+        pm = make_pm(FakeSource("A", error=ConnectionError("HTTP 429")))
+        self._install(pm, _project("A", "tool", "Tool"), "tool-v1")
+        messages = []
+
+        failed = pm.refresh_full_history(messages.append)
+
+        assert list(failed) == ["Tool"]
+        assert "HTTP 429" in str(failed["Tool"])
+        assert any("Tool" in message and "HTTP 429" in message for message in errors)
+        assert any("Tool" in message for message in messages[1:])
+
+
+def _cached_version(project: ProjectInfo, version_name: str, day: int = 1) -> FileInfo:
+    """Add a version to ``project`` whose jar is in the jar cache, so installing it needs no network."""
+    os.makedirs("build", exist_ok=True)
+    path = os.path.join("build", f"{project.project_id}-{version_name}.jar")
+    with open(path, "w") as f:
+        f.write(f"{project.project_id} {version_name}")
+    sha1 = compute_sha1(path)
+    JarCache().put(sha1, path)
+    file_info = FileInfo(
+        f"{project.project_id}-{version_name}", project.project_id, version_name, "RELEASE", datetime(2025, 1, day),
+        ["1.21.4"], sha1, f"https://cdn.example/{project.project_id}-{version_name}.jar", hashes={"sha1": sha1},
+    )
+    project.versions[file_info.version_id] = file_info
+    return file_info
+
+
+def _install_version(pm: PluginManager, project: ProjectInfo, file_info: FileInfo, track: str = "RELEASE"):
+    """Install a cached version as if `ppm install` had put it in place."""
+    pm.db.save_project_info(project)
+    filename = f"{project.name}-{file_info.version_name}.jar"
+    JarCache().copy_to(file_info.sha1, os.path.join("plugins", filename))
+    pm.db.save_installation_info(filename, file_info.sha1, os.path.getsize(os.path.join("plugins", filename)), track)
+
+
+class TestSync:
+    """Tests for planning and applying a lockfile against the plugin directory."""
+
+    def _lock(self, project: ProjectInfo, file_info: FileInfo, track: str = "RELEASE") -> LockedPlugin:
+        locked = LockedPlugin.from_project(project, file_info)
+        locked.track = track
+        return locked
+
+    def _project(self, project_id: str, name: str) -> ProjectInfo:
+        return ProjectInfo("A", project_id, name, "author", None, 0)
+
+    def test_locked_version_already_installed(self, make_pm):
+        pm = make_pm(FakeSource("A"))
+        tool = self._project("tool", "Tool")
+        v1 = _cached_version(tool, "1.0.0")
+        _install_version(pm, tool, v1)
+
+        plan = pm.plan_sync(Lockfile([self._lock(tool, v1)]))
+
+        assert plan.empty
+        assert [locked.sha1 for locked in plan.unchanged] == [v1.sha1]
+
+    def test_other_installed_version_is_replaced(self, make_pm):
+        pm = make_pm(FakeSource("A"))
+        tool = self._project("tool", "Tool")
+        v1 = _cached_version(tool, "1.0.0")
+        v2 = _cached_version(tool, "2.0.0", day=2)
+        _install_version(pm, tool, v1)
+
+        plan = pm.plan_sync(Lockfile([self._lock(tool, v2)]))
+        assert [(step.project.current_version.sha1, step.file_info.sha1) for step in plan.install] == [(v1.sha1, v2.sha1)]
+        results = pm.execute_install_plan(plan.install)
+
+        assert all(result.ok for result in results)
+        assert os.listdir("plugins") == ["Tool-2.0.0.jar"]
+        assert [installation.sha1 for installation in pm.db.get_all_installations()] == [v2.sha1]
+
+    def test_prune_keeps_replaced_jars(self, make_pm):
+        pm = make_pm(FakeSource("A"))
+        tool, other = self._project("tool", "Tool"), self._project("other", "Other")
+        v1 = _cached_version(tool, "1.0.0")
+        v2 = _cached_version(tool, "2.0.0", day=2)
+        other_v1 = _cached_version(other, "1.0.0")
+        _install_version(pm, tool, v1)
+        _install_version(pm, other, other_v1)
+
+        plan = pm.plan_sync(Lockfile([self._lock(tool, v2)]), prune=True)
+
+        # the old Tool jar is replaced by the install step, not pruned
+        assert [installation.filename for installation in plan.remove] == ["Other-1.0.0.jar"]
+        assert [step.file_info.sha1 for step in plan.install] == [v2.sha1]
+
+    def test_complete_lockfile_needs_no_source(self, make_pm):
+        source = FakeSource("A")
+        pm = make_pm(source)
+        tool, new = self._project("tool", "Tool"), self._project("new", "New")
+        v1 = _cached_version(tool, "1.0.0")
+        v2 = _cached_version(tool, "2.0.0", day=2)
+        new_v1 = _cached_version(new, "1.0.0")
+        _install_version(pm, tool, v1)
+        # a project the database does not know yet
+        lockfile = Lockfile([self._lock(tool, v2), self._lock(new, new_v1)])
+
+        plan = pm.plan_sync(lockfile)
+        pm.execute_install_plan(plan.install)
+
+        assert source.calls == []
+        assert sorted(os.listdir("plugins")) == ["New-1.0.0.jar", "Tool-2.0.0.jar"]
+
+    def test_track_follows_the_lockfile(self, make_pm):
+        pm = make_pm(FakeSource("A"))
+        tool = self._project("tool", "Tool")
+        v1 = _cached_version(tool, "1.0.0")
+        _install_version(pm, tool, v1, track="RELEASE")
+
+        plan = pm.plan_sync(Lockfile([self._lock(tool, v1, track="BETA")]))
+        assert not plan.empty
+        assert [locked.sha1 for locked in plan.retrack] == [v1.sha1]
+        pm.apply_tracks(plan.retrack)
+
+        assert [installation.installation_type for installation in pm.db.get_all_installations()] == ["BETA"]
+        assert pm.plan_sync(Lockfile([self._lock(tool, v1, track="BETA")])).empty
+
+
+class TestStagedInstall:
+    """Tests for staging installs and applying them later."""
+
+    @pytest.fixture
+    def staged(self, make_pm):
+        """A server with Tool 1.0.0 installed and Tool 2.0.0 staged to replace it."""
+        pm = make_pm(FakeSource("A"))
+        tool = ProjectInfo("A", "tool", "Tool", "author", None, 0)
+        v1 = _cached_version(tool, "1.0.0")
+        v2 = _cached_version(tool, "2.0.0", day=2)
+        _install_version(pm, tool, v1)
+        results = pm.execute_install_plan([InstallStep(pm.db.get_project_info("tool"), v2)], stage=True)
+        assert all(result.ok for result in results)
+        return pm, v1, v2
+
+    def test_staging_leaves_the_installation_alone(self, staged):
+        pm, v1, v2 = staged
+
+        assert sorted(os.listdir("plugins")) == sorted(["Tool-1.0.0.jar", StagingArea().root.name])
+        assert [installation.sha1 for installation in pm.db.get_all_installations()] == [v1.sha1]
+        assert [(entry.filename, entry.sha1, entry.replaces) for entry in pm.get_staged()] == [
+            ("Tool-2.0.0.jar", v2.sha1, "Tool-1.0.0.jar"),
+        ]
+
+    def test_apply_swaps_the_jars(self, staged):
+        pm, v1, v2 = staged
+        JarCache().path_for(v1.sha1).unlink()
+
+        applied, failed = pm.apply_staged()
+
+        assert ([entry.filename for entry in applied], failed) == (["Tool-2.0.0.jar"], [])
+        assert os.listdir("plugins") == ["Tool-2.0.0.jar"]
+        # the replaced jar is retired into the jar cache
+        assert JarCache().get(v1.sha1) is not None
+        assert [installation.sha1 for installation in pm.db.get_all_installations()] == [v2.sha1]
+        assert pm.get_staged() == []
+
+    @pytest.mark.parametrize("damage", ["truncate", "delete"])
+    def test_incomplete_staged_jar_is_kept(self, staged, damage):
+        pm, v1, _ = staged
+        staged_path = StagingArea().path_for("Tool-2.0.0.jar")
+        if damage == "truncate":
+            staged_path.write_bytes(staged_path.read_bytes()[:3])
+        else:
+            staged_path.unlink()
+
+        applied, failed = pm.apply_staged()
+
+        assert applied == []
+        assert [entry.filename for entry in failed] == ["Tool-2.0.0.jar"]
+        assert [entry.filename for entry in pm.get_staged()] == ["Tool-2.0.0.jar"]
+        assert "Tool-1.0.0.jar" in os.listdir("plugins")
+        assert [installation.sha1 for installation in pm.db.get_all_installations()] == [v1.sha1]
@@ -0,0 +1,171 @@
+"""Unit tests for resolver module."""
+
+from datetime import datetime
+
+import pytest
+
+from papermc_plugin_manager.connector_interface import FileDependency, FileInfo, ProjectInfo
+from papermc_plugin_manager.exceptions import DependencyConflictException, DependencyCycleException
+from papermc_plugin_manager.resolver import DependencyResolver
+
+
+def _project(project_id: str, *versions: str, dependencies: tuple[FileDependency, ...] = ()) -> ProjectInfo:
+    project = ProjectInfo("test", project_id, project_id.title(), "Test Author", None, 0)
+    for day, version_name in enumerate(versions, start=1):
+        version_id = f"{project_id}-{version_name}"
+        project.versions[version_id] = FileInfo(
+            version_id, project_id, version_name, "RELEASE", datetime(2025, 1, day), ["1.21"],
+            f"sha-{version_id}", f"https://example.com/{version_id}.jar", dependencies=dependencies,
+        )
+    return project
+
+
+def _installed(project: ProjectInfo, version_name: str) -> ProjectInfo:
+    project.current_version = project.get_version(version_name)
+    return project
+
+
+class FakeSource:
+    def __init__(self, *projects: ProjectInfo):
+        self.projects = {project.project_id: project for project in projects}
+        self.lookups: list[list[str]] = []
+
+    def load_project(self, source: str, project_id: str) -> ProjectInfo | None:
+        self.lookups[-1].append(project_id)
+        return self.projects.get(project_id)
+
+    def load_version(self, source: str, version_id: str) -> FileInfo | None:
+        self.lookups[-1].append(version_id)
+        for project in self.projects.values():
+            if version_id in project.versions:
+                return project.versions[version_id]
+        return None
+
+    def load_dependencies(self, files: list[FileInfo]) -> dict[str, tuple[FileDependency, ...]]:
+        return {file_info.sha1: file_info.dependencies or () for file_info in files}
+
+    def resolver(self, installed: list[ProjectInfo] = (), include_optional: bool = False) -> DependencyResolver:
+        source = self
+
+        class Batched(DependencyResolver):
+            def _batch(self, load, keys):
+                source.lookups.append([])
+                return super()._batch(load, keys)
+
+        return Batched(self.load_project, self.load_version, self.load_dependencies, list(installed), include_optional)
+
+
+def _requires(*project_ids: str, dependency_type: str = "REQUIRED") -> tuple[FileDependency, ...]:
+    return tuple(FileDependency(dependency_type, project_id) for project_id in project_ids)
+
+
+def _plan(project: ProjectInfo) -> list[tuple[ProjectInfo, FileInfo]]:
+    return [(project, project.get_latest())]
+
+
+class TestDependencyResolver:
+    """Tests for DependencyResolver.resolve."""
+
+    def test_dependencies_come_first(self):
+        app = _project("app", "1.0", dependencies=_requires("api", "lib"))
+        source = FakeSource(
+            _project("api", "2.0", dependencies=_requires("lib")),
+            _project("lib", "1.0", "1.1"),
+        )
+
+        resolution = source.resolver().resolve(_plan(app))
+
+        assert [node.project.project_id for node in resolution.install] == ["lib", "api", "app"]
+        assert resolution.install[0].file_info.version_name == "1.1"
+        assert [node.project.project_id for node in resolution.added] == ["lib", "api"]
+        assert sorted(resolution.install[0].required_by) == ["api", "app"]
+
+    def test_levels_are_looked_up_in_batches(self):
+        app = _project("app", "1.0", dependencies=_requires("a", "b"))
+        source = FakeSource(
+            _project("a", "1.0", dependencies=_requires("c")),
+            _project("b", "1.0", dependencies=_requires("c")),
+            _project("c", "1.0"),
+        )
+
+        source.resolver().resolve(_plan(app))
+
+        project_lookups = [sorted(lookup) for lookup in source.lookups if lookup]
+        assert project_lookups == [["a", "b"], ["c"]]
+
+    def test_installed_dependency_is_not_looked_up(self):
+        app = _project("app", "1.0", dependencies=_requires("lib"))
+        lib = _installed(_project("lib", "1.0", dependencies=_requires("other")), "1.0")
+        source = FakeSource()
+
+        resolution = source.resolver([lib]).resolve(_plan(app))
+
+        assert [node.project.project_id for node in resolution.install] == ["app"]
+        assert not any(source.lookups)
+
+    def test_pinned_version_replaces_installed_one(self):
+        app = _project("app", "1.0", dependencies=(FileDependency("REQUIRED", "lib", "lib-1.0"),))
+        source = FakeSource(_project("lib", "1.0", "1.1"))
+        lib = _installed(_project("lib", "1.0", "1.1"), "1.1")
+
+        resolution = source.resolver([lib]).resolve(_plan(app))
+
+        assert [(n.project.project_id, n.file_info.version_name) for n in resolution.install] == [("lib", "1.0"), ("app", "1.0")]
+
+    def test_missing_and_optional(self):
+        app = _project("app", "1.0", dependencies=_requires("ghost") + _requires("extra", dependency_type="OPTIONAL"))
+        source = FakeSource(_project("extra", "1.0", dependencies=_requires("deep")))
+
+        resolution = source.resolver().resolve(_plan(app))
+
+        assert [node.project.project_id for node in resolution.install] == ["app"]
+        assert [node.project.project_id for node in resolution.suggested] == ["extra"]
+        assert [(m.project_id, m.optional) for m in resolution.missing] == [("ghost", False)]
+
+        with_optional = FakeSource(_project("extra", "1.0")).resolver(include_optional=True).resolve(_plan(app))
+        assert [node.project.project_id for node in with_optional.install] == ["extra", "app"]
+
+    def test_conflicting_pins(self):
+        app = _project("app", "1.0", dependencies=_requires("a", "b"))
+        source = FakeSource(
+            _project("a", "1.0", dependencies=(FileDependency("REQUIRED", "lib", "lib-1.0"),)),
+            _project("b", "1.0", dependencies=(FileDependency("REQUIRED", "lib", "lib-1.1"),)),
+            _project("lib", "1.0", "1.1"),
+        )
+
+        with pytest.raises(DependencyConflictException):
+            source.resolver().resolve(_plan(app))
+
+    def test_incompatible_with_installed(self):
+        app = _project("app", "1.0", dependencies=_requires("other", dependency_type="INCOMPATIBLE"))
+        other = _installed(_project("other", "1.0"), "1.0")
+
+        with pytest.raises(DependencyConflictException, match="incompatible"):
+            FakeSource().resolver([other]).resolve(_plan(app))
+
+    def test_upgrade_breaking_installed_pin(self):
+        lib = _installed(_project("lib", "1.0", "1.1"), "1.0")
+        pinned = _installed(_project("pinned", "1.0", dependencies=(FileDependency("REQUIRED", "lib", "lib-1.0"),)), "1.0")
+
+        with pytest.raises(DependencyConflictException):
+            FakeSource().resolver([lib, pinned]).resolve([(lib, lib.get_version("1.1"))])
+
+    def test_required_cycle(self):
+        app = _project("app", "1.0", dependencies=_requires("a"))
+        source = FakeSource(
+            _project("a", "1.0", dependencies=_requires("b")),
+            _project("b", "1.0", dependencies=_requires("a")),
+        )
+
+        with pytest.raises(DependencyCycleException):
+            source.resolver().resolve(_plan(app))
+
+    def test_optional_cycle_is_broken(self):
+        app = _project("app", "1.0", dependencies=_requires("a"))
+        source = FakeSource(
+            _project("a", "1.0", dependencies=_requires("app", dependency_type="OPTIONAL")),
+        )
+
+        resolution = source.resolver(include_optional=True).resolve(_plan(app))
+
+        assert [node.project.project_id for node in resolution.install] == ["a", "app"]
@@ -0,0 +1,45 @@
+"""Unit tests for the staging area."""
+
+from papermc_plugin_manager.staging import StagedInstall, StagingArea
+
+
+def _entry(project_id, filename):
+    return StagedInstall(project_id, filename, "0" * 40, 1, "RELEASE", "old.jar", "1" * 40)
+
+
+class TestStagingArea:
+    """Tests for StagingArea."""
+
+    def test_add_and_load(self, tmp_path):
+        staging = StagingArea(tmp_path)
+        staging.add(_entry("a", "a-1.jar"))
+        staging.add(_entry("b", "b-1.jar"))
+
+        assert StagingArea(tmp_path).load() == [_entry("a", "a-1.jar"), _entry("b", "b-1.jar")]
+
+    def test_restaging_a_project_replaces_its_entry(self, tmp_path):
+        staging = StagingArea(tmp_path)
+        staging.add(_entry("a", "a-1.jar"))
+        staging.path_for("a-1.jar").write_bytes(b"a")
+
+        staging.add(_entry("a", "a-2.jar"))
+
+        assert staging.load() == [_entry("a", "a-2.jar")]
+        assert not staging.path_for("a-1.jar").exists()
+
+    def test_saving_nothing_removes_directory(self, tmp_path):
+        staging = StagingArea(tmp_path)
+        staging.add(_entry("a", "a-1.jar"))
+        staging.path_for("a-1.jar").write_bytes(b"a")
+
+        staging.save([])
+
+        assert not staging.root.exists()
+        assert staging.load() == []
+
+    def test_unreadable_manifest_is_ignored(self, tmp_path):
+        staging = StagingArea(tmp_path)
+        staging.root.mkdir()
+        staging.manifest_path.write_text("not json")
+
+        assert staging.load() == []
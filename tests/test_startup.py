@@ -0,0 +1,102 @@
+"""Startup cost of the CLI: heavy modules must only be imported by the commands that use them."""
+
+import os
+import sqlite3
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+SRC = str(Path(__file__).resolve().parents[1] / "src")
+
+# imported on first use only
+DEFERRED = [
+    "sqlalchemy",
+    "pydantic",
+    "requests",
+    "semantic_version",
+    "rich.progress",
+    "papermc_plugin_manager.database",
+    "papermc_plugin_manager.plugin_manager",
+    "papermc_plugin_manager.connectors",
+]
+
+# tight enough to catch an eager import of the database stack; wall-clock checks flake on loaded
+# machines, so the budget is only checked when PPM_TIMING_TESTS is set
+VERSION_BUDGET = 1.0
+
+
+def _run(code: str, *args: str, cwd=None, check=True) -> subprocess.CompletedProcess:
+    env = dict(os.environ, PYTHONPATH=SRC + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    return subprocess.run([sys.executable, "-c", code, *args], capture_output=True, text=True, env=env, cwd=cwd, check=check)
+
+
+class TestStartup:
+    """Tests for lazy imports of the CLI."""
+
+    def test_cli_import_defers_heavy_modules(self):
+        result = _run(
+            "import sys; import papermc_plugin_manager.__main__; "
+            f"print(','.join(m for m in {DEFERRED!r} if m in sys.modules))"
+        )
+        assert result.stdout.strip() == ""
+
+    def test_version_skips_database_and_connectors(self, tmp_path):
+        result = _run(
+            "import sys; sys.argv = ['ppm', '--version']; "
+            "from papermc_plugin_manager.__main__ import main\n"
+            "try:\n    main()\nexcept SystemExit:\n    pass\n"
+            f"print('loaded:', ','.join(m for m in {DEFERRED!r} if m in sys.modules))",
+            cwd=tmp_path,
+        )
+        lines = result.stdout.strip().splitlines()
+        assert "PaperMC Plugin Manager" in lines[0]
+        assert lines[-1] == "loaded:"
+        # --version must not need a server directory or create a database
+        assert list(tmp_path.iterdir()) == []
+
+    @pytest.mark.skipif(not os.environ.get("PPM_TIMING_TESTS"), reason="set PPM_TIMING_TESTS=1 to check startup time")
+    def test_version_budget(self, tmp_path):
+        start = time.perf_counter()
+        _run("import sys; sys.argv = ['ppm', '--version']; from papermc_plugin_manager.__main__ import main; main()", cwd=tmp_path)
+        assert time.perf_counter() - start < VERSION_BUDGET
+
+    def test_database_engine_is_created_on_first_use(self, tmp_path):
+        from papermc_plugin_manager.database import SourceDatabase
+
+        path = tmp_path / "ppm.db"
+        db = SourceDatabase(f"sqlite:///{path}")
+        assert db._engine is None
+        assert not path.exists()
+
+        assert db.get_all_installations() == []
+        assert db._engine is not None
+        assert path.exists()
+
+    def test_completion_reads_cache_only(self, tmp_path):
+        (tmp_path / "ppm.db.completion.json").write_text('{"plugins": ["Alpha", "abc"]}')
+        result = _run(
+            "import sys; from papermc_plugin_manager.__main__ import installed_plugin_names; "
+            "print(installed_plugin_names()); "
+            f"print('loaded:', ','.join(m for m in {DEFERRED!r} if m in sys.modules))",
+            cwd=tmp_path,
+        )
+        assert [line.strip() for line in result.stdout.splitlines()] == ["['Alpha', 'abc']", "loaded:"]
+        assert not (tmp_path / "ppm.db").exists()
+
+    def test_ppm_errors_are_reported_without_traceback(self, tmp_path):
+        (tmp_path / "version_history.json").write_text('{"currentVersion": "1.21.4-100-main"}')
+        with sqlite3.connect(tmp_path / "ppm.db") as connection:
+            connection.execute("PRAGMA user_version = 9999")
+
+        result = _run(
+            "import sys; sys.argv = ['ppm', 'list']; from papermc_plugin_manager.__main__ import main; main()",
+            cwd=tmp_path,
+            check=False,
+        )
+
+        assert result.returncode == 1
+        assert "Traceback" not in result.stdout + result.stderr
+        assert "Database schema version 9999" in result.stdout
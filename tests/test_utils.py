@@ -0,0 +1,68 @@
+"""Unit tests for utils module."""
+
+import time
+
+from papermc_plugin_manager.utils import first_result, run_concurrently
+
+
+def _fail():
+    raise RuntimeError("boom")
+
+
+def _slow(value, delay):
+    time.sleep(delay)
+    return value
+
+
+class TestRunConcurrently:
+    """Tests for run_concurrently."""
+
+    def test_collects_results_in_task_order(self):
+        results = run_concurrently({"a": lambda: _slow(1, 0.05), "b": lambda: 2})
+        assert list(results.items()) == [("a", 1), ("b", 2)]
+
+    def test_failed_tasks_are_skipped(self):
+        results = run_concurrently({"ok": lambda: 1, "bad": _fail})
+        assert results == {"ok": 1}
+
+    def test_timed_out_tasks_are_skipped(self):
+        start = time.monotonic()
+        results = run_concurrently({"fast": lambda: 1, "slow": lambda: _slow(2, 1)}, timeout=0.1)
+        assert results == {"fast": 1}
+        assert time.monotonic() - start < 0.5
+
+    def test_max_workers(self):
+        running, peak = [], []
+
+        def task(value):
+            running.append(value)
+            peak.append(len(running))
+            time.sleep(0.02)
+            running.remove(value)
+            return value
+
+        results = run_concurrently({str(i): lambda i=i: task(i) for i in range(6)}, timeout=0.5, max_workers=2)
+
+        assert list(results.values()) == list(range(6))
+        assert max(peak) <= 2
+
+    def test_no_tasks(self):
+        assert run_concurrently({}) == {}
+
+
+class TestFirstResult:
+    """Tests for first_result."""
+
+    def test_returns_fastest_result(self):
+        hit = first_result({"slow": lambda: _slow("slow", 0.5), "fast": lambda: "fast"})
+        assert hit == ("fast", "fast")
+
+    def test_skips_failures_and_rejected_results(self):
+        hit = first_result({"bad": _fail, "none": lambda: None, "ok": lambda: _slow("ok", 0.05)})
+        assert hit == ("ok", "ok")
+
+    def test_returns_none_when_nothing_accepted(self):
+        assert first_result({"bad": _fail, "none": lambda: None}) is None
+
+    def test_timeout(self):
+        assert first_result({"slow": lambda: _slow(1, 1)}, timeout=0.05) is None